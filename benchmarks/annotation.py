@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+import argparse
+import time
+
+import numpy as np
+
+from labelme import annotation
+
+
+def make_shapes(num_shapes):
+    rng = np.random.RandomState(0)
+    shapes = []
+    for i in range(num_shapes):
+        num_points = rng.randint(3, 20)
+        center = rng.uniform(0, 1000, 2)
+        angles = np.sort(rng.uniform(0, 2 * np.pi, num_points))
+        radii = rng.uniform(10, 50, (num_points, 1))
+        points = center + radii * np.stack(
+            [np.cos(angles), np.sin(angles)], axis=1
+        )
+        shapes.append(annotation.ShapeData(points=points, label=str(i)))
+    return shapes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--num-shapes", type=int, default=10000)
+    parser.add_argument("--num-points", type=int, default=100)
+    args = parser.parse_args()
+
+    shapes = make_shapes(args.num_shapes)
+    queries = np.random.RandomState(1).uniform(0, 1000, (args.num_points, 2))
+
+    t_start = time.time()
+    batch = annotation.ShapeBatch(shapes)
+    print("ShapeBatch: {:.1f}ms".format((time.time() - t_start) * 1000))
+
+    t_start = time.time()
+    batch.bboxes_and_areas()
+    elapsed_batch = time.time() - t_start
+    t_start = time.time()
+    for shape in shapes:
+        shape.bbox()
+        shape.area()
+    elapsed_loop = time.time() - t_start
+    print(
+        "bboxes and areas: batch {:.1f}ms, per shape {:.1f}ms".format(
+            elapsed_batch * 1000, elapsed_loop * 1000
+        )
+    )
+
+    t_start = time.time()
+    for point in queries:
+        batch.contains(point)
+    elapsed_batch = time.time() - t_start
+    t_start = time.time()
+    for point in queries[:10]:
+        for shape in shapes:
+            shape.contains(point)
+    elapsed_loop = (time.time() - t_start) * len(queries) / 10
+    print(
+        "contains {} points: batch {:.1f}ms, per shape {:.1f}ms".format(
+            len(queries), elapsed_batch * 1000, elapsed_loop * 1000
+        )
+    )
+
+    for name, func in [
+        ("simplify", lambda: batch.simplify(1)),
+        ("clip", lambda: batch.clip(500, 500)),
+    ]:
+        t_start = time.time()
+        func()
+        print("{}: {:.1f}ms".format(name, (time.time() - t_start) * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+import argparse
+import json
+import os.path as osp
+import tempfile
+import time
+
+import numpy as np
+
+from labelme.annotation_index import AnnotationIndex
+from labelme.logger import logger
+
+
+def make_dataset(out_dir, num_files, num_shapes):
+    rng = np.random.RandomState(0)
+    for i in range(num_files):
+        shapes = []
+        for j in range(num_shapes):
+            points = rng.uniform(0, 1000, (4, 2)).round(1).tolist()
+            shapes.append(
+                dict(
+                    label="class_{}".format(rng.randint(100)),
+                    points=points,
+                    group_id=None,
+                    description="",
+                    shape_type="polygon",
+                    flags={},
+                )
+            )
+        data = dict(
+            version="5.2.0",
+            flags={"reviewed": bool(i % 2)},
+            shapes=shapes,
+            imagePath="{:08d}.jpg".format(i),
+            imageData=None,
+            imageHeight=1000,
+            imageWidth=1000,
+        )
+        with open(osp.join(out_dir, "{:08d}.json".format(i)), "w") as f:
+            json.dump(data, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--num-files", type=int, default=10000)
+    parser.add_argument(
+        "--num-shapes", type=int, default=100, help="shapes per file"
+    )
+    args = parser.parse_args()
+
+    logger.setLevel("ERROR")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        make_dataset(tmp_dir, args.num_files, args.num_shapes)
+        print(
+            "files: {}, shapes: {}".format(
+                args.num_files, args.num_files * args.num_shapes
+            )
+        )
+
+        with AnnotationIndex(osp.join(tmp_dir, "index.sqlite3")) as index:
+            for name in ["update (full)", "update (no change)"]:
+                t_start = time.time()
+                index.update(tmp_dir)
+                print(
+                    "{:<24s} {:9.1f}ms".format(
+                        name, (time.time() - t_start) * 1000
+                    )
+                )
+
+            queries = [
+                ("labels", lambda: index.labels()),
+                ("files --label", lambda: index.files(label="class_0")),
+                ("files --flag", lambda: index.files(flag="reviewed")),
+                (
+                    "files --label --flag",
+                    lambda: index.files(label="class_0", flag="reviewed"),
+                ),
+                (
+                    "sql (large shapes)",
+                    lambda: index.query(
+                        "SELECT COUNT(*) FROM shapes WHERE area > 400000"
+                    ),
+                ),
+            ]
+            for name, query in queries:
+                t_start = time.time()
+                query()
+                print(
+                    "{:<24s} {:9.1f}ms".format(
+                        name, (time.time() - t_start) * 1000
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
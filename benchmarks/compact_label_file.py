@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+import argparse
+import os.path as osp
+import tempfile
+
+import labelme
+
+from json_backend import make_shapes
+from json_backend import timeit
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--num-shapes", type=int, default=100)
+    parser.add_argument(
+        "--num-points", type=int, default=500, help="points per shape"
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    shapes = make_shapes(args.num_shapes, args.num_points)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(
+            "shapes: {}, points: {}".format(
+                args.num_shapes, args.num_shapes * args.num_points
+            )
+        )
+        for suffix in [
+            labelme.LabelFile.suffix,
+            labelme.LabelFile.compact_suffix,
+        ]:
+            filename = osp.join(tmp_dir, "dense" + suffix)
+            label_file = labelme.LabelFile()
+            t_save = timeit(
+                lambda: label_file.save(
+                    filename,
+                    shapes=shapes,
+                    imagePath="dense.jpg",
+                    imageHeight=1000,
+                    imageWidth=1000,
+                ),
+                repeat=args.repeat,
+            )
+            t_load = timeit(
+                lambda: labelme.LabelFile(filename, with_image=False),
+                repeat=args.repeat,
+            )
+            print(
+                "{:<13s} save: {:7.1f}ms  load: {:7.1f}ms  ({:.2f}MB)".format(
+                    suffix,
+                    t_save * 1000,
+                    t_load * 1000,
+                    osp.getsize(filename) / 1e6,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
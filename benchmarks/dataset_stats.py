@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+import argparse
+import json
+import os.path as osp
+import tempfile
+import time
+
+import numpy as np
+
+from labelme.dataset_stats import compute_stats
+from labelme.logger import logger
+
+
+def make_dataset(out_dir, num_files, num_shapes):
+    rng = np.random.RandomState(0)
+    filenames = []
+    for i in range(num_files):
+        shapes = []
+        for j in range(num_shapes):
+            num_points = rng.randint(3, 20)
+            shapes.append(
+                dict(
+                    label="class_{}".format(rng.randint(100)),
+                    points=rng.uniform(0, 1000, (num_points, 2))
+                    .round(1)
+                    .tolist(),
+                    group_id=None,
+                    description="",
+                    shape_type="polygon",
+                    flags={},
+                )
+            )
+        data = dict(
+            version="5.2.0",
+            flags={},
+            shapes=shapes,
+            imagePath="{:08d}.jpg".format(i),
+            imageData=None,
+            imageHeight=1000,
+            imageWidth=1000,
+        )
+        filename = osp.join(out_dir, "{:08d}.json".format(i))
+        with open(filename, "w") as f:
+            json.dump(data, f)
+        filenames.append(filename)
+    return filenames
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--num-files", type=int, default=10000)
+    parser.add_argument(
+        "--num-shapes", type=int, default=100, help="shapes per file"
+    )
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    logger.setLevel("ERROR")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filenames = make_dataset(tmp_dir, args.num_files, args.num_shapes)
+
+        t_start = time.time()
+        stats = compute_stats(filenames, workers=args.workers)
+        elapsed = time.time() - t_start
+        print(
+            "files: {}, shapes: {}, classes: {}: {:.2f}s".format(
+                stats["num_files"],
+                stats["num_shapes"],
+                len(stats["classes"]),
+                elapsed,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
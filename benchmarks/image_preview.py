@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+import argparse
+import os.path as osp
+import tempfile
+import time
+
+import PIL.Image
+from qtpy import QtWidgets
+
+from labelme.app import MainWindow
+from labelme.config import get_default_config
+
+
+here = osp.dirname(osp.abspath(__file__))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--width", type=int, default=6000)
+    parser.add_argument("--height", type=int, default=4000)
+    parser.add_argument("--num-files", type=int, default=5)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication([])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filenames = []
+        with PIL.Image.open(
+            osp.join(here, "../tests/labelme_tests/data/raw/2011_000003.jpg")
+        ) as img:
+            img = img.resize((args.width, args.height))
+            for i in range(args.num_files):
+                filename = osp.join(tmp_dir, "{}.jpg".format(i))
+                img.save(filename, quality=90)
+                filenames.append(filename)
+
+        for image_preview in [False, True]:
+            config = get_default_config()
+            config["image_preview"] = image_preview
+            win = MainWindow(config=config)
+            win.resize(1280, 800)
+            win.show()
+            app.processEvents()
+
+            elapsed_paint = elapsed_full = 0
+            for filename in filenames:
+                t_start = time.time()
+                win.loadFile(filename)
+                win.canvas.repaint()
+                elapsed_paint += time.time() - t_start
+                while win.imageData is None:
+                    app.processEvents()
+                elapsed_full += time.time() - t_start
+            win.close()
+
+            print(
+                "image_preview={}: first paint {:.1f}ms, "
+                "full image {:.1f}ms".format(
+                    image_preview,
+                    elapsed_paint / len(filenames) * 1000,
+                    elapsed_full / len(filenames) * 1000,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
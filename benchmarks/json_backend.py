@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+import argparse
+import os.path as osp
+import tempfile
+import time
+
+import numpy as np
+
+import labelme
+from labelme import _json
+
+
+def make_shapes(num_shapes, num_points):
+    shapes = []
+    for i in range(num_shapes):
+        points = np.random.uniform(0, 1000, (num_points, 2)).tolist()
+        shapes.append(
+            dict(
+                label="class_{}".format(i % 10),
+                points=points,
+                group_id=None,
+                description="",
+                shape_type="polygon",
+                flags={},
+            )
+        )
+    return shapes
+
+
+def timeit(func, repeat):
+    t_start = time.time()
+    for _ in range(repeat):
+        func()
+    return (time.time() - t_start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--num-shapes", type=int, default=100)
+    parser.add_argument(
+        "--num-points", type=int, default=500, help="points per shape"
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    shapes = make_shapes(args.num_shapes, args.num_points)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = osp.join(tmp_dir, "dense.json")
+        print(
+            "shapes: {}, points: {}".format(
+                args.num_shapes, args.num_shapes * args.num_points
+            )
+        )
+        for backend in _json.BACKENDS:
+            _json.set_backend(backend)
+            label_file = labelme.LabelFile()
+            t_save = timeit(
+                lambda: label_file.save(
+                    filename,
+                    shapes=shapes,
+                    imagePath="dense.jpg",
+                    imageHeight=1000,
+                    imageWidth=1000,
+                ),
+                repeat=args.repeat,
+            )
+            t_load = timeit(
+                lambda: labelme.LabelFile(filename, with_image=False),
+                repeat=args.repeat,
+            )
+            print(
+                "{:<8s} save: {:7.1f}ms  load: {:7.1f}ms  ({:.1f}MB)".format(
+                    backend,
+                    t_save * 1000,
+                    t_load * 1000,
+                    osp.getsize(filename) / 1e6,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+import argparse
+import time
+
+import numpy as np
+from qtpy import QtTest
+from qtpy import QtWidgets
+
+from labelme.logger import logger
+from labelme.widgets import LabelDialog
+
+
+def make_labels(num_labels):
+    rng = np.random.RandomState(0)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    words = [
+        "".join(rng.choice(letters, rng.randint(3, 10))) for _ in range(2000)
+    ]
+    labels = set()
+    while len(labels) < num_labels:
+        labels.add(" ".join(rng.choice(words, rng.randint(1, 4))))
+    return sorted(labels)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--num-labels", type=int, default=20000)
+    args = parser.parse_args()
+
+    logger.setLevel("ERROR")
+
+    app = QtWidgets.QApplication([])
+    labels = make_labels(args.num_labels)
+    query = labels[len(labels) // 2]
+
+    for completion in ["startswith", "contains", "fuzzy"]:
+        t_start = time.time()
+        dialog = LabelDialog(labels=labels, completion=completion)
+        elapsed_init = time.time() - t_start
+
+        t_start = time.time()
+        dialog.addLabelHistory(query + "_new")
+        elapsed_add = time.time() - t_start
+
+        dialog.show()
+        dialog.edit.setFocus()
+        app.processEvents()
+        elapsed_keys = []
+        dialog.edit.clear()
+        for char in query:
+            t_start = time.time()
+            QtTest.QTest.keyClicks(dialog.edit, char)
+            app.processEvents()
+            elapsed_keys.append(time.time() - t_start)
+
+        print(
+            "{}: init: {:.1f}ms, add label: {:.2f}ms, keystroke: "
+            "mean {:.2f}ms, max {:.2f}ms".format(
+                completion,
+                elapsed_init * 1000,
+                elapsed_add * 1000,
+                np.mean(elapsed_keys) * 1000,
+                np.max(elapsed_keys) * 1000,
+            )
+        )
+        dialog.close()
+
+
+if __name__ == "__main__":
+    main()
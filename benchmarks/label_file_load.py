@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+import argparse
+import glob
+import os.path as osp
+import shutil
+import tempfile
+import time
+
+import labelme
+from labelme.logger import logger
+
+
+here = osp.dirname(osp.abspath(__file__))
+data_dir = osp.join(here, "../tests/labelme_tests/data")
+
+
+def make_dataset(out_dir, source_files, num_files):
+    """Replicate source label files and their images num_files times."""
+    label_files = []
+    for i in range(num_files):
+        source_file = source_files[i % len(source_files)]
+        label_file = osp.join(out_dir, "{:08d}.json".format(i))
+        shutil.copyfile(source_file, label_file)
+        label_files.append(label_file)
+    for source_file in source_files:
+        for image_file in glob.glob(osp.splitext(source_file)[0] + ".*"):
+            if image_file != source_file:
+                shutil.copy(image_file, out_dir)
+    return label_files
+
+
+def bench(label_files, **kwargs):
+    t_start = time.time()
+    n_shapes = 0
+    for label_file in label_files:
+        n_shapes += len(labelme.LabelFile(label_file, **kwargs).shapes)
+    return time.time() - t_start, n_shapes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "--num-files", type=int, default=1000, help="number of label files"
+    )
+    parser.add_argument(
+        "--source",
+        nargs="+",
+        default=[
+            osp.join(data_dir, "annotated/2011_000003.json"),
+            osp.join(data_dir, "annotated_with_data/apc2016_obj3.json"),
+        ],
+        help="label files to replicate",
+    )
+    args = parser.parse_args()
+
+    logger.setLevel("ERROR")  # suppress version warnings
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        label_files = make_dataset(tmp_dir, args.source, args.num_files)
+        print("files: {}".format(len(label_files)))
+        for name, kwargs in [
+            ("with_image=True", dict(with_image=True)),
+            ("with_image=False", dict(with_image=False)),
+        ]:
+            elapsed, n_shapes = bench(label_files, **kwargs)
+            print(
+                "{:<18s} {:8.3f}s {:10.1f} files/s ({} shapes)".format(
+                    name, elapsed, len(label_files) / elapsed, n_shapes
+                )
+            )
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+import argparse
+import time
+
+import numpy as np
+from qtpy import QtWidgets
+
+from labelme.widgets import LabelListWidget
+from labelme.widgets import LabelListWidgetItem
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--num-items", type=int, default=5000)
+    parser.add_argument(
+        "--num-pages", type=int, default=100, help="pages to scroll"
+    )
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication([])
+    rng = np.random.RandomState(0)
+    colors = rng.randint(0, 256, (args.num_items, 3))
+
+    for html in [True, False]:
+        widget = LabelListWidget(html=html)
+        widget.resize(300, 600)
+        widget.show()
+        app.processEvents()
+
+        t_start = time.time()
+        items = []
+        for i in range(args.num_items):
+            item = LabelListWidgetItem("class_{}".format(i % 100))
+            item.setColor(colors[i].tolist())
+            items.append(item)
+        widget.addItems(items)
+        app.processEvents()
+        elapsed_fill = time.time() - t_start
+
+        scroll_bar = widget.verticalScrollBar()
+        t_start = time.time()
+        for i in range(args.num_pages):
+            scroll_bar.setValue(scroll_bar.value() + scroll_bar.pageStep())
+            widget.viewport().repaint()
+        elapsed_scroll = time.time() - t_start
+
+        print(
+            "{}: fill {} items: {:.1f}ms, scroll {} pages: {:.1f}ms".format(
+                "html" if html else "plain",
+                args.num_items,
+                elapsed_fill * 1000,
+                args.num_pages,
+                elapsed_scroll * 1000,
+            )
+        )
+        widget.close()
+
+
+if __name__ == "__main__":
+    main()
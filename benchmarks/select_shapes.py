@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+
+import argparse
+import time
+
+import numpy as np
+from qtpy import QtCore
+from qtpy import QtWidgets
+
+from labelme.app import MainWindow
+from labelme.logger import logger
+from labelme.shape import Shape
+
+
+def make_shapes(num_shapes, num_labels=100):
+    rng = np.random.RandomState(0)
+    shapes = []
+    for i in range(num_shapes):
+        shape = Shape(label="class_{}".format(rng.randint(num_labels)))
+        for x, y in rng.uniform(0, 1000, (4, 2)):
+            shape.addPoint(QtCore.QPointF(x, y))
+        shape.close()
+        shapes.append(shape)
+    return shapes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--num-shapes", type=int, default=3000)
+    parser.add_argument("--num-labels", type=int, default=100)
+    args = parser.parse_args()
+
+    logger.setLevel("ERROR")
+
+    app = QtWidgets.QApplication([])
+    win = MainWindow()
+    shapes = make_shapes(args.num_shapes, num_labels=args.num_labels)
+
+    t_start = time.time()
+    win.loadShapes(shapes)
+    print("loadShapes: {:.1f}ms".format((time.time() - t_start) * 1000))
+
+    for n in [1, 100, args.num_shapes]:
+        selected = shapes[-n:]
+        t_start = time.time()
+        win.shapeSelectionChanged(selected)
+        app.processEvents()
+        print(
+            "select {} shapes: {:.1f}ms".format(
+                n, (time.time() - t_start) * 1000
+            )
+        )
+        win.shapeSelectionChanged([])
+
+    win.close()
+
+
+if __name__ == "__main__":
+    main()
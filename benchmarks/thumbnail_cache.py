@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+
+import argparse
+import glob
+import os.path as osp
+import tempfile
+import time
+
+from qtpy import QtCore
+from qtpy import QtGui
+from qtpy import QtWidgets
+
+from labelme.thumbnail_cache import ThumbnailCache
+
+
+here = osp.dirname(osp.abspath(__file__))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "image_dir",
+        nargs="?",
+        default=osp.join(here, "../tests/labelme_tests/data/raw"),
+    )
+    parser.add_argument("--size", type=int, default=256)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication([])  # NOQA
+    filenames = sorted(glob.glob(osp.join(args.image_dir, "*.jpg")))
+    size = QtCore.QSize(args.size, args.size)
+
+    t_start = time.time()
+    for filename in filenames:
+        QtGui.QPixmap(filename).scaled(
+            size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation
+        )
+    elapsed = time.time() - t_start
+    print(
+        "QPixmap load and scale: {:.1f}ms/image".format(
+            elapsed / len(filenames) * 1000
+        )
+    )
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ThumbnailCache(cache_dir=cache_dir, size=args.size)
+        for name in ["create", "cached"]:
+            t_start = time.time()
+            for filename in filenames:
+                QtGui.QPixmap(cache.create(filename))
+            elapsed = time.time() - t_start
+            print(
+                "ThumbnailCache {}: {:.1f}ms/image".format(
+                    name, elapsed / len(filenames) * 1000
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+
+import argparse
+import json
+import os.path as osp
+import tempfile
+import time
+
+import numpy as np
+import PIL.Image
+
+from labelme.logger import logger
+from labelme.testing import assert_labelfile_sanity
+from labelme.testing import validate_labelfiles
+
+
+def make_dataset(out_dir, num_files, num_shapes):
+    PIL.Image.fromarray(np.zeros((1000, 1000, 3), dtype=np.uint8)).save(
+        osp.join(out_dir, "image.jpg")
+    )
+    rng = np.random.RandomState(0)
+    filenames = []
+    for i in range(num_files):
+        shapes = []
+        for j in range(num_shapes):
+            shapes.append(
+                dict(
+                    label="class_{}".format(rng.randint(100)),
+                    points=rng.uniform(0, 1000, (4, 2)).round(1).tolist(),
+                    group_id=None,
+                    description="",
+                    shape_type="polygon",
+                    flags={},
+                )
+            )
+        data = dict(
+            version="5.2.0",
+            flags={},
+            shapes=shapes,
+            imagePath="image.jpg",
+            imageData=None,
+            imageHeight=1000,
+            imageWidth=1000,
+        )
+        filename = osp.join(out_dir, "{:08d}.json".format(i))
+        with open(filename, "w") as f:
+            json.dump(data, f)
+        filenames.append(filename)
+    return filenames
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--num-files", type=int, default=2000)
+    parser.add_argument(
+        "--num-shapes", type=int, default=100, help="shapes per file"
+    )
+    args = parser.parse_args()
+
+    logger.setLevel("ERROR")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filenames = make_dataset(tmp_dir, args.num_files, args.num_shapes)
+
+        def validate(workers):
+            for _, errors in validate_labelfiles(filenames, workers=workers):
+                assert not errors, errors
+
+        methods = [
+            (
+                "assert_labelfile_sanity",
+                lambda: [assert_labelfile_sanity(f) for f in filenames],
+            ),
+            ("validate (workers=0)", lambda: validate(0)),
+            ("validate (all cpus)", lambda: validate(None)),
+        ]
+        for name, method in methods:
+            t_start = time.time()
+            method()
+            elapsed = time.time() - t_start
+            print(
+                "{:<24s} {:9.1f}ms {:9.1f} files/s".format(
+                    name, elapsed * 1000, len(filenames) / elapsed
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ import sys
 
 import imgviz
 import labelme
+from labelme.export_manifest import ExportManifest
+from labelme.export_manifest import file_digest
 
 try:
     import lxml.builder
@@ -29,16 +31,35 @@ def main():
     parser.add_argument(
         "--noviz", help="no visualization", action="store_true"
     )
+    parser.add_argument(
+        "--image-mode",
+        choices=["encode", "copy", "hardlink", "reflink", "symlink"],
+        default="encode",
+        help="how to write images: re-encode as JPEG, or pass JPEG through "
+        "when no transform is needed (falling back to re-encode otherwise)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="update an existing output directory, only processing added, "
+        "changed or deleted label files since the last export",
+    )
     args = parser.parse_args()
 
-    if osp.exists(args.output_dir):
+    if osp.exists(args.output_dir) and not (
+        args.incremental
+        and osp.exists(osp.join(args.output_dir, ExportManifest.basename))
+    ):
         print("Output directory already exists:", args.output_dir)
         sys.exit(1)
-    os.makedirs(args.output_dir)
-    os.makedirs(osp.join(args.output_dir, "JPEGImages"))
-    os.makedirs(osp.join(args.output_dir, "Annotations"))
+    os.makedirs(args.output_dir, exist_ok=True)
+    os.makedirs(osp.join(args.output_dir, "JPEGImages"), exist_ok=True)
+    os.makedirs(osp.join(args.output_dir, "Annotations"), exist_ok=True)
     if not args.noviz:
-        os.makedirs(osp.join(args.output_dir, "AnnotationsVisualization"))
+        os.makedirs(
+            osp.join(args.output_dir, "AnnotationsVisualization"),
+            exist_ok=True,
+        )
     print("Creating dataset:", args.output_dir)
 
     class_names = []
@@ -60,8 +81,24 @@ def main():
         f.writelines("\n".join(class_names))
     print("Saved class_names:", out_class_names_file)
 
-    for filename in glob.glob(osp.join(args.input_dir, "*.json")):
+    label_files = glob.glob(osp.join(args.input_dir, "*.json"))
+    manifest = None
+    if args.incremental:
+        manifest = ExportManifest(
+            args.output_dir,
+            options=dict(labels=file_digest(args.labels), noviz=args.noviz),
+        )
+        manifest.reset_if_options_changed()
+        label_files, unchanged, deleted = manifest.diff(label_files)
+        for filename in deleted:
+            print("Removing dataset from:", filename)
+            manifest.remove(filename)
+        print("Skipping unchanged files:", len(unchanged))
+
+    for filename in label_files:
         print("Generating dataset from:", filename)
+        if manifest is not None:
+            stat = ExportManifest.stat(filename)
 
         label_file = labelme.LabelFile(filename=filename)
 
@@ -74,7 +111,19 @@ def main():
             )
 
         img = labelme.utils.img_data_to_arr(label_file.imageData)
-        imgviz.io.imsave(out_img_file, img)
+        if args.image_mode == "encode":
+            imgviz.io.imsave(out_img_file, img)
+        else:
+            labelme.utils.export_image(
+                out_img_file,
+                image_file=osp.join(
+                    osp.dirname(filename), label_file.imagePath
+                ),
+                image_data=label_file.imageData
+                if label_file.imageDataEmbedded
+                else None,
+                mode=args.image_mode,
+            )
 
         maker = lxml.builder.ElementMaker()
         xml = maker.annotation(
@@ -141,6 +190,15 @@ def main():
         with open(out_xml_file, "wb") as f:
             f.write(lxml.etree.tostring(xml, pretty_print=True))
 
+        if manifest is not None:
+            outputs = [out_img_file, out_xml_file]
+            if not args.noviz:
+                outputs += [out_viz_file]
+            manifest.update(filename, outputs, stat=stat)
+
+    if manifest is not None:
+        manifest.save()
+
 
 if __name__ == "__main__":
     main()
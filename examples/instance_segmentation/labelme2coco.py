@@ -32,6 +32,13 @@ def main():
     parser.add_argument(
         "--noviz", help="no visualization", action="store_true"
     )
+    parser.add_argument(
+        "--image-mode",
+        choices=["encode", "copy", "hardlink", "reflink", "symlink"],
+        default="encode",
+        help="how to write images: re-encode as JPEG, or pass JPEG through "
+        "when no transform is needed (falling back to re-encode otherwise)",
+    )
     args = parser.parse_args()
 
     if osp.exists(args.output_dir):
@@ -100,7 +107,19 @@ def main():
         out_img_file = osp.join(args.output_dir, "JPEGImages", base + ".jpg")
 
         img = labelme.utils.img_data_to_arr(label_file.imageData)
-        imgviz.io.imsave(out_img_file, img)
+        if args.image_mode == "encode":
+            imgviz.io.imsave(out_img_file, img)
+        else:
+            labelme.utils.export_image(
+                out_img_file,
+                image_file=osp.join(
+                    osp.dirname(filename), label_file.imagePath
+                ),
+                image_data=label_file.imageData
+                if label_file.imageDataEmbedded
+                else None,
+                mode=args.image_mode,
+            )
         data["images"].append(
             dict(
                 license=0,
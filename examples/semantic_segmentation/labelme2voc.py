@@ -12,6 +12,8 @@ import imgviz
 import numpy as np
 
 import labelme
+from labelme.export_manifest import ExportManifest
+from labelme.export_manifest import file_digest
 
 
 def main():
@@ -24,18 +26,37 @@ def main():
     parser.add_argument(
         "--noviz", help="no visualization", action="store_true"
     )
+    parser.add_argument(
+        "--image-mode",
+        choices=["encode", "copy", "hardlink", "reflink", "symlink"],
+        default="encode",
+        help="how to write images: re-encode as JPEG, or pass JPEG through "
+        "when no transform is needed (falling back to re-encode otherwise)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="update an existing output directory, only processing added, "
+        "changed or deleted label files since the last export",
+    )
     args = parser.parse_args()
 
-    if osp.exists(args.output_dir):
+    if osp.exists(args.output_dir) and not (
+        args.incremental
+        and osp.exists(osp.join(args.output_dir, ExportManifest.basename))
+    ):
         print("Output directory already exists:", args.output_dir)
         sys.exit(1)
-    os.makedirs(args.output_dir)
-    os.makedirs(osp.join(args.output_dir, "JPEGImages"))
-    os.makedirs(osp.join(args.output_dir, "SegmentationClass"))
-    os.makedirs(osp.join(args.output_dir, "SegmentationClassPNG"))
+    os.makedirs(args.output_dir, exist_ok=True)
+    os.makedirs(osp.join(args.output_dir, "JPEGImages"), exist_ok=True)
+    os.makedirs(osp.join(args.output_dir, "SegmentationClass"), exist_ok=True)
+    os.makedirs(
+        osp.join(args.output_dir, "SegmentationClassPNG"), exist_ok=True
+    )
     if not args.noviz:
         os.makedirs(
-            osp.join(args.output_dir, "SegmentationClassVisualization")
+            osp.join(args.output_dir, "SegmentationClassVisualization"),
+            exist_ok=True,
         )
     print("Creating dataset:", args.output_dir)
 
@@ -58,8 +79,24 @@ def main():
         f.writelines("\n".join(class_names))
     print("Saved class_names:", out_class_names_file)
 
-    for filename in glob.glob(osp.join(args.input_dir, "*.json")):
+    label_files = glob.glob(osp.join(args.input_dir, "*.json"))
+    manifest = None
+    if args.incremental:
+        manifest = ExportManifest(
+            args.output_dir,
+            options=dict(labels=file_digest(args.labels), noviz=args.noviz),
+        )
+        manifest.reset_if_options_changed()
+        label_files, unchanged, deleted = manifest.diff(label_files)
+        for filename in deleted:
+            print("Removing dataset from:", filename)
+            manifest.remove(filename)
+        print("Skipping unchanged files:", len(unchanged))
+
+    for filename in label_files:
         print("Generating dataset from:", filename)
+        if manifest is not None:
+            stat = ExportManifest.stat(filename)
 
         label_file = labelme.LabelFile(filename=filename)
 
@@ -78,8 +115,20 @@ def main():
                 base + ".jpg",
             )
 
-        with open(out_img_file, "wb") as f:
-            f.write(label_file.imageData)
+        if args.image_mode == "encode":
+            with open(out_img_file, "wb") as f:
+                f.write(label_file.imageData)
+        else:
+            labelme.utils.export_image(
+                out_img_file,
+                image_file=osp.join(
+                    osp.dirname(filename), label_file.imagePath
+                ),
+                image_data=label_file.imageData
+                if label_file.imageDataEmbedded
+                else None,
+                mode=args.image_mode,
+            )
         img = labelme.utils.img_data_to_arr(label_file.imageData)
 
         lbl, _ = labelme.utils.shapes_to_label(
@@ -101,6 +150,15 @@ def main():
             )
             imgviz.io.imsave(out_viz_file, viz)
 
+        if manifest is not None:
+            outputs = [out_img_file, out_lbl_file, out_png_file]
+            if not args.noviz:
+                outputs += [out_viz_file]
+            manifest.update(filename, outputs, stat=stat)
+
+    if manifest is not None:
+        manifest.save()
+
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,9 @@
 # flake8: noqa
 
+import importlib
 import logging
 import sys
 
-from qtpy import QT_VERSION
-
 
 __appname__ = "labelme"
 
@@ -15,14 +14,26 @@ __appname__ = "labelme"
 # e.g., 1.0.0a0, 1.0.0a1, 1.0.0b0, 1.0.0rc0, 1.0.0, 1.0.0.post0
 __version__ = "5.2.0.post4"
 
-QT4 = QT_VERSION[0] == "4"
-QT5 = QT_VERSION[0] == "5"
-del QT_VERSION
-
 PY2 = sys.version[0] == "2"
 PY3 = sys.version[0] == "3"
 del sys
 
-from labelme.label_file import LabelFile
-from labelme import testing
-from labelme import utils
+
+# Qt and the submodules are loaded on first access so that importing labelme
+# in headless tools and worker processes neither imports nor requires Qt.
+def __getattr__(name):
+    if name in ["QT4", "QT5"]:
+        from qtpy import QT_VERSION
+
+        globals()["QT4"] = QT_VERSION[0] == "4"
+        globals()["QT5"] = QT_VERSION[0] == "5"
+        return globals()[name]
+    if name == "LabelFile":
+        from labelme.label_file import LabelFile
+
+        return LabelFile
+    if name in ["testing", "utils"]:
+        return importlib.import_module("labelme." + name)
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name)
+    )
@@ -4,17 +4,14 @@ import logging
 import os
 import os.path as osp
 import sys
+import time
 import yaml
 
-from qtpy import QtCore
-from qtpy import QtWidgets
-
 from labelme import __appname__
 from labelme import __version__
-from labelme.app import MainWindow
 from labelme.config import get_config
 from labelme.logger import logger
-from labelme.utils import newIcon
+from labelme.startup_profiler import StartupProfiler
 
 
 def main():
@@ -25,6 +22,11 @@ def main():
     parser.add_argument(
         "--reset-config", action="store_true", help="reset qt config"
     )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print the time of imports and initialization at startup",
+    )
     parser.add_argument(
         "--logger-level",
         default="info",
@@ -56,6 +58,13 @@ def main():
         help="stop storing image data to JSON file",
         default=argparse.SUPPRESS,
     )
+    parser.add_argument(
+        "--image-store",
+        dest="image_store",
+        help="directory to store image data in by content hash, which is "
+        "referred to from JSON files instead of embedding it",
+        default=argparse.SUPPRESS,
+    )
     parser.add_argument(
         "--autosave",
         dest="auto_save",
@@ -113,6 +122,16 @@ def main():
         print("{0} {1}".format(__appname__, __version__))
         sys.exit(0)
 
+    # Qt and the application are imported only once the arguments are
+    # parsed so that --help and --version return immediately.
+    profiler = StartupProfiler(enabled=args.profile_startup)
+    profiler.import_modules()
+    from qtpy import QtCore
+    from qtpy import QtWidgets
+
+    from labelme.app import MainWindow
+    from labelme.utils import newIcon
+
     logger.setLevel(getattr(logging, args.logger_level.upper()))
 
     if hasattr(args, "flags"):
@@ -138,11 +157,13 @@ def main():
 
     config_from_args = args.__dict__
     config_from_args.pop("version")
+    config_from_args.pop("profile_startup")
     reset_config = config_from_args.pop("reset_config")
     filename = config_from_args.pop("filename")
     output = config_from_args.pop("output")
     config_file_or_yaml = config_from_args.pop("config")
-    config = get_config(config_file_or_yaml, config_from_args)
+    with profiler.measure("load config"):
+        config = get_config(config_file_or_yaml, config_from_args)
 
     if not config["labels"] and config["validate_label"]:
         logger.error(
@@ -160,29 +181,41 @@ def main():
         else:
             output_dir = output
 
-    translator = QtCore.QTranslator()
-    translator.load(
-        QtCore.QLocale.system().name(),
-        osp.dirname(osp.abspath(__file__)) + "/translate",
-    )
-    app = QtWidgets.QApplication(sys.argv)
-    app.setApplicationName(__appname__)
-    app.setWindowIcon(newIcon("icon"))
-    app.installTranslator(translator)
-    win = MainWindow(
-        config=config,
-        filename=filename,
-        output_file=output_file,
-        output_dir=output_dir,
-    )
+    with profiler.measure("create QApplication"):
+        translator = QtCore.QTranslator()
+        translator.load(
+            QtCore.QLocale.system().name(),
+            osp.dirname(osp.abspath(__file__)) + "/translate",
+        )
+        app = QtWidgets.QApplication(sys.argv)
+        app.setApplicationName(__appname__)
+        app.setWindowIcon(newIcon("icon"))
+        app.installTranslator(translator)
+    with profiler.measure("create MainWindow"):
+        win = MainWindow(
+            config=config,
+            filename=filename,
+            output_file=output_file,
+            output_dir=output_dir,
+        )
 
     if reset_config:
         logger.info("Resetting Qt config: %s" % win.settings.fileName())
         win.settings.clear()
         sys.exit(0)
 
-    win.show()
-    win.raise_()
+    with profiler.measure("show MainWindow"):
+        win.show()
+        win.raise_()
+    if profiler.enabled:
+        # the first event loop iteration paints the window
+        t_exec = time.time()
+
+        def report():
+            profiler.add("first event loop iteration", time.time() - t_exec)
+            profiler.report()
+
+        QtCore.QTimer.singleShot(0, report)
     sys.exit(app.exec_())
 
 
@@ -0,0 +1,218 @@
+import json
+import math
+import mmap
+import os
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+def _stdlib_loads(s):
+    if isinstance(s, (bytes, bytearray)):
+        s = s.decode("utf-8")
+    return json.loads(s)
+
+
+def _stdlib_dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _is_finite(obj):
+    """Return whether obj holds no NaN or infinite float.
+
+    Lists of numbers and lists of pairs of numbers (e.g., points) are summed
+    in C rather than walked. A sum that overflows only makes dumps() fall
+    back to the stdlib.
+    """
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, float):
+            total = obj
+        elif isinstance(obj, dict):
+            stack.extend(obj.values())
+            continue
+        elif isinstance(obj, (list, tuple)):
+            try:
+                try:
+                    total = sum(obj)
+                except TypeError:
+                    total = sum(map(sum, obj))
+            except TypeError:
+                stack.extend(obj)
+                continue
+        else:
+            continue
+        try:
+            if not math.isfinite(total):
+                return False
+        except OverflowError:  # int
+            pass
+    return True
+
+
+def _orjson_dumps(obj):
+    if not _is_finite(obj):
+        # orjson writes NaN and Infinity as null
+        raise ValueError("non-finite float")
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+
+def _ujson_dumps(obj):
+    return ujson.dumps(
+        obj, ensure_ascii=False, indent=2, escape_forward_slashes=False
+    ).encode("utf-8")
+
+
+# name -> (loads, dumps), in order of preference
+BACKENDS = {}
+if orjson is not None:
+    BACKENDS["orjson"] = (orjson.loads, _orjson_dumps)
+if ujson is not None:
+    BACKENDS["ujson"] = (ujson.loads, _ujson_dumps)
+BACKENDS["json"] = (_stdlib_loads, _stdlib_dumps)
+
+backend = None
+
+
+def set_backend(name=None):
+    """Select the JSON library used by :func:`loads` and :func:`dumps`.
+
+    By default the fastest installed one of orjson, ujson and json (stdlib)
+    is used, which can be overridden with the LABELME_JSON_BACKEND
+    environment variable.
+    """
+    global backend
+    if name is None:
+        name = os.environ.get("LABELME_JSON_BACKEND") or next(iter(BACKENDS))
+    if name not in BACKENDS:
+        raise ValueError(
+            "Unsupported JSON backend: {} (available: {})".format(
+                name, ", ".join(BACKENDS)
+            )
+        )
+    backend = name
+
+
+set_backend()
+
+
+def loads(s):
+    try:
+        return BACKENDS[backend][0](s)
+    except ValueError:
+        if backend == "json":
+            raise
+        # e.g., NaN, which only the stdlib accepts
+        return _stdlib_loads(s)
+
+
+def dumps(obj):
+    """Serialize obj to UTF-8 bytes formatted as json.dumps(indent=2).
+
+    The output of all backends parses to the same values, but orjson and
+    ujson spell floats of very small or large magnitude differently from
+    the stdlib (e.g., 0.00001 and 1e20 vs. 1e-05 and 1e+20), so files are
+    not byte-identical across backends.
+    """
+    try:
+        return BACKENDS[backend][1](obj)
+    except (TypeError, ValueError, OverflowError):
+        if backend == "json":
+            raise
+        # e.g., NaN, integers beyond 64 bits or non-string keys
+        return _stdlib_dumps(obj)
+
+
+class DeferredString(object):
+    """String value of a JSON file that is read only when needed."""
+
+    def __init__(self, filename, offset, length):
+        self.filename = filename
+        self.offset = offset  # of the opening quote
+        self.length = length  # including the quotes
+
+    def __repr__(self):
+        return "{}(filename={!r}, offset={}, length={})".format(
+            self.__class__.__name__, self.filename, self.offset, self.length
+        )
+
+    def read(self):
+        with open(self.filename, "rb") as f:
+            f.seek(self.offset)
+            raw = f.read(self.length)
+        if len(raw) != self.length or raw[:1] != b'"' or raw[-1:] != b'"':
+            raise ValueError(
+                "Deferred JSON string was modified: {}".format(self)
+            )
+        if b"\\" in raw:
+            return loads(raw)
+        return raw[1:-1].decode("utf-8")
+
+
+def _find_string_end(buf, start):
+    """Return the index of the closing quote of the string opened at start."""
+    end = start
+    while True:
+        end = buf.find(b'"', end + 1)
+        if end == -1:
+            raise ValueError("Unterminated string at {}".format(start))
+        n_backslashes = 0
+        while buf[end - 1 - n_backslashes] == 0x5C:  # backslash
+            n_backslashes += 1
+        if n_backslashes % 2 == 0:
+            return end
+
+
+def load(filename, defer_key=None):
+    """Load a JSON file, optionally not parsing a large top-level string.
+
+    If defer_key is given and its value is a string, the value is replaced
+    by a :class:`DeferredString` that records its byte range, so that the
+    string is skipped with a plain byte search and never decoded. This makes
+    reading e.g., shapes from a label file with embedded imageData about as
+    cheap as reading one without.
+    """
+    with open(filename, "rb") as f:
+        if defer_key is None:
+            return loads(f.read())
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            buf = b""
+    try:
+        return _load_deferred(buf, filename, defer_key)
+    finally:
+        if isinstance(buf, mmap.mmap):
+            buf.close()
+
+
+def _load_deferred(buf, filename, defer_key):
+    key = json.dumps(defer_key).encode("utf-8")
+    key_pattern = re.compile(re.escape(key) + rb"\s*:\s*")
+
+    match = key_pattern.search(buf)
+    if match is None or buf[match.end() : match.end() + 1] != b'"':
+        return loads(buf[:])
+    start = match.end()
+
+    end = _find_string_end(buf, start) + 1
+    tail = buf[end:]
+    if key_pattern.search(tail):
+        # ambiguous, e.g., the same key in a nested object
+        return loads(buf[:])
+
+    data = loads(buf[:start] + b"null" + tail)
+    if not isinstance(data, dict) or data.get(defer_key, 0) is not None:
+        # the key was not at the top level
+        return loads(buf[:])
+    data[defer_key] = DeferredString(filename, start, end - start)
+    return data
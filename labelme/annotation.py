@@ -0,0 +1,449 @@
+import copy
+
+import numpy as np
+
+
+SHAPE_TYPES = ["polygon", "rectangle", "point", "line", "circle", "linestrip"]
+
+
+def bboxes_and_areas(points, lengths, shape_types):
+    """Return (xmin, ymin, xmax, ymax) and area of shapes at once.
+
+    points has the points of all shapes concatenated, lengths the number of
+    points of each shape. Areas of lines and points are 0, and shapes without
+    points get NaN.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    lengths = np.asarray(lengths, dtype=int)
+    bboxes = np.full((len(lengths), 4), np.nan, dtype=np.float64)
+    areas = np.full(len(lengths), np.nan, dtype=np.float64)
+    valid = np.flatnonzero(lengths)
+    if len(valid) == 0:
+        return bboxes, areas
+
+    all_starts = np.cumsum(lengths) - lengths
+    starts = all_starts[valid]
+    bboxes[valid, :2] = np.minimum.reduceat(points, starts)
+    bboxes[valid, 2:] = np.maximum.reduceat(points, starts)
+
+    # shoelace formula with the next vertex wrapping around in each shape
+    next_index = _next_index(lengths)
+    x, y = points[:, 0], points[:, 1]
+    cross = x * y[next_index] - x[next_index] * y
+    areas[valid] = 0.5 * np.abs(np.add.reduceat(cross, starts))
+
+    for i in valid.tolist():
+        shape_type = shape_types[i]
+        if shape_type is None or shape_type == "polygon":
+            continue
+        if shape_type in ["circle", "rectangle"] and lengths[i] == 2:
+            (x1, y1), (x2, y2) = points[all_starts[i] : all_starts[i] + 2]
+            if shape_type == "circle":
+                r = np.hypot(x2 - x1, y2 - y1)
+                bboxes[i] = x1 - r, y1 - r, x1 + r, y1 + r
+                areas[i] = np.pi * r**2
+            else:
+                areas[i] = abs((x2 - x1) * (y2 - y1))
+        else:
+            areas[i] = 0
+    return bboxes, areas
+
+
+def _next_index(lengths):
+    """Index of the next point of each point, wrapping around in shapes."""
+    ends = np.cumsum(lengths)
+    next_index = np.arange(1, ends[-1] + 1) if len(ends) else np.zeros(0)
+    valid = lengths > 0
+    next_index[ends[valid] - 1] = (ends - lengths)[valid]
+    return next_index.astype(int)
+
+
+def _crossings(starts, ends, point):
+    """Whether the edges cross the ray from point to +x (even-odd rule)."""
+    x, y = point
+    x1, y1 = starts.T
+    x2, y2 = ends.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return ((y1 > y) != (y2 > y)) & (
+            x < (x2 - x1) * (y - y1) / (y2 - y1) + x1
+        )
+
+
+def point_segment_distances(points, starts, ends):
+    """Distances from points to the segments from starts to ends.
+
+    The arguments are broadcast against each other, e.g. one point and many
+    segments or many points and one segment.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    starts = np.asarray(starts, dtype=np.float64)
+    directions = np.asarray(ends, dtype=np.float64) - starts
+    lengths2 = (directions**2).sum(axis=-1)
+    dots = ((points - starts) * directions).sum(axis=-1)
+    t = np.divide(
+        dots,
+        lengths2,
+        out=np.zeros(np.broadcast(dots, lengths2).shape),
+        where=lengths2 > 0,
+    )
+    projections = starts + np.clip(t, 0, 1)[..., None] * directions
+    return np.sqrt(((points - projections) ** 2).sum(axis=-1))
+
+
+def nearest_vertex(points, point, epsilon):
+    """Index of the vertex nearest to point within epsilon, or None."""
+    if len(points) == 0:
+        return None
+    distances = np.hypot(*(np.asarray(points) - point).T)
+    i = int(np.argmin(distances))
+    return i if distances[i] <= epsilon else None
+
+
+def nearest_edge(points, point, epsilon):
+    """Index i of the edge (points[i - 1], points[i]) nearest to point.
+
+    None is returned if no edge is within epsilon.
+    """
+    if len(points) == 0:
+        return None
+    points = np.asarray(points, dtype=np.float64)
+    distances = point_segment_distances(
+        point, np.roll(points, 1, axis=0), points
+    )
+    i = int(np.argmin(distances))
+    return i if distances[i] <= epsilon else None
+
+
+def simplify_points(points, tolerance, closed=False):
+    """Remove the points within tolerance of the simplified line.
+
+    This is the Ramer-Douglas-Peucker algorithm. A closed polygon is split
+    at its first point and the point farthest from it, so that at least
+    three points are kept unless it is degenerate.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) < 3:
+        return points
+    keep = np.zeros(len(points), dtype=bool)
+    if not closed:
+        _simplify(points, tolerance, keep)
+        return points[keep]
+
+    far = int(np.argmax(np.hypot(*(points - points[0]).T)))
+    if far == 0:
+        return points[:1]
+    _simplify(points[: far + 1], tolerance, keep[: far + 1])
+    ring = np.concatenate([points[far:], points[:1]])
+    keep_ring = np.zeros(len(ring), dtype=bool)
+    _simplify(ring, tolerance, keep_ring)
+    keep[far:] |= keep_ring[:-1]
+    if keep.sum() < 3:
+        # a polygon within tolerance of a line keeps its widest vertex
+        distances = point_segment_distances(points, points[0], points[far])
+        distances[keep] = -1
+        keep[np.argmax(distances)] = True
+    return points[keep]
+
+
+def _simplify(points, tolerance, keep):
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        # distances to the line through the first and last points
+        dx, dy = points[last] - points[first]
+        relative = points[first + 1 : last] - points[first]
+        norm = np.hypot(dx, dy)
+        if norm == 0:
+            distances = np.hypot(relative[:, 0], relative[:, 1])
+        else:
+            distances = (
+                np.abs(dx * relative[:, 1] - dy * relative[:, 0]) / norm
+            )
+        i = int(np.argmax(distances))
+        if distances[i] > tolerance:
+            i += first + 1
+            keep[i] = True
+            stack.append((first, i))
+            stack.append((i, last))
+
+
+def clip_polygon(points, xmin, ymin, xmax, ymax):
+    """Clip a polygon to a rectangle (Sutherland-Hodgman algorithm)."""
+    points = np.asarray(points, dtype=np.float64)
+    if (
+        len(points) == 0
+        or (points.min(axis=0) >= (xmin, ymin)).all()
+        and (points.max(axis=0) <= (xmax, ymax)).all()
+    ):
+        return points
+    for axis, bound, inside in [
+        (0, xmin, np.greater_equal),
+        (0, xmax, np.less_equal),
+        (1, ymin, np.greater_equal),
+        (1, ymax, np.less_equal),
+    ]:
+        if len(points) == 0:
+            break
+        previous = np.roll(points, 1, axis=0)
+        is_inside = inside(points[:, axis], bound)
+        was_inside = inside(previous[:, axis], bound)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = (bound - previous[:, axis]) / (
+                points[:, axis] - previous[:, axis]
+            )
+            intersections = previous + t[:, None] * (points - previous)
+        intersections[:, axis] = bound
+        # each edge adds its intersection with the bound if it crosses it
+        # and then its end point if that is inside
+        candidates = np.stack([intersections, points], axis=1)
+        mask = np.stack([is_inside != was_inside, is_inside], axis=1)
+        points = candidates[mask]
+    return points
+
+
+class ShapeData(object):
+    """Shape of a label file with its points as an array, without Qt."""
+
+    __slots__ = [
+        "label",
+        "points",
+        "shape_type",
+        "group_id",
+        "flags",
+        "description",
+        "other_data",
+    ]
+
+    def __init__(
+        self,
+        points,
+        label=None,
+        shape_type=None,
+        group_id=None,
+        flags=None,
+        description=None,
+        other_data=None,
+    ):
+        if shape_type is None:
+            shape_type = "polygon"
+        if shape_type not in SHAPE_TYPES:
+            raise ValueError("Unexpected shape_type: {}".format(shape_type))
+        self.label = label
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.shape_type = shape_type
+        self.group_id = group_id
+        self.flags = flags or {}
+        self.description = description
+        self.other_data = other_data or {}
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        return cls(
+            points=data.pop("points"),
+            label=data.pop("label", None),
+            shape_type=data.pop("shape_type", None),
+            group_id=data.pop("group_id", None),
+            flags=data.pop("flags", None),
+            description=data.pop("description", None),
+            other_data=data.pop("other_data", data),
+        )
+
+    def to_dict(self):
+        data = self.other_data.copy()
+        data.update(
+            dict(
+                label=self.label,
+                points=self.points.tolist(),
+                group_id=self.group_id,
+                description=self.description,
+                shape_type=self.shape_type,
+                flags=self.flags,
+            )
+        )
+        return data
+
+    def copy(self, points=None):
+        return ShapeData(
+            points=self.points.copy() if points is None else points,
+            label=self.label,
+            shape_type=self.shape_type,
+            group_id=self.group_id,
+            flags=copy.deepcopy(self.flags),
+            description=self.description,
+            other_data=copy.deepcopy(self.other_data),
+        )
+
+    def __len__(self):
+        return len(self.points)
+
+    def __repr__(self):
+        return "ShapeData(label={!r}, shape_type={!r}, points={})".format(
+            self.label, self.shape_type, len(self.points)
+        )
+
+    def bbox(self):
+        bboxes, _ = bboxes_and_areas(
+            self.points, [len(self.points)], [self.shape_type]
+        )
+        return bboxes[0]
+
+    def area(self):
+        _, areas = bboxes_and_areas(
+            self.points, [len(self.points)], [self.shape_type]
+        )
+        return areas[0]
+
+    def contains(self, point):
+        if self.shape_type == "polygon" and len(self.points) >= 3:
+            crossings = _crossings(
+                self.points, np.roll(self.points, -1, axis=0), point
+            )
+            return bool(crossings.sum() % 2)
+        if self.shape_type in ["rectangle", "circle"] and len(self) == 2:
+            xmin, ymin, xmax, ymax = self.bbox()
+            x, y = point
+            if self.shape_type == "rectangle":
+                return bool(xmin <= x <= xmax and ymin <= y <= ymax)
+            center_x, center_y = (xmin + xmax) / 2, (ymin + ymax) / 2
+            return bool(
+                np.hypot(x - center_x, y - center_y) <= (xmax - xmin) / 2
+            )
+        return False
+
+    def nearest_vertex(self, point, epsilon):
+        return nearest_vertex(self.points, point, epsilon)
+
+    def nearest_edge(self, point, epsilon):
+        return nearest_edge(self.points, point, epsilon)
+
+    def move_by(self, offset):
+        self.points = self.points + offset
+
+    def simplify(self, tolerance):
+        """Return the shape with its polygon or line strip simplified."""
+        if self.shape_type not in ["polygon", "linestrip"]:
+            return self.copy()
+        return self.copy(
+            points=simplify_points(
+                self.points,
+                tolerance,
+                closed=self.shape_type == "polygon",
+            )
+        )
+
+    def clip(self, width, height):
+        """Return the shape clipped to the pixels of an image of the size.
+
+        Polygons are clipped geometrically and the points of the other shape
+        types are moved into the image as the canvas does. None is returned
+        if nothing remains.
+        """
+        xmax, ymax = width - 1, height - 1
+        if self.shape_type == "polygon":
+            points = clip_polygon(self.points, 0, 0, xmax, ymax)
+            return self.copy(points=points) if len(points) >= 3 else None
+        if self.shape_type == "point":
+            x, y = self.points[0]
+            return self.copy() if 0 <= x <= xmax and 0 <= y <= ymax else None
+        points = np.clip(self.points, 0, [xmax, ymax])
+        if self.shape_type in ["rectangle", "line"] and np.all(
+            points[0] == points[-1]
+        ):
+            return None
+        return self.copy(points=points)
+
+
+class ShapeBatch(object):
+    """Shapes with their points in one array for vectorized geometry."""
+
+    def __init__(self, shapes):
+        self.shapes = list(shapes)
+        self.lengths = np.array(
+            [len(shape.points) for shape in self.shapes], dtype=int
+        )
+        self.starts = np.cumsum(self.lengths) - self.lengths
+        if self.shapes:
+            self.points = np.concatenate(
+                [shape.points for shape in self.shapes]
+            )
+        else:
+            self.points = np.zeros((0, 2), dtype=np.float64)
+        self.shape_types = np.array(
+            [shape.shape_type for shape in self.shapes], dtype=object
+        )
+        # computed on first use
+        self._bboxes_and_areas = None
+        self._next_points = None
+
+    @classmethod
+    def from_dicts(cls, shapes):
+        return cls(ShapeData.from_dict(shape) for shape in shapes)
+
+    def to_dicts(self):
+        return [shape.to_dict() for shape in self.shapes]
+
+    def __len__(self):
+        return len(self.shapes)
+
+    def __iter__(self):
+        return iter(self.shapes)
+
+    def __getitem__(self, i):
+        return self.shapes[i]
+
+    def bboxes_and_areas(self):
+        if self._bboxes_and_areas is None:
+            self._bboxes_and_areas = bboxes_and_areas(
+                self.points, self.lengths, self.shape_types
+            )
+        return self._bboxes_and_areas
+
+    def contains(self, point):
+        """Return whether each shape contains point.
+
+        Polygons follow the even-odd rule, and points, lines and line strips
+        contain nothing.
+        """
+        x, y = point
+        contains = np.zeros(len(self), dtype=bool)
+        if len(self) == 0:
+            return contains
+
+        polygon = (self.shape_types == "polygon") & (self.lengths >= 3)
+        if polygon.any():
+            if self._next_points is None:
+                self._next_points = self.points[_next_index(self.lengths)]
+            crossings = _crossings(self.points, self._next_points, point)
+            valid = np.flatnonzero(self.lengths)
+            counts = np.zeros(len(self), dtype=int)
+            counts[valid] = np.add.reduceat(crossings, self.starts[valid])
+            contains[polygon] = counts[polygon] % 2 == 1
+
+        bboxes, _ = self.bboxes_and_areas()
+        two_points = self.lengths == 2
+        rectangle = (self.shape_types == "rectangle") & two_points
+        contains[rectangle] = (
+            (bboxes[rectangle, 0] <= x)
+            & (x <= bboxes[rectangle, 2])
+            & (bboxes[rectangle, 1] <= y)
+            & (y <= bboxes[rectangle, 3])
+        )
+        circle = (self.shape_types == "circle") & two_points
+        centers = (bboxes[circle, :2] + bboxes[circle, 2:]) / 2
+        radii = (bboxes[circle, 2] - bboxes[circle, 0]) / 2
+        contains[circle] = (
+            np.hypot(x - centers[:, 0], y - centers[:, 1]) <= radii
+        )
+        return contains
+
+    def simplify(self, tolerance):
+        return ShapeBatch(shape.simplify(tolerance) for shape in self.shapes)
+
+    def clip(self, width, height):
+        """Return the shapes clipped to the image, dropping empty ones."""
+        shapes = (shape.clip(width, height) for shape in self.shapes)
+        return ShapeBatch(shape for shape in shapes if shape is not None)
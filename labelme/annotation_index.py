@@ -0,0 +1,334 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import os.path as osp
+import sqlite3
+
+import numpy as np
+
+from labelme.file_query import FileSummary
+from labelme.label_file import LabelFile
+from labelme.logger import logger
+from labelme import utils
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    image_path TEXT,
+    image_height INTEGER,
+    image_width INTEGER,
+    num_shapes INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS file_flags (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    flag TEXT NOT NULL,
+    value INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS file_flags_flag ON file_flags(flag, value);
+CREATE INDEX IF NOT EXISTS file_flags_file ON file_flags(file_id);
+CREATE TABLE IF NOT EXISTS shapes (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    shape_type TEXT NOT NULL,
+    group_id INTEGER,
+    description TEXT,
+    num_points INTEGER NOT NULL,
+    xmin REAL,
+    ymin REAL,
+    xmax REAL,
+    ymax REAL,
+    area REAL,
+    flags TEXT
+);
+CREATE INDEX IF NOT EXISTS shapes_label ON shapes(label);
+CREATE INDEX IF NOT EXISTS shapes_file ON shapes(file_id);
+CREATE INDEX IF NOT EXISTS shapes_shape_type ON shapes(shape_type);
+CREATE TABLE IF NOT EXISTS file_labels (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    label TEXT NOT NULL,
+    num_shapes INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS file_labels_label ON file_labels(label);
+CREATE INDEX IF NOT EXISTS file_labels_file ON file_labels(file_id);
+CREATE TABLE IF NOT EXISTS labels (
+    label TEXT PRIMARY KEY,
+    num_shapes INTEGER NOT NULL,
+    num_files INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS file_labels_insert
+AFTER INSERT ON file_labels BEGIN
+    INSERT INTO labels (label, num_shapes, num_files)
+    VALUES (NEW.label, NEW.num_shapes, 1)
+    ON CONFLICT (label) DO UPDATE SET
+        num_shapes = num_shapes + NEW.num_shapes,
+        num_files = num_files + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS file_labels_delete
+AFTER DELETE ON file_labels BEGIN
+    UPDATE labels SET
+        num_shapes = num_shapes - OLD.num_shapes,
+        num_files = num_files - 1
+    WHERE label = OLD.label;
+    DELETE FROM labels WHERE label = OLD.label AND num_files = 0;
+END;
+"""
+
+
+def get_cache_file(root_dir):
+    """Return the default location of the index of a directory."""
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or osp.join(
+        osp.expanduser("~"), ".cache"
+    )
+    key = hashlib.sha1(osp.abspath(root_dir).encode("utf-8")).hexdigest()
+    return osp.join(cache_dir, "labelme", "index", key[:16] + ".sqlite3")
+
+
+def _is_label_file(filename):
+    return LabelFile.is_label_file(filename) and not osp.basename(
+        filename
+    ).startswith(".")
+
+
+def _stat(filename):
+    stat = os.stat(filename)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _read_label_file(filename):
+    """Read the records of a label file to index, in worker processes."""
+    size, mtime_ns = _stat(filename)
+    record = dict(path=filename, size=size, mtime_ns=mtime_ns)
+    try:
+        label_file = LabelFile(filename, with_image=False)
+        bboxes, areas = utils.shapes_to_bboxes_and_areas(label_file.shapes)
+        # NaN of shapes without points to NULL
+        bboxes = np.where(np.isnan(bboxes), None, bboxes).tolist()
+        areas = np.where(np.isnan(areas), None, areas).tolist()
+        shapes = []
+        for i, shape in enumerate(label_file.shapes):
+            if not isinstance(shape["label"], str):
+                raise ValueError(
+                    "Invalid label of shape {}: {!r}".format(i, shape["label"])
+                )
+            # null shape_type is a polygon as in utils.shape_to_mask
+            shape_type = shape["shape_type"] or "polygon"
+            shapes.append(
+                (i, shape["label"], shape_type, shape["group_id"])
+                + (shape["description"], len(shape["points"]))
+                + tuple(bboxes[i])
+                + (areas[i], json.dumps(shape["flags"] or {}))
+            )
+        record.update(
+            image_path=label_file.imagePath,
+            image_height=label_file.imageHeight,
+            image_width=label_file.imageWidth,
+            flags=label_file.flags,
+            shapes=shapes,
+            error=None,
+        )
+    except Exception as e:
+        record.update(flags={}, shapes=[], error=str(e))
+    return record
+
+
+class AnnotationIndex(object):
+    """SQLite index of the shapes and flags in a set of label files.
+
+    Tables ``files``, ``file_flags``, ``shapes`` (with bbox and area),
+    ``file_labels`` (shape counts per file and label) and ``labels`` (shape
+    and file counts per label, kept up to date by triggers) can be queried with
+    :meth:`query` in addition to the helper methods. :meth:`update`
+    re-reads only label files whose size or mtime changed.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.conn = sqlite3.connect(filename)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def scan(root_dir):
+        filenames = []
+        for dirpath, dirnames, files in os.walk(root_dir):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for file in files:
+                filename = osp.join(dirpath, file)
+                if _is_label_file(filename):
+                    filenames.append(osp.abspath(filename))
+        return sorted(filenames)
+
+    def update(self, root_dir, workers=None, chunksize=64, interrupted=None):
+        """Index the label files under root_dir, and forget deleted ones.
+
+        Returns the numbers of (re-)indexed and removed files. If the
+        callable interrupted returns True, the files indexed so far are
+        kept and the rest is left for the next update.
+        """
+        filenames = self.scan(root_dir)
+        root_dir = osp.join(osp.abspath(root_dir), "")
+
+        indexed = {}
+        for file_id, path, size, mtime_ns in self.conn.execute(
+            "SELECT id, path, size, mtime_ns FROM files"
+        ):
+            if path.startswith(root_dir):
+                indexed[path] = (file_id, size, mtime_ns)
+
+        changed = []
+        for filename in filenames:
+            entry = indexed.pop(filename, None)
+            if entry is None or entry[1:] != _stat(filename):
+                changed.append(filename)
+        removed = [file_id for file_id, _, _ in indexed.values()]
+
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM files WHERE id = ?",
+                [(file_id,) for file_id in removed],
+            )
+            if workers == 0 or len(changed) < 2 * chunksize:
+                records = map(_read_label_file, changed)
+                self._insert(records, interrupted=interrupted)
+            else:
+                with multiprocessing.Pool(workers) as pool:
+                    records = pool.imap_unordered(
+                        _read_label_file, changed, chunksize=chunksize
+                    )
+                    self._insert(records, interrupted=interrupted)
+        logger.info(
+            "Indexed {} files ({} changed, {} removed)".format(
+                len(filenames), len(changed), len(removed)
+            )
+        )
+        return len(changed), len(removed)
+
+    def _insert(self, records, interrupted=None):
+        for record in records:
+            if interrupted is not None and interrupted():
+                break
+            if record["error"] is not None:
+                logger.warning(
+                    "Failed to read {}: {}".format(
+                        record["path"], record["error"]
+                    )
+                )
+            self.conn.execute(
+                "DELETE FROM files WHERE path = ?", (record["path"],)
+            )
+            file_id = self.conn.execute(
+                "INSERT INTO files (path, size, mtime_ns, image_path, "
+                "image_height, image_width, num_shapes, error) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record["path"],
+                    record["size"],
+                    record["mtime_ns"],
+                    record.get("image_path"),
+                    record.get("image_height"),
+                    record.get("image_width"),
+                    len(record["shapes"]),
+                    record["error"],
+                ),
+            ).lastrowid
+            self.conn.executemany(
+                "INSERT INTO file_flags (file_id, flag, value) "
+                "VALUES (?, ?, ?)",
+                [
+                    (file_id, flag, bool(value))
+                    for flag, value in record["flags"].items()
+                ],
+            )
+            self.conn.executemany(
+                "INSERT INTO shapes (file_id, idx, label, shape_type, "
+                "group_id, description, num_points, xmin, ymin, xmax, ymax, "
+                "area, flags) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(file_id,) + shape for shape in record["shapes"]],
+            )
+            label_counts = {}
+            for shape in record["shapes"]:
+                label_counts[shape[1]] = label_counts.get(shape[1], 0) + 1
+            self.conn.executemany(
+                "INSERT INTO file_labels (file_id, label, num_shapes) "
+                "VALUES (?, ?, ?)",
+                [(file_id,) + item for item in label_counts.items()],
+            )
+
+    def query(self, sql, params=()):
+        return self.conn.execute(sql, params).fetchall()
+
+    def labels(self):
+        """Return (label, num_shapes, num_files) sorted by label."""
+        return self.query(
+            "SELECT label, num_shapes, num_files FROM labels ORDER BY label"
+        )
+
+    def files(self, label=None, flag=None, shape_type=None):
+        """Return the label files with all of the given conditions.
+
+        flag selects files whose image-level flag is true.
+        """
+        conditions = []
+        params = []
+        if label is not None:
+            conditions.append(
+                "id IN (SELECT file_id FROM file_labels WHERE label = ?)"
+            )
+            params.append(label)
+        if flag is not None:
+            conditions.append(
+                "id IN (SELECT file_id FROM file_flags "
+                "WHERE flag = ? AND value)"
+            )
+            params.append(flag)
+        if shape_type is not None:
+            conditions.append(
+                "id IN (SELECT file_id FROM shapes WHERE shape_type = ?)"
+            )
+            params.append(shape_type)
+        sql = "SELECT path FROM files"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY path"
+        return [path for path, in self.query(sql, params)]
+
+    def summaries(self):
+        """Return the FileSummary of each indexed label file by path."""
+        summaries = {}
+        paths = {}
+        for file_id, path, num_shapes in self.conn.execute(
+            "SELECT id, path, num_shapes FROM files"
+        ):
+            summaries[path] = FileSummary(num_shapes=num_shapes)
+            paths[file_id] = path
+        for file_id, label, num_shapes in self.conn.execute(
+            "SELECT file_id, label, num_shapes FROM file_labels"
+        ):
+            summaries[paths[file_id]].label_counts[label] = num_shapes
+        flags = {}
+        for file_id, flag in self.conn.execute(
+            "SELECT file_id, flag FROM file_flags WHERE value"
+        ):
+            flags.setdefault(file_id, set()).add(flag)
+        for file_id, file_flags in flags.items():
+            summaries[paths[file_id]].flags = frozenset(file_flags)
+        return summaries
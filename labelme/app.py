@@ -1,15 +1,12 @@
 # -*- coding: utf-8 -*-
 
 import functools
-import html
 import math
 import os
 import os.path as osp
 import re
 import webbrowser
 
-import imgviz
-import natsort
 from qtpy import QtCore
 from qtpy.QtCore import Qt
 from qtpy import QtGui
@@ -19,11 +16,20 @@ from labelme import __appname__
 from labelme import PY2
 
 from . import utils
+from labelme import annotation
 from labelme.config import get_config
+from labelme.file_query import FileQuery
+from labelme.file_query import FileSummary
+from labelme.file_summary_loader import FileSummaryLoader
+from labelme.image_loader import ImageLoader
+from labelme.image_loader import read_image_preview
 from labelme.label_file import LabelFile
 from labelme.label_file import LabelFileError
+from labelme.label_file_writer import LabelFileWriter
 from labelme.logger import logger
 from labelme.shape import Shape
+from labelme.thumbnail_cache import ThumbnailCache
+from labelme.thumbnail_loader import ThumbnailLoader
 from labelme.widgets import BrightnessContrastDialog
 from labelme.widgets import Canvas
 from labelme.widgets import FileDialogPreview
@@ -41,7 +47,19 @@ from labelme.widgets import ZoomWidget
 # - Zoom is too "steppy".
 
 
-LABEL_COLORMAP = imgviz.label_colormap()
+@functools.lru_cache(maxsize=1)
+def _label_colormap():
+    import imgviz  # deferred as it is only needed to colour shapes
+
+    return imgviz.label_colormap()
+
+
+def __getattr__(name):
+    if name == "LABEL_COLORMAP":
+        return _label_colormap()
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name)
+    )
 
 
 class MainWindow(QtWidgets.QMainWindow):
@@ -98,17 +116,14 @@ class MainWindow(QtWidgets.QMainWindow):
         self._copied_shapes = None
 
         # Main widgets and related state.
-        self.labelDialog = LabelDialog(
-            parent=self,
-            labels=self._config["labels"],
-            sort_labels=self._config["sort_labels"],
-            show_text_field=self._config["show_label_text_field"],
-            completion=self._config["label_completion"],
-            fit_to_content=self._config["fit_to_content"],
-            flags=self._config["label_flags"],
-        )
+        # The label dialog is hidden until the first shape is labeled, so it
+        # is created then (see labelDialog) with the labels seen so far.
+        self._labelDialog = None
+        self._labelHistory = {}  # ordered set of labels before creation
 
-        self.labelList = LabelListWidget()
+        self.labelList = LabelListWidget(
+            html=self._config["label_list_style"] == "html"
+        )
         self.lastOpenDir = None
 
         self.flag_dock = self.flag_widget = None
@@ -131,6 +146,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.shape_dock.setWidget(self.labelList)
 
         self.uniqLabelList = UniqueLabelQListWidget()
+        # key=label, value=rgb, as the color depends on the row of the label
+        self._rgbByLabel = {}
+        self.uniqLabelList.labelRowsChanged.connect(self._rgbByLabel.clear)
         self.uniqLabelList.setToolTip(
             self.tr(
                 "Select label to start annotating for it. "
@@ -149,6 +167,17 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.fileSearch = QtWidgets.QLineEdit()
         self.fileSearch.setPlaceholderText(self.tr("Search Filename"))
+        self.fileSearch.setToolTip(
+            self.tr(
+                "Space separated terms, all of which must match:\n"
+                "  TEXT: filename contains TEXT\n"
+                "  label:NAME: has a shape of label NAME\n"
+                "  label:NAME>N, label:NAME=0: number of shapes of NAME\n"
+                "  shapes<N: number of shapes\n"
+                "  flag:NAME: image flag NAME is checked\n"
+                "  -TERM: TERM does not match"
+            )
+        )
         self.fileSearch.textChanged.connect(self.fileSearchChanged)
         self.fileListWidget = QtWidgets.QListWidget()
         self.fileListWidget.itemSelectionChanged.connect(
@@ -569,6 +598,16 @@ class MainWindow(QtWidgets.QMainWindow):
         )
         fill_drawing.trigger()
 
+        fileThumbnails = action(
+            self.tr("File &Thumbnails"),
+            self.setFileThumbnails,
+            None,
+            "file",
+            self.tr("Show the file list as a grid of thumbnails"),
+            checkable=True,
+            checked=self._config["file_thumbnails"],
+        )
+
         # Lavel list context menu.
         labelMenu = QtWidgets.QMenu()
         utils.addActions(labelMenu, (edit, delete))
@@ -608,6 +647,7 @@ class MainWindow(QtWidgets.QMainWindow):
             zoomOut=zoomOut,
             zoomOrg=zoomOrg,
             keepPrevScale=keepPrevScale,
+            fileThumbnails=fileThumbnails,
             fitWindow=fitWindow,
             fitWidth=fitWidth,
             brightnessContrast=brightnessContrast,
@@ -699,6 +739,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.label_dock.toggleViewAction(),
                 self.shape_dock.toggleViewAction(),
                 self.file_dock.toggleViewAction(),
+                fileThumbnails,
                 None,
                 fill_drawing,
                 None,
@@ -764,6 +805,20 @@ class MainWindow(QtWidgets.QMainWindow):
         self.output_file = output_file
         self.output_dir = output_dir
 
+        self.labelFileWriter = LabelFileWriter(self)
+        self.labelFileWriter.failed.connect(self.saveLabelsFailed)
+
+        # key=abspath of label file, value=FileSummary for the file search
+        self._fileSummaries = {}
+        self._fileSummaryLoader = None
+        # created on first use, see thumbnailLoader
+        self._thumbnailLoader = None
+        self._imageLoader = None
+        # filename of the image shown at a reduced resolution, whose full
+        # resolution image is being loaded
+        self._imagePreview = None
+        self._thumbnailItems = {}  # image filename -> file list item
+
         # Application state.
         self.image = QtGui.QImage()
         self.imagePath = None
@@ -784,6 +839,9 @@ class MainWindow(QtWidgets.QMainWindow):
         else:
             self.filename = filename
 
+        if config["file_thumbnails"]:
+            self.setFileThumbnails(True)
+
         if config["file_search"]:
             self.fileSearch.setText(config["file_search"])
             self.fileSearchChanged()
@@ -817,6 +875,23 @@ class MainWindow(QtWidgets.QMainWindow):
         # if self.firstStart:
         #    QWhatsThis.enterWhatsThisMode()
 
+    @property
+    def labelDialog(self):
+        if self._labelDialog is None:
+            labels = list(self._config["labels"] or [])
+            labels.extend(self._labelHistory)
+            self._labelDialog = LabelDialog(
+                parent=self,
+                labels=labels,
+                sort_labels=self._config["sort_labels"],
+                show_text_field=self._config["show_label_text_field"],
+                completion=self._config["label_completion"],
+                fit_to_content=self._config["fit_to_content"],
+                flags=self._config["label_flags"],
+            )
+            self._labelHistory = None
+        return self._labelDialog
+
     def menu(self, title, actions=None):
         menu = self.menuBar().addMenu(title)
         if actions:
@@ -913,6 +988,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.imageData = None
         self.labelFile = None
         self.otherData = None
+        self._imagePreview = None
         self.canvas.resetState()
 
     def currentItem(self):
@@ -1035,11 +1111,8 @@ class MainWindow(QtWidgets.QMainWindow):
         if self._config["validate_label"] is None:
             return True
 
-        for i in range(self.uniqLabelList.count()):
-            label_i = self.uniqLabelList.item(i).data(Qt.UserRole)
-            if self._config["validate_label"] in ["exact"]:
-                if label_i == label:
-                    return True
+        if self._config["validate_label"] in ["exact"]:
+            return self.uniqLabelList.findItemByLabel(label) is not None
         return False
 
     def editLabel(self, item=None):
@@ -1078,13 +1151,10 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self._update_shape_color(shape)
         if shape.group_id is None:
-            item.setText(
-                '{} <font color="#{:02x}{:02x}{:02x}">●</font>'.format(
-                    html.escape(shape.label), *shape.fill_color.getRgb()[:3]
-                )
-            )
+            item.setText(shape.label)
         else:
             item.setText("{} ({})".format(shape.label, shape.group_id))
+        item.setColor(shape.fill_color.getRgb()[:3])
         self.setDirty()
         if self.uniqLabelList.findItemByLabel(shape.label) is None:
             item = self.uniqLabelList.createItemFromLabel(shape.label)
@@ -1093,11 +1163,89 @@ class MainWindow(QtWidgets.QMainWindow):
             self.uniqLabelList.setItemLabel(item, shape.label, rgb)
 
     def fileSearchChanged(self):
-        self.importDirImages(
-            self.lastOpenDir,
-            pattern=self.fileSearch.text(),
-            load=False,
-        )
+        query = FileQuery(self.fileSearch.text())
+        summaries = self._fileSummaries if query.needs_summary else {}
+        self.fileListWidget.setUpdatesEnabled(False)
+        for i in range(self.fileListWidget.count()):
+            item = self.fileListWidget.item(i)
+            summary = summaries.get(item.data(Qt.UserRole))
+            hidden = not query.match(item.text(), summary)
+            if hidden != item.isHidden():
+                item.setHidden(hidden)
+        self.fileListWidget.setUpdatesEnabled(True)
+
+    def loadFileSummaries(self):
+        """Load the summaries of label files for the file search."""
+        if self._fileSummaryLoader is not None:
+            self._fileSummaryLoader.stop()
+        self._fileSummaries = {}
+        label_dir = self.output_dir or self.lastOpenDir
+        if not label_dir:
+            self._fileSummaryLoader = None
+            return
+        self._fileSummaryLoader = FileSummaryLoader(label_dir, self)
+        self._fileSummaryLoader.loaded.connect(self.fileSummariesLoaded)
+        self._fileSummaryLoader.start()
+
+    @property
+    def thumbnailLoader(self):
+        if self._thumbnailLoader is None:
+            self._thumbnailLoader = ThumbnailLoader(parent=self)
+            self._thumbnailLoader.loaded.connect(self.thumbnailLoaded)
+        return self._thumbnailLoader
+
+    def setFileThumbnails(self, enabled):
+        """Show the file list as a grid of thumbnails or as a list."""
+        size = ThumbnailCache().size // 2
+        widget = self.fileListWidget
+        if enabled:
+            widget.setViewMode(QtWidgets.QListView.IconMode)
+            widget.setIconSize(QtCore.QSize(size, size))
+            widget.setGridSize(QtCore.QSize(size + 16, size + 24))
+            widget.setResizeMode(QtWidgets.QListView.Adjust)
+            widget.setMovement(QtWidgets.QListView.Static)
+            widget.setUniformItemSizes(True)
+            widget.setWordWrap(False)
+            widget.setTextElideMode(Qt.ElideLeft)
+        else:
+            widget.setViewMode(QtWidgets.QListView.ListMode)
+            widget.setIconSize(QtCore.QSize())
+            widget.setGridSize(QtCore.QSize())
+            widget.setUniformItemSizes(False)
+        self.requestFileThumbnails()
+
+    def requestFileThumbnails(self):
+        """Load the thumbnails of the file list in the background."""
+        if self._thumbnailLoader is not None:
+            self._thumbnailLoader.clear()
+        self._thumbnailItems = {}
+        if not self.actions.fileThumbnails.isChecked():
+            for i in range(self.fileListWidget.count()):
+                self.fileListWidget.item(i).setIcon(QtGui.QIcon())
+            return
+        for i in range(self.fileListWidget.count()):
+            item = self.fileListWidget.item(i)
+            self._thumbnailItems[item.text()] = item
+        # requested in reverse as the last request is served first
+        self.thumbnailLoader.request(reversed(list(self._thumbnailItems)))
+
+    def thumbnailLoaded(self, filename, thumbnail_file):
+        item = self._thumbnailItems.pop(filename, None)
+        if item is not None and thumbnail_file:
+            # QIcon reads the file only when the item is painted
+            item.setIcon(QtGui.QIcon(thumbnail_file))
+
+    def fileSummariesLoaded(self, label_dir, summaries):
+        if (
+            self._fileSummaryLoader is None
+            or self._fileSummaryLoader.label_dir != label_dir
+        ):
+            return
+        # keep the summaries of files saved since the loader started
+        summaries.update(self._fileSummaries)
+        self._fileSummaries = summaries
+        if FileQuery(self.fileSearch.text()).needs_summary:
+            self.fileSearchChanged()
 
     def fileSelectionChanged(self):
         items = self.fileListWidget.selectedItems()
@@ -1121,11 +1269,13 @@ class MainWindow(QtWidgets.QMainWindow):
             shape.selected = False
         self.labelList.clearSelection()
         self.canvas.selectedShapes = selected_shapes
+        items = []
         for shape in self.canvas.selectedShapes:
             shape.selected = True
-            item = self.labelList.findItemByShape(shape)
-            self.labelList.selectItem(item)
-            self.labelList.scrollToItem(item)
+            items.append(self.labelList.findItemByShape(shape))
+        self.labelList.selectItems(items)
+        if items:
+            self.labelList.scrollToItem(items[-1])
         self._noSelectionSlot = False
         n_selected = len(selected_shapes)
         self.actions.delete.setEnabled(n_selected)
@@ -1134,27 +1284,37 @@ class MainWindow(QtWidgets.QMainWindow):
         self.actions.edit.setEnabled(n_selected == 1)
 
     def addLabel(self, shape):
-        if shape.group_id is None:
-            text = shape.label
+        self.addLabels([shape])
+
+    def addLabels(self, shapes):
+        """Add shapes to the label list, updating other widgets once."""
+        labels = list(dict.fromkeys(shape.label for shape in shapes))
+        for label in labels:
+            if self.uniqLabelList.findItemByLabel(label) is None:
+                item = self.uniqLabelList.createItemFromLabel(label)
+                self.uniqLabelList.addItem(item)
+                rgb = self._get_rgb_by_label(label)
+                self.uniqLabelList.setItemLabel(item, label, rgb)
+        if self._labelDialog is None:
+            self._labelHistory.update(dict.fromkeys(labels))
         else:
-            text = "{} ({})".format(shape.label, shape.group_id)
-        label_list_item = LabelListWidgetItem(text, shape)
-        self.labelList.addItem(label_list_item)
-        if self.uniqLabelList.findItemByLabel(shape.label) is None:
-            item = self.uniqLabelList.createItemFromLabel(shape.label)
-            self.uniqLabelList.addItem(item)
-            rgb = self._get_rgb_by_label(shape.label)
-            self.uniqLabelList.setItemLabel(item, shape.label, rgb)
-        self.labelDialog.addLabelHistory(shape.label)
-        for action in self.actions.onShapesPresent:
-            action.setEnabled(True)
+            self._labelDialog.addLabelHistories(labels)
 
-        self._update_shape_color(shape)
-        label_list_item.setText(
-            '{} <font color="#{:02x}{:02x}{:02x}">●</font>'.format(
-                html.escape(text), *shape.fill_color.getRgb()[:3]
-            )
-        )
+        items = []
+        for shape in shapes:
+            if shape.group_id is None:
+                text = shape.label
+            else:
+                text = "{} ({})".format(shape.label, shape.group_id)
+            self._update_shape_color(shape)
+            item = LabelListWidgetItem(text, shape)
+            item.setColor(shape.fill_color.getRgb()[:3])
+            items.append(item)
+        self.labelList.addItems(items)
+
+        if shapes:
+            for action in self.actions.onShapesPresent:
+                action.setEnabled(True)
 
     def _update_shape_color(self, shape):
         r, g, b = self._get_rgb_by_label(shape.label)
@@ -1166,6 +1326,12 @@ class MainWindow(QtWidgets.QMainWindow):
         shape.select_fill_color = QtGui.QColor(r, g, b, 155)
 
     def _get_rgb_by_label(self, label):
+        rgb = self._rgbByLabel.get(label)
+        if rgb is None:
+            rgb = self._rgbByLabel[label] = self._compute_rgb_by_label(label)
+        return rgb
+
+    def _compute_rgb_by_label(self, label):
         if self._config["shape_color"] == "auto":
             item = self.uniqLabelList.findItemByLabel(label)
             if item is None:
@@ -1175,7 +1341,8 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.uniqLabelList.setItemLabel(item, label, rgb)
             label_id = self.uniqLabelList.indexFromItem(item).row() + 1
             label_id += self._config["shift_auto_shape_color"]
-            return LABEL_COLORMAP[label_id % len(LABEL_COLORMAP)]
+            colormap = _label_colormap()
+            return colormap[label_id % len(colormap)]
         elif (
             self._config["shape_color"] == "manual"
             and self._config["label_colors"]
@@ -1193,8 +1360,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def loadShapes(self, shapes, replace=True):
         self._noSelectionSlot = True
-        for shape in shapes:
-            self.addLabel(shape)
+        self.addLabels(shapes)
         self.labelList.clearSelection()
         self._noSelectionSlot = False
         self.canvas.loadShapes(shapes, replace=replace)
@@ -1202,37 +1368,20 @@ class MainWindow(QtWidgets.QMainWindow):
     def loadLabels(self, shapes):
         s = []
         for shape in shapes:
-            label = shape["label"]
-            points = shape["points"]
-            shape_type = shape["shape_type"]
-            flags = shape["flags"]
-            description = shape.get("description", "")
-            group_id = shape["group_id"]
-            other_data = shape["other_data"]
-
-            if not points:
+            if not shape["points"]:
                 # skip point-empty shape
                 continue
 
-            shape = Shape(
-                label=label,
-                shape_type=shape_type,
-                group_id=group_id,
-                description=description,
-            )
-            for x, y in points:
-                shape.addPoint(QtCore.QPointF(x, y))
-            shape.close()
+            shape = Shape.fromData(annotation.ShapeData.from_dict(shape))
 
             default_flags = {}
             if self._config["label_flags"]:
                 for pattern, keys in self._config["label_flags"].items():
-                    if re.match(pattern, label):
+                    if re.match(pattern, shape.label):
                         for key in keys:
                             default_flags[key] = False
+            default_flags.update(shape.flags)
             shape.flags = default_flags
-            shape.flags.update(flags)
-            shape.other_data = other_data
 
             s.append(shape)
         self.loadShapes(s)
@@ -1246,20 +1395,18 @@ class MainWindow(QtWidgets.QMainWindow):
             self.flag_widget.addItem(item)
 
     def saveLabels(self, filename):
-        lf = LabelFile()
+        if not self.loadFullImage():
+            return False
+        # saving modifies the LabelFile in the writer thread, so the writer
+        # gets a copy, which shares the cache of encoded imageData
+        if self.labelFile is None:
+            self.labelFile = LabelFile()
+        lf = self.labelFile.copy()
 
         def format_shape(s):
-            data = s.other_data.copy()
-            data.update(
-                dict(
-                    label=s.label.encode("utf-8") if PY2 else s.label,
-                    points=[(p.x(), p.y()) for p in s.points],
-                    group_id=s.group_id,
-                    description=s.description,
-                    shape_type=s.shape_type,
-                    flags=s.flags,
-                )
-            )
+            data = s.toData().to_dict()
+            if PY2:
+                data["label"] = data["label"].encode("utf-8")
             return data
 
         shapes = [format_shape(item.shape()) for item in self.labelList]
@@ -1269,43 +1416,68 @@ class MainWindow(QtWidgets.QMainWindow):
             key = item.text()
             flag = item.checkState() == Qt.Checked
             flags[key] = flag
-        try:
-            imagePath = osp.relpath(self.imagePath, osp.dirname(filename))
-            imageData = self.imageData if self._config["store_data"] else None
-            if osp.dirname(filename) and not osp.exists(osp.dirname(filename)):
-                os.makedirs(osp.dirname(filename))
-            lf.save(
-                filename=filename,
-                shapes=shapes,
-                imagePath=imagePath,
-                imageData=imageData,
-                imageHeight=self.image.height(),
-                imageWidth=self.image.width(),
-                otherData=self.otherData,
-                flags=flags,
-            )
-            self.labelFile = lf
-            items = self.fileListWidget.findItems(
-                self.imagePath, Qt.MatchExactly
-            )
-            if len(items) > 0:
-                if len(items) != 1:
-                    raise RuntimeError("There are duplicate files.")
-                items[0].setCheckState(Qt.Checked)
-            # disable allows next and previous image to proceed
-            # self.filename = filename
-            return True
-        except LabelFileError as e:
-            self.errorMessage(
-                self.tr("Error saving label data"), self.tr("<b>%s</b>") % e
-            )
-            return False
+        imagePath = osp.relpath(self.imagePath, osp.dirname(filename))
+        imageData = self.imageData if self._config["store_data"] else None
+        if osp.dirname(filename) and not osp.exists(osp.dirname(filename)):
+            os.makedirs(osp.dirname(filename))
+        # written in background, and failures are reported to
+        # saveLabelsFailed
+        self.labelFile.filename = filename
+        self.labelFileWriter.save(
+            lf,
+            filename=filename,
+            shapes=shapes,
+            imagePath=imagePath,
+            imageData=imageData,
+            imageHeight=self.image.height(),
+            imageWidth=self.image.width(),
+            otherData=dict(self.otherData or {}),
+            flags=flags,
+            imageStore=self._config["image_store"],
+        )
+        self._fileSummaries[osp.abspath(filename)] = FileSummary.from_shapes(
+            shapes, flags
+        )
+        items = self.fileListWidget.findItems(self.imagePath, Qt.MatchExactly)
+        if len(items) > 0:
+            if len(items) != 1:
+                raise RuntimeError("There are duplicate files.")
+            items[0].setCheckState(Qt.Checked)
+        # disable allows next and previous image to proceed
+        # self.filename = filename
+        return True
+
+    def saveLabelsFailed(self, filename, message):
+        if not self.labelFileWriter.isFailed(filename):
+            return  # retried or superseded by a newer save
+        mb = QtWidgets.QMessageBox
+        title = self.tr("Error saving label data")
+        answer = mb.critical(
+            self,
+            title,
+            "<p><b>%s</b></p>%s"
+            % (
+                title,
+                self.tr("<p><b>%s</b></p><p>Retry saving <i>%s</i>?</p>")
+                % (message, filename),
+            ),
+            mb.Retry | mb.Discard,
+            mb.Retry,
+        )
+        if answer == mb.Retry:
+            self.labelFileWriter.retry(filename)
+            return
+        self.labelFileWriter.discard(filename)
+        if self.labelFile is not None and self.labelFile.filename == filename:
+            # keep the annotations to save again, without triggering auto save
+            self.dirty = True
+            self.actions.save.setEnabled(True)
+            self.setWindowTitle("{} - {}*".format(__appname__, self.filename))
 
     def duplicateSelectedShape(self):
         added_shapes = self.canvas.duplicateSelectedShapes()
         self.labelList.clearSelection()
-        for shape in added_shapes:
-            self.addLabel(shape)
+        self.addLabels(added_shapes)
         self.setDirty()
 
     def pasteSelectedShape(self):
@@ -1448,6 +1620,8 @@ class MainWindow(QtWidgets.QMainWindow):
         )
 
     def brightnessContrast(self, value):
+        if not self.loadFullImage():
+            return
         dialog = BrightnessContrastDialog(
             utils.img_data_to_pil(self.imageData),
             self.onNewBrightnessContrast,
@@ -1495,39 +1669,68 @@ class MainWindow(QtWidgets.QMainWindow):
         self.status(
             str(self.tr("Loading %s...")) % osp.basename(str(filename))
         )
-        label_file = osp.splitext(filename)[0] + ".json"
+        if filename.lower().endswith(LabelFile.compact_suffix):
+            label_file = filename
+        else:
+            label_file = osp.splitext(filename)[0] + ".json"
         if self.output_dir:
             label_file_without_path = osp.basename(label_file)
             label_file = osp.join(self.output_dir, label_file_without_path)
+        self.labelFileWriter.flush(label_file)
         if QtCore.QFile.exists(label_file) and LabelFile.is_label_file(
             label_file
         ):
             try:
-                self.labelFile = LabelFile(label_file)
+                # the image is read below, possibly in background
+                self.labelFile = LabelFile(label_file, with_image=False)
             except LabelFileError as e:
-                self.errorMessage(
-                    self.tr("Error opening file"),
-                    self.tr(
-                        "<p><b>%s</b></p>"
-                        "<p>Make sure <i>%s</i> is a valid label file."
-                    )
-                    % (e, label_file),
-                )
-                self.status(self.tr("Error reading %s") % label_file)
+                self.labelFileError(e, label_file)
                 return False
-            self.imageData = self.labelFile.imageData
             self.imagePath = osp.join(
                 osp.dirname(label_file),
                 self.labelFile.imagePath,
             )
             self.otherData = self.labelFile.otherData
+            loadImageData = functools.partial(
+                getattr, self.labelFile, "imageData"
+            )
+            imageDataEmbedded = self.labelFile.imageDataEmbedded
         else:
-            self.imageData = LabelFile.load_image_file(filename)
-            if self.imageData:
-                self.imagePath = filename
+            self.imagePath = filename
             self.labelFile = None
-        image = QtGui.QImage.fromData(self.imageData)
-
+            loadImageData = functools.partial(
+                LabelFile.load_image_file, filename
+            )
+            imageDataEmbedded = False
+        preview = None
+        if (
+            self._config["image_preview"]
+            and not imageDataEmbedded
+            # otherwise the image is not fitted to the window
+            and filename not in self.zoom_values
+            and not (self.zoom_values and self._config["keep_prev_scale"])
+        ):
+            preview = read_image_preview(
+                self.imagePath,
+                self.centralWidget().size() * self.devicePixelRatioF(),
+            )
+        if preview is None:
+            try:
+                self.imageData = loadImageData()
+            except LabelFileError as e:
+                self.labelFileError(e, label_file)
+                return False
+            image = QtGui.QImage.fromData(self.imageData)
+        else:
+            image, imageSize = preview
+            self.imageData = None
+            self._imagePreview = filename
+            # not embedded, so read from the image file without touching
+            # self.labelFile, which is not thread-safe
+            self.imageLoader.request(
+                filename,
+                functools.partial(LabelFile.load_image_file, self.imagePath),
+            )
         if image.isNull():
             formats = [
                 "*.{}".format(fmt.data().decode())
@@ -1546,7 +1749,10 @@ class MainWindow(QtWidgets.QMainWindow):
         self.filename = filename
         if self._config["keep_prev"]:
             prev_shapes = self.canvas.shapes
-        self.canvas.loadPixmap(QtGui.QPixmap.fromImage(image))
+        self.canvas.loadPixmap(
+            QtGui.QPixmap.fromImage(image),
+            size=None if preview is None else imageSize,
+        )
         flags = {k: False for k in self._config["flags"] or []}
         if self.labelFile:
             self.loadLabels(self.labelFile.shapes)
@@ -1573,11 +1779,6 @@ class MainWindow(QtWidgets.QMainWindow):
                     orientation, self.scroll_values[orientation][self.filename]
                 )
         # set brightness contrast values
-        dialog = BrightnessContrastDialog(
-            utils.img_data_to_pil(self.imageData),
-            self.onNewBrightnessContrast,
-            parent=self,
-        )
         brightness, contrast = self.brightnessContrast_values.get(
             self.filename, (None, None)
         )
@@ -1589,12 +1790,19 @@ class MainWindow(QtWidgets.QMainWindow):
             _, contrast = self.brightnessContrast_values.get(
                 self.recentFiles[0], (None, None)
             )
-        if brightness is not None:
-            dialog.slider_brightness.setValue(brightness)
-        if contrast is not None:
-            dialog.slider_contrast.setValue(contrast)
         self.brightnessContrast_values[self.filename] = (brightness, contrast)
-        if brightness is not None or contrast is not None:
+        if (
+            brightness is not None or contrast is not None
+        ) and self.loadFullImage():
+            dialog = BrightnessContrastDialog(
+                utils.img_data_to_pil(self.imageData),
+                self.onNewBrightnessContrast,
+                parent=self,
+            )
+            if brightness is not None:
+                dialog.slider_brightness.setValue(brightness)
+            if contrast is not None:
+                dialog.slider_contrast.setValue(contrast)
             dialog.onNewValue(None)
         self.paintCanvas()
         self.addRecentFile(self.filename)
@@ -1603,6 +1811,67 @@ class MainWindow(QtWidgets.QMainWindow):
         self.status(str(self.tr("Loaded %s")) % osp.basename(str(filename)))
         return True
 
+    @property
+    def imageLoader(self):
+        if self._imageLoader is None:
+            self._imageLoader = ImageLoader(parent=self)
+            self._imageLoader.loaded.connect(self.fullImageLoaded)
+        return self._imageLoader
+
+    def loadFullImage(self):
+        """Replace a reduced-resolution image by the full one, waiting for it.
+
+        False is returned if the full image could not be loaded.
+        """
+        if self._imagePreview is None:
+            return True
+        result = self.imageLoader.wait(self._imagePreview)
+        if result is None:
+            # the request was replaced or the loader was stopped
+            imageData = LabelFile.load_image_file(self.imagePath)
+            image = QtGui.QImage()
+            if imageData is not None:
+                image = QtGui.QImage.fromData(imageData)
+            result = imageData, image
+        self.fullImageLoaded(self._imagePreview, *result)
+        return self.imageData is not None
+
+    def fullImageLoaded(self, filename, imageData, image):
+        if filename != self._imagePreview:
+            return
+        self._imagePreview = None
+        if imageData is None or image.isNull():
+            self.errorMessage(
+                self.tr("Error opening file"),
+                self.tr(
+                    "<p>Make sure <i>{0}</i> is a valid image file.</p>"
+                ).format(filename),
+            )
+            self.status(self.tr("Error reading %s") % filename)
+            self.resetState()
+            self.toggleActions(False)
+            self.canvas.setEnabled(False)
+            return
+        self.imageData = imageData
+        if self.labelFile is not None:
+            self.labelFile.imageData = imageData
+        self.image = image
+        self.canvas.loadPixmap(
+            QtGui.QPixmap.fromImage(image), clear_shapes=False
+        )
+        self.paintCanvas()
+
+    def labelFileError(self, e, label_file):
+        self.errorMessage(
+            self.tr("Error opening file"),
+            self.tr(
+                "<p><b>%s</b></p>"
+                "<p>Make sure <i>%s</i> is a valid label file."
+            )
+            % (e, label_file),
+        )
+        self.status(self.tr("Error reading %s") % label_file)
+
     def resizeEvent(self, event):
         if (
             self.canvas
@@ -1615,6 +1884,13 @@ class MainWindow(QtWidgets.QMainWindow):
     def paintCanvas(self):
         assert not self.image.isNull(), "cannot paint null image"
         self.canvas.scale = 0.01 * self.zoomWidget.value()
+        if (
+            self._imagePreview is not None
+            and self.canvas.scale * self.devicePixelRatioF()
+            > self.image.width() / self.canvas.imageSize.width()
+        ):
+            # zoomed in beyond the resolution of the preview
+            self.loadFullImage()
         self.canvas.adjustSize()
         self.canvas.update()
 
@@ -1631,15 +1907,15 @@ class MainWindow(QtWidgets.QMainWindow):
         h1 = self.centralWidget().height() - e
         a1 = w1 / h1
         # Calculate a new scale value based on the pixmap's aspect ratio.
-        w2 = self.canvas.pixmap.width() - 0.0
-        h2 = self.canvas.pixmap.height() - 0.0
+        w2 = self.canvas.imageSize.width() - 0.0
+        h2 = self.canvas.imageSize.height() - 0.0
         a2 = w2 / h2
         return w1 / w2 if a2 >= a1 else h1 / h2
 
     def scaleFitWidth(self):
         # The epsilon does not seem to work too well here.
         w = self.centralWidget().width() - 2.0
-        return w / self.canvas.pixmap.width()
+        return w / self.canvas.imageSize.width()
 
     def enableSaveImageWithData(self, enabled):
         self._config["store_data"] = enabled
@@ -1655,6 +1931,19 @@ class MainWindow(QtWidgets.QMainWindow):
         self.settings.setValue("window/position", self.pos())
         self.settings.setValue("window/state", self.saveState())
         self.settings.setValue("recentFiles", self.recentFiles)
+        self.labelFileWriter.stop()
+        # the failed signals are not delivered anymore after closing
+        failures = self.labelFileWriter.failures()
+        while failures:
+            self.saveLabelsFailed(*failures[0])
+            self.labelFileWriter.stop()
+            failures = self.labelFileWriter.failures()
+        if self._fileSummaryLoader is not None:
+            self._fileSummaryLoader.stop()
+        if self._thumbnailLoader is not None:
+            self._thumbnailLoader.stop()
+        if self._imageLoader is not None:
+            self._imageLoader.stop()
         # ask the use for where to save the labels
         # self.settings.setValue('window/geometry', self.saveGeometry())
 
@@ -1696,7 +1985,7 @@ class MainWindow(QtWidgets.QMainWindow):
         if len(self.imageList) <= 0:
             return
 
-        if self.filename is None:
+        if self.filename is None or self.filename not in self.imageList:
             return
 
         currIndex = self.imageList.index(self.filename)
@@ -1721,7 +2010,7 @@ class MainWindow(QtWidgets.QMainWindow):
             return
 
         filename = None
-        if self.filename is None:
+        if self.filename is None or self.filename not in self.imageList:
             filename = self.imageList[0]
         else:
             currIndex = self.imageList.index(self.filename)
@@ -1745,9 +2034,12 @@ class MainWindow(QtWidgets.QMainWindow):
             for fmt in QtGui.QImageReader.supportedImageFormats()
         ]
         filters = self.tr("Image & Label files (%s)") % " ".join(
-            formats + ["*%s" % LabelFile.suffix]
+            formats
+            + ["*%s" % LabelFile.suffix, "*%s" % LabelFile.compact_suffix]
+        )
+        fileDialog = FileDialogPreview(
+            self, thumbnailLoader=self.thumbnailLoader
         )
-        fileDialog = FileDialogPreview(self)
         fileDialog.setFileMode(FileDialogPreview.ExistingFile)
         fileDialog.setNameFilter(filters)
         fileDialog.setWindowTitle(
@@ -1861,7 +2153,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.actions.saveAs.setEnabled(False)
 
     def getLabelFile(self):
-        if self.filename.lower().endswith(".json"):
+        if self.filename.lower().endswith((".json", LabelFile.compact_suffix)):
             label_file = self.filename
         else:
             label_file = osp.splitext(self.filename)[0] + ".json"
@@ -1879,6 +2171,7 @@ class MainWindow(QtWidgets.QMainWindow):
             return
 
         label_file = self.getLabelFile()
+        self.labelFileWriter.flush(label_file)
         if osp.exists(label_file):
             os.remove(label_file)
             logger.info("Label file is removed: {}".format(label_file))
@@ -1966,8 +2259,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def copyShape(self):
         self.canvas.endMove(copy=True)
-        for shape in self.canvas.selectedShapes:
-            self.addLabel(shape)
+        self.addLabels(self.canvas.selectedShapes)
         self.labelList.clearSelection()
         self.setDirty()
 
@@ -2000,10 +2292,12 @@ class MainWindow(QtWidgets.QMainWindow):
 
     @property
     def imageList(self):
+        """Filenames of the file list that match the file search."""
         lst = []
         for i in range(self.fileListWidget.count()):
             item = self.fileListWidget.item(i)
-            lst.append(item.text())
+            if not item.isHidden():
+                lst.append(item.text())
         return lst
 
     def importDroppedImageFiles(self, imageFiles):
@@ -2014,15 +2308,16 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.filename = None
         for file in imageFiles:
-            if file in self.imageList or not file.lower().endswith(
-                tuple(extensions)
-            ):
+            if self.fileListWidget.findItems(
+                file, Qt.MatchExactly
+            ) or not file.lower().endswith(tuple(extensions)):
                 continue
             label_file = osp.splitext(file)[0] + ".json"
             if self.output_dir:
                 label_file_without_path = osp.basename(label_file)
                 label_file = osp.join(self.output_dir, label_file_without_path)
             item = QtWidgets.QListWidgetItem(file)
+            item.setData(Qt.UserRole, osp.abspath(label_file))
             item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
             if QtCore.QFile.exists(label_file) and LabelFile.is_label_file(
                 label_file
@@ -2031,6 +2326,8 @@ class MainWindow(QtWidgets.QMainWindow):
             else:
                 item.setCheckState(Qt.Unchecked)
             self.fileListWidget.addItem(item)
+        self.fileSearchChanged()
+        self.requestFileThumbnails()
 
         if len(self.imageList) > 1:
             self.actions.openNextImg.setEnabled(True)
@@ -2056,6 +2353,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 label_file_without_path = osp.basename(label_file)
                 label_file = osp.join(self.output_dir, label_file_without_path)
             item = QtWidgets.QListWidgetItem(filename)
+            item.setData(Qt.UserRole, osp.abspath(label_file))
             item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
             if QtCore.QFile.exists(label_file) and LabelFile.is_label_file(
                 label_file
@@ -2064,6 +2362,9 @@ class MainWindow(QtWidgets.QMainWindow):
             else:
                 item.setCheckState(Qt.Unchecked)
             self.fileListWidget.addItem(item)
+        self.loadFileSummaries()
+        self.fileSearchChanged()
+        self.requestFileThumbnails()
         self.openNextImg(load=load)
 
     def scanAllImages(self, folderPath):
@@ -2078,5 +2379,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 if file.lower().endswith(tuple(extensions)):
                     relativePath = osp.join(root, file)
                     images.append(relativePath)
+        import natsort  # deferred as it is slow to import
+
         images = natsort.os_sorted(images)
         return images
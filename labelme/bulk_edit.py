@@ -0,0 +1,116 @@
+import collections
+import functools
+import multiprocessing
+
+from labelme import _json
+from labelme import compact_label_file
+from labelme.label_file import atomic_open
+
+
+def _read(filename):
+    # imageData is kept as a deferred string, which is neither decoded nor
+    # parsed as JSON until writing
+    if compact_label_file.is_compact_file(filename):
+        return compact_label_file.load(filename, with_image_data=False)
+    return _json.load(filename, defer_key="imageData")
+
+
+def _write(filename, data):
+    is_compact = compact_label_file.is_compact_file(filename)
+    # the compact format reads deferred imageData as raw bytes
+    if not is_compact and isinstance(
+        data.get("imageData"),
+        (_json.DeferredString, compact_label_file.DeferredImageData),
+    ):
+        data["imageData"] = data["imageData"].read()
+    with atomic_open(filename) as f:
+        if is_compact:
+            compact_label_file.save(f, data)
+        else:
+            f.write(_json.dumps(data))
+
+
+def edit_labelfile(
+    filename,
+    rename=None,
+    delete=None,
+    set_flags=None,
+    remove_flags=None,
+    dry_run=False,
+):
+    """Edit the labels and image flags of a label file in place.
+
+    Shapes with a label in delete are removed, and then labels are renamed
+    with the rename mapping (old -> new), so renaming several labels to the
+    same one merges them. set_flags (name -> value) and remove_flags edit
+    the image-level flags. The file is only written if it changed, and not
+    at all if dry_run is True.
+
+    Returns the numbers of changes as a dict of Counters: renamed (by old
+    label), deleted (by label) and flags (by flag name).
+    """
+    rename = rename or {}
+    delete = set(delete or [])
+    set_flags = set_flags or {}
+    remove_flags = remove_flags or []
+
+    data = _read(filename)
+    changes = dict(
+        renamed=collections.Counter(),
+        deleted=collections.Counter(),
+        flags=collections.Counter(),
+    )
+
+    shapes = []
+    for shape in data["shapes"]:
+        label = shape["label"]
+        if label in delete:
+            changes["deleted"][label] += 1
+            continue
+        if label in rename and rename[label] != label:
+            shape["label"] = rename[label]
+            changes["renamed"][label] += 1
+        shapes.append(shape)
+    data["shapes"] = shapes
+
+    flags = data.get("flags") or {}
+    for name, value in set_flags.items():
+        if flags.get(name) != value:
+            flags[name] = value
+            changes["flags"][name] += 1
+    for name in remove_flags:
+        if name in flags:
+            del flags[name]
+            changes["flags"][name] += 1
+    if "flags" in data or flags:
+        data["flags"] = flags
+
+    if not dry_run and any(changes.values()):
+        _write(filename, data)
+    return changes
+
+
+def _edit_labelfile(filename, **kwargs):
+    try:
+        return filename, edit_labelfile(filename, **kwargs), None
+    except Exception as e:
+        return filename, None, str(e)
+
+
+def edit_labelfiles(filenames, workers=None, chunksize=64, **kwargs):
+    """Run edit_labelfile on label files in worker processes.
+
+    Yields (filename, changes, error) in the order of completion, where
+    error is the message of the exception raised for the file, if any.
+    workers=0 runs in the current process.
+    """
+    func = functools.partial(_edit_labelfile, **kwargs)
+    if workers == 0 or len(filenames) < 2 * chunksize:
+        for filename in filenames:
+            yield func(filename)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        for result in pool.imap_unordered(
+            func, filenames, chunksize=chunksize
+        ):
+            yield result
@@ -1,6 +1,12 @@
 # flake8: noqa
 
+from . import convert_format
 from . import draw_json
 from . import draw_label_png
+from . import edit_labels
+from . import export_coco
+from . import index
 from . import json_to_dataset
 from . import on_docker
+from . import stats
+from . import validate
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+import argparse
+import io
+import os
+import os.path as osp
+
+from labelme import _json
+from labelme import compact_label_file
+from labelme.label_file import LabelFile
+from labelme.logger import logger
+
+
+def get_output_file(filename, output_dir=None):
+    if compact_label_file.is_compact_file(filename):
+        out_file = (
+            filename[: -len(LabelFile.compact_suffix)] + LabelFile.suffix
+        )
+    else:
+        out_file = osp.splitext(filename)[0] + LabelFile.compact_suffix
+    if output_dir:
+        out_file = osp.join(output_dir, osp.basename(out_file))
+    return out_file
+
+
+def convert(filename, out_file):
+    """Convert a label file between the JSON and the compact format."""
+    if compact_label_file.is_compact_file(filename):
+        data = compact_label_file.load(filename)
+        with io.open(out_file, "wb") as f:
+            f.write(_json.dumps(data))
+    else:
+        # imageData is decoded from base64 once, when saving
+        data = _json.load(filename, defer_key="imageData")
+        compact_label_file.save(out_file, data)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert label files from JSON to the compact format "
+        "(*{}) and back, depending on the input.".format(
+            LabelFile.compact_suffix
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("label_files", nargs="+", help="input label files")
+    parser.add_argument(
+        "--output-dir", help="output directory (default: next to the input)"
+    )
+    parser.add_argument(
+        "--remove-input",
+        action="store_true",
+        help="remove the input after conversion",
+    )
+    args = parser.parse_args()
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    for filename in args.label_files:
+        if not LabelFile.is_label_file(filename):
+            logger.warning("Skipping non label file: {}".format(filename))
+            continue
+        out_file = get_output_file(filename, output_dir=args.output_dir)
+        convert(filename, out_file)
+        if args.remove_input:
+            os.remove(filename)
+        logger.info("Converted: {} -> {}".format(filename, out_file))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+import argparse
+import collections
+import sys
+import time
+
+from labelme.bulk_edit import edit_labelfiles
+from labelme.cli.validate import get_label_files
+from labelme.logger import logger
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rename, merge and delete labels, and edit image flags "
+        "in label files. Labels are deleted before renaming.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="label files or directories of them"
+    )
+    parser.add_argument(
+        "--rename",
+        nargs=2,
+        action="append",
+        default=[],
+        metavar=("OLD", "NEW"),
+        help="rename label OLD to NEW",
+    )
+    parser.add_argument(
+        "--merge",
+        nargs="+",
+        action="append",
+        default=[],
+        metavar="LABEL",
+        help="rename all but the last label to the last one",
+    )
+    parser.add_argument(
+        "--delete",
+        action="append",
+        default=[],
+        metavar="LABEL",
+        help="delete shapes of the label",
+    )
+    parser.add_argument(
+        "--set-flag",
+        action="append",
+        default=[],
+        metavar="FLAG",
+        help="check the image flag",
+    )
+    parser.add_argument(
+        "--unset-flag",
+        action="append",
+        default=[],
+        metavar="FLAG",
+        help="uncheck the image flag",
+    )
+    parser.add_argument(
+        "--remove-flag",
+        action="append",
+        default=[],
+        metavar="FLAG",
+        help="remove the image flag",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only report the changes without writing files",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="number of processes (0: no process)"
+    )
+    args = parser.parse_args()
+
+    rename = dict(args.rename)
+    for labels in args.merge:
+        if len(labels) < 2:
+            parser.error("--merge needs at least 2 labels")
+        for label in labels[:-1]:
+            rename[label] = labels[-1]
+    set_flags = dict.fromkeys(args.set_flag, True)
+    set_flags.update(dict.fromkeys(args.unset_flag, False))
+
+    t_start = time.time()
+    filenames = get_label_files(args.paths)
+    num_changed = 0
+    num_failed = 0
+    total = collections.defaultdict(collections.Counter)
+    for filename, changes, error in edit_labelfiles(
+        filenames,
+        workers=args.workers,
+        rename=rename,
+        delete=args.delete,
+        set_flags=set_flags,
+        remove_flags=args.remove_flag,
+        dry_run=args.dry_run,
+    ):
+        if error is not None:
+            logger.error("Failed to edit {}: {}".format(filename, error))
+            num_failed += 1
+            continue
+        if any(changes.values()):
+            num_changed += 1
+        for key, counter in changes.items():
+            total[key].update(counter)
+    elapsed = time.time() - t_start
+
+    for label, count in sorted(total["renamed"].items()):
+        print("renamed\t{} -> {}\t{}".format(label, rename[label], count))
+    for label, count in sorted(total["deleted"].items()):
+        print("deleted\t{}\t{}".format(label, count))
+    for flag, count in sorted(total["flags"].items()):
+        print("flag\t{}\t{}".format(flag, count))
+    logger.info(
+        "{} {} of {} files in {:.1f}s ({} failed)".format(
+            "Would change" if args.dry_run else "Changed",
+            num_changed,
+            len(filenames),
+            elapsed,
+            num_failed,
+        )
+    )
+    if num_failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,559 @@
+#!/usr/bin/env python
+
+import argparse
+import collections
+import datetime
+import functools
+import glob
+import json
+import multiprocessing
+import os
+import os.path as osp
+import shutil
+import sys
+import time
+import uuid
+
+import imgviz
+import numpy as np
+import PIL.Image
+
+from labelme.export_manifest import ExportManifest
+from labelme.export_manifest import file_digest
+from labelme.label_file import LabelFile
+from labelme.logger import logger
+from labelme import utils
+
+
+# margin in pixels added around line and point shapes, which are rasterized
+# with a width by utils.shape_to_mask (line_width=10, point_size=5)
+SHAPE_MASK_MARGIN = 6
+# smaller circles have no polygon approximation and may rasterize to nothing
+MIN_CIRCLE_RADIUS = 0.5
+
+
+class CocoJsonWriter(object):
+    """Write a COCO annotation file incrementally.
+
+    Images are streamed into the output file as they are added, and
+    annotations are spooled to a temporary file next to it, so memory usage
+    does not grow with the size of the dataset.
+    """
+
+    def __init__(self, filename, info, licenses, categories):
+        self.filename = filename
+        self._tmp_filename = filename + ".tmp"
+        self._spool_filename = filename + ".annotations.tmp"
+        self._f = open(self._tmp_filename, "w")
+        self._spool = open(self._spool_filename, "w")
+        self._num_images = 0
+        self._num_annotations = 0
+
+        self._f.write("{")
+        self._f.write('"info": {}, '.format(json.dumps(info)))
+        self._f.write('"licenses": {}, '.format(json.dumps(licenses)))
+        self._f.write('"type": "instances", ')
+        self._f.write('"categories": {}, '.format(json.dumps(categories)))
+        self._f.write('"images": [')
+
+    @property
+    def num_images(self):
+        return self._num_images
+
+    @property
+    def num_annotations(self):
+        return self._num_annotations
+
+    def add_image(self, image):
+        if self._num_images > 0:
+            self._f.write(", ")
+        self._f.write(json.dumps(image))
+        self._num_images += 1
+
+    def add_annotation(self, annotation):
+        annotation = dict(annotation, id=self._num_annotations)
+        if self._num_annotations > 0:
+            self._spool.write(", ")
+        self._spool.write(json.dumps(annotation))
+        self._num_annotations += 1
+        return annotation["id"]
+
+    def close(self):
+        self._spool.close()
+        self._f.write('], "annotations": [')
+        with open(self._spool_filename) as f:
+            shutil.copyfileobj(f, self._f)
+        self._f.write("]}")
+        self._f.close()
+        os.remove(self._spool_filename)
+        os.replace(self._tmp_filename, self.filename)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._spool.close()
+            self._f.close()
+            for filename in [self._spool_filename, self._tmp_filename]:
+                if osp.exists(filename):
+                    os.remove(filename)
+
+
+def _clamp_circle_radius(points):
+    (cx, cy), (px, py) = points
+    r = np.hypot(px - cx, py - cy)
+    if r >= MIN_CIRCLE_RADIUS:
+        return points
+    if r == 0:
+        return [[cx, cy], [cx + MIN_CIRCLE_RADIUS, cy]]
+    scale = MIN_CIRCLE_RADIUS / r
+    return [[cx, cy], [cx + (px - cx) * scale, cy + (py - cy) * scale]]
+
+
+def shape_to_polygon(points, shape_type):
+    """Return the COCO polygon ``[x1, y1, x2, y2, ...]`` of a shape."""
+    if shape_type == "rectangle":
+        (x1, y1), (x2, y2) = points
+        x1, x2 = sorted([x1, x2])
+        y1, y2 = sorted([y1, y2])
+        return [x1, y1, x2, y1, x2, y2, x1, y2]
+    if shape_type == "circle":
+        (x1, y1), (x2, y2) = _clamp_circle_radius(points)
+        r = np.linalg.norm([x2 - x1, y2 - y1])
+        # r(1-cos(a/2))<x, a=2*pi/N => N>pi/arccos(1-x/r)
+        # x: tolerance of the gap between the arc and the line segment
+        n_points_circle = max(int(np.pi / np.arccos(1 - 1 / max(r, 1))), 12)
+        i = np.arange(n_points_circle)
+        x = x1 + r * np.sin(2 * np.pi / n_points_circle * i)
+        y = y1 + r * np.cos(2 * np.pi / n_points_circle * i)
+        return np.stack((x, y), axis=1).flatten().tolist()
+    return np.asarray(points).flatten().tolist()
+
+
+def polygon_area(polygon):
+    xy = np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+    x, y = xy[:, 0], xy[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, 1)) - np.dot(y, np.roll(x, 1)))
+
+
+def _shape_extent(points, shape_type):
+    points = np.asarray(points, dtype=np.float64)
+    if shape_type == "circle":
+        (cx, cy), (px, py) = points
+        d = np.hypot(cx - px, cy - py)
+        return cx - d, cy - d, cx + d, cy + d
+    x1, y1 = points.min(axis=0)
+    x2, y2 = points.max(axis=0)
+    if shape_type in ["line", "linestrip", "point"]:
+        x1, y1 = x1 - SHAPE_MASK_MARGIN, y1 - SHAPE_MASK_MARGIN
+        x2, y2 = x2 + SHAPE_MASK_MARGIN, y2 + SHAPE_MASK_MARGIN
+    return x1, y1, x2, y2
+
+
+def instance_to_cropped_mask(img_shape, shapes):
+    """Rasterize shapes of an instance only inside their bounding box.
+
+    Returns the mask and the (x, y) offset of its top-left corner in the
+    image, so the cost is proportional to the instance size rather than to
+    the image size.
+    """
+    height, width = img_shape[:2]
+    shapes = [
+        dict(s, points=_clamp_circle_radius(s["points"]))
+        if s["shape_type"] == "circle"
+        else s
+        for s in shapes
+    ]
+    extents = np.array(
+        [_shape_extent(s["points"], s["shape_type"]) for s in shapes]
+    )
+    x1 = int(np.clip(np.floor(extents[:, 0].min()), 0, width))
+    y1 = int(np.clip(np.floor(extents[:, 1].min()), 0, height))
+    x2 = int(np.clip(np.ceil(extents[:, 2].max()) + 1, 0, width))
+    y2 = int(np.clip(np.ceil(extents[:, 3].max()) + 1, 0, height))
+
+    mask = np.zeros((y2 - y1, x2 - x1), dtype=bool)
+    if mask.size == 0:
+        return mask, (x1, y1)
+    for shape in shapes:
+        points = np.asarray(shape["points"], dtype=np.float64) - (x1, y1)
+        mask |= utils.shape_to_mask(
+            mask.shape, points.tolist(), shape["shape_type"]
+        )
+    return mask, (x1, y1)
+
+
+def mask_to_area_and_bbox(mask, offset=(0, 0)):
+    area = float(mask.sum())
+    if area == 0:
+        return area, [0.0, 0.0, 0.0, 0.0]
+    ys = np.where(mask.any(axis=1))[0]
+    xs = np.where(mask.any(axis=0))[0]
+    x1, y1 = xs[0] + offset[0], ys[0] + offset[1]
+    w, h = xs[-1] - xs[0] + 1, ys[-1] - ys[0] + 1
+    return area, [float(x1), float(y1), float(w), float(h)]
+
+
+def polygons_to_area_and_bbox(polygons):
+    area = float(sum(polygon_area(polygon) for polygon in polygons))
+    xy = np.concatenate(
+        [np.asarray(polygon, dtype=np.float64) for polygon in polygons]
+    ).reshape(-1, 2)
+    x1, y1 = xy.min(axis=0)
+    x2, y2 = xy.max(axis=0)
+    return area, [float(x1), float(y1), float(x2 - x1), float(y2 - y1)]
+
+
+def _open_image(image_file, image_data):
+    # same as LabelFile: exif orientation is applied only to image files
+    if image_data is not None:
+        return utils.img_data_to_pil(image_data)
+    return utils.apply_exif_orientation(PIL.Image.open(image_file))
+
+
+def _get_image_size(label_file, image_file, image_data):
+    height, width = label_file.imageHeight, label_file.imageWidth
+    if height is not None and width is not None:
+        return height, width
+    image_pil = _open_image(image_file, image_data)  # reads only the header
+    return image_pil.height, image_pil.width
+
+
+def export_label_file(filename, output_dir, class_name_to_id, options):
+    """Convert a label file to COCO image and annotation records.
+
+    This runs in worker processes, so it only returns plain data and never
+    touches the aggregate annotation file.
+    """
+    label_file = LabelFile(filename, with_image=False)
+
+    base = osp.splitext(osp.basename(filename))[0]
+    out_img_file = osp.join(output_dir, "JPEGImages", base + ".jpg")
+
+    image_file = osp.join(osp.dirname(filename), label_file.imagePath)
+    # copied through, so not validated as label_file.imageData would be
+    image_data = label_file.read_embedded_image_data()
+    utils.export_image(
+        out_img_file,
+        image_file=image_file,
+        image_data=image_data,
+        mode=options["image_mode"],
+    )
+    img_shape = _get_image_size(label_file, image_file, image_data)
+
+    image = dict(
+        license=0,
+        url=None,
+        file_name=osp.relpath(out_img_file, output_dir),
+        height=int(img_shape[0]),
+        width=int(img_shape[1]),
+        date_captured=None,
+    )
+
+    instances = collections.OrderedDict()
+    for shape in label_file.shapes:
+        label = shape["label"]
+        group_id = shape.get("group_id")
+        if group_id is None:
+            group_id = uuid.uuid1()
+        shape = dict(
+            points=shape["points"],
+            shape_type=shape["shape_type"] or "polygon",
+        )
+        instances.setdefault((label, group_id), []).append(shape)
+
+    annotations = []
+    viz_masks = []
+    for (cls_name, group_id), shapes in instances.items():
+        if cls_name not in class_name_to_id:
+            continue
+        cls_id = class_name_to_id[cls_name]
+
+        segmentation = [
+            shape_to_polygon(s["points"], s["shape_type"]) for s in shapes
+        ]
+        is_closed = all(
+            s["shape_type"] in ["polygon", "rectangle", "circle"]
+            for s in shapes
+        )
+        if options["geometry"] == "polygon" and is_closed:
+            area, bbox = polygons_to_area_and_bbox(segmentation)
+        else:
+            mask, offset = instance_to_cropped_mask(img_shape, shapes)
+            area, bbox = mask_to_area_and_bbox(mask, offset=offset)
+
+        annotations.append(
+            dict(
+                category_id=cls_id,
+                segmentation=segmentation,
+                area=area,
+                bbox=bbox,
+                iscrowd=0,
+            )
+        )
+        if options["viz"]:
+            viz_masks.append((cls_id, cls_name, shapes))
+
+    if options["viz"]:
+        img = np.asarray(_open_image(image_file, image_data))
+        viz = img
+        if viz_masks:
+            labels, captions, masks = zip(
+                *[
+                    (
+                        cls_id,
+                        cls_name,
+                        np.any(
+                            [
+                                utils.shape_to_mask(
+                                    img.shape[:2], s["points"], s["shape_type"]
+                                )
+                                for s in shapes
+                            ],
+                            axis=0,
+                        ),
+                    )
+                    for cls_id, cls_name, shapes in viz_masks
+                ]
+            )
+            viz = imgviz.instances2rgb(
+                image=img,
+                labels=labels,
+                masks=masks,
+                captions=captions,
+                font_size=15,
+                line_width=2,
+            )
+        out_viz_file = osp.join(output_dir, "Visualization", base + ".jpg")
+        imgviz.io.imsave(out_viz_file, viz)
+
+    return image, annotations
+
+
+def load_class_names(labels_file):
+    class_name_to_id = {}
+    categories = []
+    with open(labels_file) as f:
+        for i, line in enumerate(f.readlines()):
+            class_id = i - 1  # starts with -1
+            class_name = line.strip()
+            if class_id == -1:
+                assert class_name == "__ignore__"
+                continue
+            class_name_to_id[class_name] = class_id
+            categories.append(
+                dict(
+                    supercategory=None,
+                    id=class_id,
+                    name=class_name,
+                )
+            )
+    return class_name_to_id, categories
+
+
+def _export_worker(filename, output_dir, class_name_to_id, options):
+    stat = None
+    if options["incremental"]:
+        stat = ExportManifest.stat(filename)
+    image, annotations = export_label_file(
+        filename, output_dir, class_name_to_id, options
+    )
+    outputs = get_output_files(filename, output_dir, options)
+    if options["incremental"]:
+        with open(outputs[-1], "w") as f:
+            json.dump(dict(image=image, annotations=annotations), f)
+    return image, annotations, stat, outputs
+
+
+def get_output_files(filename, output_dir, options):
+    base = osp.splitext(osp.basename(filename))[0]
+    outputs = [osp.join(output_dir, "JPEGImages", base + ".jpg")]
+    if options["viz"]:
+        outputs.append(osp.join(output_dir, "Visualization", base + ".jpg"))
+    if options["incremental"]:
+        # per-file records to rebuild annotations.json without reprocessing
+        outputs.append(osp.join(output_dir, "Records", base + ".json"))
+    return outputs
+
+
+def export_coco(
+    label_files,
+    output_dir,
+    labels_file,
+    workers=None,
+    image_mode="encode",
+    geometry="mask",
+    viz=False,
+    incremental=False,
+    chunksize=16,
+):
+    class_name_to_id, categories = load_class_names(labels_file)
+
+    now = datetime.datetime.now()
+    info = dict(
+        description=None,
+        url=None,
+        version=None,
+        year=now.year,
+        contributor=None,
+        date_created=now.strftime("%Y-%m-%d %H:%M:%S.%f"),
+    )
+    licenses = [dict(url=None, id=0, name=None)]
+
+    options = dict(
+        image_mode=image_mode,
+        geometry=geometry,
+        viz=viz,
+        incremental=incremental,
+    )
+    func = functools.partial(
+        _export_worker,
+        output_dir=output_dir,
+        class_name_to_id=class_name_to_id,
+        options=options,
+    )
+
+    if incremental:
+        if not osp.exists(osp.join(output_dir, "Records")):
+            os.makedirs(osp.join(output_dir, "Records"))
+        manifest = ExportManifest(
+            output_dir,
+            options=dict(
+                options,
+                labels=file_digest(labels_file),
+                format="coco",
+            ),
+        )
+        manifest.reset_if_options_changed()
+        changed, unchanged, deleted = manifest.diff(label_files)
+        for filename in deleted:
+            manifest.remove(filename)
+        logger.info(
+            "Exporting {} added or changed files, removing {} deleted files "
+            "and keeping {} unchanged files".format(
+                len(changed), len(deleted), len(unchanged)
+            )
+        )
+        changed = set(changed)
+        to_process = [f for f in label_files if f in changed]
+    else:
+        manifest = None
+        changed = set(label_files)
+        to_process = label_files
+
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+
+    out_ann_file = osp.join(output_dir, "annotations.json")
+    t_start = time.time()
+    with CocoJsonWriter(out_ann_file, info, licenses, categories) as writer:
+        if workers > 1 and len(to_process) > 1:
+            pool = multiprocessing.Pool(processes=workers)
+            results = pool.imap(func, to_process, chunksize=chunksize)
+        else:
+            pool = None
+            results = map(func, to_process)
+        try:
+            for image_id, filename in enumerate(label_files):
+                if filename in changed:
+                    image, annotations, stat, outputs = next(results)
+                    if manifest is not None:
+                        manifest.update(filename, outputs, stat=stat)
+                else:
+                    with open(manifest.outputs(filename)[-1]) as f:
+                        record = json.load(f)
+                    image = record["image"]
+                    annotations = record["annotations"]
+
+                writer.add_image(dict(image, id=image_id))
+                for annotation in annotations:
+                    writer.add_annotation(dict(annotation, image_id=image_id))
+                if (image_id + 1) % 1000 == 0:
+                    logger.info(
+                        "Exported {} files ({:.1f} files/s)".format(
+                            image_id + 1,
+                            (image_id + 1) / (time.time() - t_start),
+                        )
+                    )
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            if manifest is not None:
+                manifest.save()
+    logger.info(
+        "Exported {} images and {} annotations in {:.1f}s: {}".format(
+            writer.num_images,
+            writer.num_annotations,
+            time.time() - t_start,
+            out_ann_file,
+        )
+    )
+    return out_ann_file
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("input_dir", help="input annotated directory")
+    parser.add_argument("output_dir", help="output dataset directory")
+    parser.add_argument("--labels", help="labels file", required=True)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=multiprocessing.cpu_count(),
+        help="number of worker processes",
+    )
+    parser.add_argument(
+        "--image-mode",
+        choices=["encode", "copy", "hardlink", "reflink", "symlink"],
+        default="encode",
+        help="how to write images: re-encode as JPEG, or pass JPEG through "
+        "when no transform is needed (falling back to re-encode otherwise)",
+    )
+    parser.add_argument(
+        "--geometry",
+        choices=["mask", "polygon"],
+        default="mask",
+        help="compute area and bbox from a rasterized mask cropped to the "
+        "instance, or analytically from polygons",
+    )
+    parser.add_argument("--viz", help="visualization", action="store_true")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="update an existing output directory, only processing added, "
+        "changed or deleted label files since the last export",
+    )
+    args = parser.parse_args()
+
+    if osp.exists(args.output_dir) and not (
+        args.incremental
+        and osp.exists(osp.join(args.output_dir, ExportManifest.basename))
+    ):
+        logger.error("Output directory already exists: %s", args.output_dir)
+        sys.exit(1)
+    for dirname in ["JPEGImages"] + (["Visualization"] if args.viz else []):
+        if not osp.exists(osp.join(args.output_dir, dirname)):
+            os.makedirs(osp.join(args.output_dir, dirname))
+    logger.info("Creating dataset: {}".format(args.output_dir))
+
+    label_files = sorted(glob.glob(osp.join(args.input_dir, "*.json")))
+    export_coco(
+        label_files,
+        output_dir=args.output_dir,
+        labels_file=args.labels,
+        workers=args.workers,
+        image_mode=args.image_mode,
+        geometry=args.geometry,
+        viz=args.viz,
+        incremental=args.incremental,
+    )
+
+
+if __name__ == "__main__":
+    main()
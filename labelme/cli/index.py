@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+import argparse
+import os.path as osp
+import sys
+import time
+
+from labelme.annotation_index import AnnotationIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Index the label files in a directory in SQLite and "
+        "query it.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("root_dir", help="directory of label files")
+    parser.add_argument(
+        "--db",
+        help="index file (default: ROOT_DIR/.labelme_index.sqlite3)",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    parser_update = subparsers.add_parser(
+        "update", help="index new and changed label files"
+    )
+    parser_update.add_argument(
+        "--workers", type=int, help="number of processes (0: no process)"
+    )
+
+    subparsers.add_parser(
+        "labels", help="print label, number of shapes and number of files"
+    )
+
+    parser_files = subparsers.add_parser(
+        "files", help="print label files matching all conditions"
+    )
+    parser_files.add_argument("--label", help="with a shape of the label")
+    parser_files.add_argument("--flag", help="with the image flag set")
+    parser_files.add_argument(
+        "--shape-type", help="with a shape of the shape type"
+    )
+
+    parser_sql = subparsers.add_parser(
+        "sql",
+        help="run a SQL query on tables files, file_flags, shapes and "
+        "file_labels",
+    )
+    parser_sql.add_argument("sql")
+    args = parser.parse_args()
+
+    if args.db is None:
+        args.db = osp.join(args.root_dir, ".labelme_index.sqlite3")
+
+    with AnnotationIndex(args.db) as index:
+        t_start = time.time()
+        if args.command == "update":
+            num_changed, num_removed = index.update(
+                args.root_dir, workers=args.workers
+            )
+            rows = [("changed", num_changed), ("removed", num_removed)]
+        elif args.command == "labels":
+            rows = index.labels()
+        elif args.command == "files":
+            rows = [
+                (path,)
+                for path in index.files(
+                    label=args.label,
+                    flag=args.flag,
+                    shape_type=args.shape_type,
+                )
+            ]
+        else:
+            rows = index.query(args.sql)
+        elapsed = time.time() - t_start
+
+    for row in rows:
+        print("\t".join(str(value) for value in row))
+    print(
+        "{} rows in {:.1f}ms".format(len(rows), elapsed * 1000),
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+import argparse
+import io
+import json
+import sys
+import time
+
+from labelme.cli.validate import get_label_files
+from labelme.dataset_stats import compute_stats
+from labelme.logger import logger
+
+
+def _format_summary(summary):
+    if not summary or "median" not in summary:  # no values
+        return "-"
+    return "{median:.1f} ({p5:.1f}-{p95:.1f})".format(**summary)
+
+
+def print_stats(stats, f=sys.stdout):
+    print(
+        "files: {num_files}, shapes: {num_shapes}, "
+        "errors: {num_errors}".format(**stats),
+        file=f,
+    )
+    print(
+        "shapes per file: {}".format(
+            _format_summary(stats["shapes_per_file"])
+        ),
+        file=f,
+    )
+    print(
+        "shape types: {}".format(
+            ", ".join(
+                "{}={}".format(shape_type, count)
+                for shape_type, count in stats["shape_types"].items()
+            )
+        ),
+        file=f,
+    )
+    print(file=f)
+    header = [
+        "label",
+        "shapes",
+        "files",
+        "small/medium/large",
+        "bbox width",
+        "bbox height",
+    ]
+    print("\t".join(header), file=f)
+    for label, class_stats in stats["classes"].items():
+        row = [
+            label,
+            class_stats["num_shapes"],
+            class_stats["num_files"],
+            "/".join(str(n) for n in class_stats["bbox_sizes"].values()),
+            _format_summary(class_stats["bbox_width"]),
+            _format_summary(class_stats["bbox_height"]),
+        ]
+        print("\t".join(str(value) for value in row), file=f)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Print statistics of the shapes in label files: counts "
+        "per label and shape type, polygon vertices, bbox sizes (median and "
+        "5-95 percentiles) and shapes per file.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="label files or directories of them"
+    )
+    parser.add_argument(
+        "--workers", type=int, help="number of processes (0: no process)"
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        help="write all statistics as JSON to the file (-: stdout)",
+    )
+    args = parser.parse_args()
+
+    t_start = time.time()
+    filenames = get_label_files(args.paths)
+    stats = compute_stats(filenames, workers=args.workers)
+    logger.info(
+        "Computed statistics of {} files in {:.1f}s".format(
+            len(filenames), time.time() - t_start
+        )
+    )
+    for error in stats["errors"]:
+        logger.warning("Failed to read {filename}: {error}".format(**error))
+
+    if args.output == "-":
+        json.dump(stats, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+    if args.output:
+        with io.open(args.output, "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=2, ensure_ascii=False)
+    print_stats(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+import argparse
+import csv
+import io
+import json
+import os.path as osp
+import sys
+import time
+
+from labelme.annotation_index import AnnotationIndex
+from labelme.logger import logger
+from labelme.testing import validate_labelfiles
+
+
+def get_label_files(paths):
+    filenames = []
+    for path in paths:
+        if osp.isdir(path):
+            filenames.extend(AnnotationIndex.scan(path))
+        else:
+            filenames.append(path)
+    return filenames
+
+
+def write_report(f, errors, summary, format="json"):
+    if format == "csv":
+        writer = csv.DictWriter(
+            f, fieldnames=["filename", "shape", "code", "message"]
+        )
+        writer.writeheader()
+        writer.writerows(errors)
+    else:
+        json.dump(dict(summary=summary, errors=errors), f, indent=2)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate label files in parallel: image size, shape "
+        "types, number of points and points within the image.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="label files or directories of them"
+    )
+    parser.add_argument(
+        "--workers", type=int, help="number of processes (0: no process)"
+    )
+    parser.add_argument("--output", "-o", help="report file (default: stdout)")
+    parser.add_argument(
+        "--format",
+        choices=["json", "csv"],
+        help="report format (default: from the extension of --output, "
+        "or json)",
+    )
+    args = parser.parse_args()
+
+    if args.format is None:
+        if args.output and args.output.lower().endswith(".csv"):
+            args.format = "csv"
+        else:
+            args.format = "json"
+
+    t_start = time.time()
+    filenames = get_label_files(args.paths)
+    errors = []
+    num_invalid = 0
+    for filename, file_errors in validate_labelfiles(
+        filenames, workers=args.workers
+    ):
+        if file_errors:
+            num_invalid += 1
+            errors.extend(file_errors)
+    elapsed = time.time() - t_start
+    errors.sort(
+        key=lambda e: (e["filename"], -1 if e["shape"] is None else e["shape"])
+    )
+
+    summary = dict(
+        num_files=len(filenames),
+        num_invalid_files=num_invalid,
+        num_errors=len(errors),
+        seconds=round(elapsed, 3),
+        files_per_second=round(len(filenames) / max(elapsed, 1e-9), 1),
+    )
+    if args.output:
+        with io.open(args.output, "w", encoding="utf-8", newline="") as f:
+            write_report(f, errors, summary, format=args.format)
+    else:
+        write_report(sys.stdout, errors, summary, format=args.format)
+    logger.info(
+        "Validated {num_files} files in {seconds}s ({files_per_second} "
+        "files/s): {num_errors} errors in {num_invalid_files} files".format(
+            **summary
+        )
+    )
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import base64
+import io
+import json
+
+import numpy as np
+
+
+suffix = ".labelme.npz"
+
+# keys of a shape stored in columns rather than in the skeleton
+_shape_column_keys = ["label", "points", "shape_type"]
+
+
+def is_compact_file(filename):
+    return filename.lower().endswith(suffix)
+
+
+def _dump_json(obj):
+    return np.frombuffer(
+        json.dumps(obj, ensure_ascii=False).encode("utf-8"), dtype=np.uint8
+    )
+
+
+def _load_json(array):
+    return json.loads(array.tobytes().decode("utf-8"))
+
+
+def save(filename, data):
+    """Save a label file document (as in the JSON) in the compact format.
+
+    filename can also be a file object opened in binary mode.
+
+    Shapes are stored in columns: the vertices of all shapes in a flat
+    float32 array with per-shape offsets, and labels and shape types as ids
+    into vocabularies. Embedded imageData is stored as raw bytes rather than
+    base64. Everything else is kept as a JSON skeleton of the document, so
+    that converting back gives the same keys in the same order.
+
+    Besides base64, imageData can be given as raw bytes or deferred (e.g.,
+    :class:`DeferredImageData`), so that an image that is already decoded
+    is not encoded to base64 only to be decoded again.
+    """
+    labels = []
+    label_to_id = {}
+    shape_types = []
+    shape_type_to_id = {}
+    label_ids = []
+    shape_type_ids = []
+    offsets = [0]
+    points = []
+    shapes = []
+    for shape in data["shapes"]:
+        label = shape["label"]
+        if label not in label_to_id:
+            label_to_id[label] = len(labels)
+            labels.append(label)
+        label_ids.append(label_to_id[label])
+
+        shape_type = shape.get("shape_type", "polygon")
+        if shape_type not in shape_type_to_id:
+            shape_type_to_id[shape_type] = len(shape_types)
+            shape_types.append(shape_type)
+        shape_type_ids.append(shape_type_to_id[shape_type])
+
+        points.extend(shape["points"])
+        offsets.append(len(points))
+        shapes.append(
+            {
+                k: None if k in _shape_column_keys else v
+                for k, v in shape.items()
+            }
+        )
+
+    skeleton = dict(data)
+    skeleton["shapes"] = shapes
+    skeleton["imageData"] = None
+
+    arrays = dict(
+        skeleton=_dump_json(skeleton),
+        vocabulary=_dump_json(dict(labels=labels, shape_types=shape_types)),
+        points=np.array(points, dtype=np.float32).reshape(-1, 2),
+        offsets=np.array(offsets, dtype=np.int64),
+        label_ids=np.array(label_ids, dtype=np.int32),
+        shape_type_ids=np.array(shape_type_ids, dtype=np.uint8),
+    )
+    if data.get("imageData") is not None:
+        arrays["image_data"] = np.frombuffer(
+            _image_data_bytes(data["imageData"]), dtype=np.uint8
+        )
+
+    if isinstance(filename, str):
+        with io.open(filename, "wb") as f:
+            np.savez(f, **arrays)
+    else:
+        np.savez(filename, **arrays)
+
+
+def _image_data_bytes(imageData):
+    if isinstance(imageData, DeferredImageData):
+        return imageData.read_bytes()
+    if hasattr(imageData, "read"):
+        imageData = imageData.read()
+    if isinstance(imageData, bytes):
+        return imageData
+    return base64.b64decode(imageData)
+
+
+class DeferredImageData(object):
+    """Embedded image of a compact label file that is read only when needed."""
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def read_bytes(self):
+        with np.load(self.filename, allow_pickle=False) as npz:
+            return npz["image_data"].tobytes()
+
+    def read(self):
+        return base64.b64encode(self.read_bytes()).decode("utf-8")
+
+
+def load(filename, with_image_data=True):
+    """Load a compact label file as the same document as the JSON.
+
+    Points come back with float32 precision. If with_image_data is False,
+    embedded imageData is returned as :class:`DeferredImageData`.
+    """
+    with np.load(filename, allow_pickle=False) as npz:
+        data = _load_json(npz["skeleton"])
+        vocabulary = _load_json(npz["vocabulary"])
+        points = npz["points"].tolist()
+        offsets = npz["offsets"].tolist()
+        label_ids = npz["label_ids"].tolist()
+        shape_type_ids = npz["shape_type_ids"].tolist()
+        if "image_data" not in npz.files:
+            pass
+        elif not with_image_data:
+            data["imageData"] = DeferredImageData(filename)
+        else:
+            data["imageData"] = base64.b64encode(
+                npz["image_data"].tobytes()
+            ).decode("utf-8")
+
+    labels = vocabulary["labels"]
+    shape_types = vocabulary["shape_types"]
+    for i, shape in enumerate(data["shapes"]):
+        shape["label"] = labels[label_ids[i]]
+        shape["points"] = points[offsets[i] : offsets[i + 1]]
+        if "shape_type" in shape:
+            shape["shape_type"] = shape_types[shape_type_ids[i]]
+    return data
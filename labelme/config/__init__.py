@@ -8,6 +8,13 @@ from labelme.logger import logger
 
 here = osp.dirname(osp.abspath(__file__))
 
+# the C loader parses the config several times faster when libyaml exists
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _safe_load(stream):
+    return yaml.load(stream, Loader=_SafeLoader)
+
 
 def update_dict(target_dict, new_dict, validate_item=None):
     for key, value in new_dict.items():
@@ -28,7 +35,7 @@ def update_dict(target_dict, new_dict, validate_item=None):
 def get_default_config():
     config_file = osp.join(here, "default_config.yaml")
     with open(config_file) as f:
-        config = yaml.safe_load(f)
+        config = _safe_load(f)
 
     # save default config to ~/.labelmerc
     user_config_file = osp.join(osp.expanduser("~"), ".labelmerc")
@@ -48,6 +55,12 @@ def validate_config_item(key, value):
                 value
             )
         )
+    if key == "label_list_style" and value not in ["plain", "html"]:
+        raise ValueError(
+            "Unexpected value for config key 'label_list_style': {}".format(
+                value
+            )
+        )
     if key == "shape_color" and value not in [None, "auto", "manual"]:
         raise ValueError(
             "Unexpected value for config key 'shape_color': {}".format(value)
@@ -64,13 +77,13 @@ def get_config(config_file_or_yaml=None, config_from_args=None):
 
     # 2. specified as file or yaml
     if config_file_or_yaml is not None:
-        config_from_yaml = yaml.safe_load(config_file_or_yaml)
+        config_from_yaml = _safe_load(config_file_or_yaml)
         if not isinstance(config_from_yaml, dict):
             with open(config_from_yaml) as f:
                 logger.info(
                     "Loading config file from: {}".format(config_from_yaml)
                 )
-                config_from_yaml = yaml.safe_load(f)
+                config_from_yaml = _safe_load(f)
         update_dict(
             config, config_from_yaml, validate_item=validate_config_item
         )
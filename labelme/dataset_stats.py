@@ -0,0 +1,217 @@
+import multiprocessing
+
+import numpy as np
+
+from labelme.label_file import LabelFile
+from labelme import utils
+
+
+# lower edges of the bins of histograms, where the last bin has no limit
+VERTEX_BINS = [0, 1, 2, 3, 4, 5, 6, 8, 12, 16, 32, 64, 128]
+DENSITY_BINS = [0, 1, 2, 3, 5, 10, 20, 50, 100, 200]
+# bbox area in pixels as COCO small, medium and large
+BBOX_SIZE_BINS = dict(small=0, medium=32**2, large=96**2)
+
+
+def _read_labelfile(filename):
+    """Read the per-shape columns of a label file, in worker processes."""
+    try:
+        shapes = LabelFile(filename, with_image=False).shapes
+        # malformed points are reported as an error of the file
+        bboxes, areas = utils.shapes_to_bboxes_and_areas(shapes)
+        return dict(
+            filename=filename,
+            error=None,
+            labels=[shape["label"] for shape in shapes],
+            shape_types=[shape["shape_type"] for shape in shapes],
+            num_points=np.array(
+                [len(shape["points"]) for shape in shapes], dtype=np.int32
+            ),
+            bboxes=bboxes.astype(np.float32),
+            areas=areas.astype(np.float32),
+        )
+    except Exception as e:
+        return dict(filename=filename, error=str(e))
+
+
+def _bin_counts(values, edges):
+    return np.bincount(
+        np.searchsorted(edges, values, side="right") - 1,
+        minlength=len(edges),
+    )
+
+
+def _histogram(values, edges):
+    bins = []
+    for i, count in enumerate(_bin_counts(values, edges).tolist()):
+        high = edges[i + 1] - 1 if i + 1 < len(edges) else None
+        bins.append(dict(min=edges[i], max=high, count=count))
+    return bins
+
+
+def _summary(values):
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return None
+    p5, p50, p95 = np.percentile(values, [5, 50, 95]).tolist()
+    return dict(
+        mean=float(values.mean()),
+        min=float(values.min()),
+        p5=p5,
+        median=p50,
+        p95=p95,
+        max=float(values.max()),
+    )
+
+
+def _geometry_stats(num_points, shape_type_ids, polygon_id, bboxes, areas):
+    widths = bboxes[:, 2] - bboxes[:, 0]
+    heights = bboxes[:, 3] - bboxes[:, 1]
+    bbox_areas = widths * heights
+    size_counts = _bin_counts(
+        bbox_areas[~np.isnan(bbox_areas)], list(BBOX_SIZE_BINS.values())
+    )
+    return dict(
+        polygon_vertices=_histogram(
+            num_points[shape_type_ids == polygon_id], VERTEX_BINS
+        ),
+        bbox_width=_summary(widths),
+        bbox_height=_summary(heights),
+        bbox_sizes=dict(zip(BBOX_SIZE_BINS, size_counts.tolist())),
+        area=_summary(areas),
+    )
+
+
+def compute_stats(filenames, workers=None, chunksize=64):
+    """Compute the statistics of the shapes in label files.
+
+    Label files are parsed in worker processes (workers=0: in the current
+    process) without loading images, and the statistics are computed over
+    the flattened per-shape columns of all files. Returns a dict that can be
+    dumped as JSON.
+    """
+    if workers == 0 or len(filenames) < 2 * chunksize:
+        records = map(_read_labelfile, filenames)
+        return _aggregate(records)
+    with multiprocessing.Pool(workers) as pool:
+        records = pool.imap_unordered(
+            _read_labelfile, filenames, chunksize=chunksize
+        )
+        return _aggregate(records)
+
+
+def _aggregate(records):
+    label_to_id = {}
+    shape_type_to_id = {}
+    label_ids = []
+    shape_type_ids = []
+    file_ids = []
+    num_points = []
+    bboxes = []
+    areas = []
+    shapes_per_file = []
+    errors = []
+    for record in records:
+        if record["error"] is not None:
+            errors.append(
+                dict(filename=record["filename"], error=record["error"])
+            )
+            continue
+        file_id = len(shapes_per_file)
+        shapes_per_file.append(len(record["labels"]))
+        label_ids.append(
+            np.array(
+                [
+                    label_to_id.setdefault(label, len(label_to_id))
+                    for label in record["labels"]
+                ],
+                dtype=np.int32,
+            )
+        )
+        shape_type_ids.append(
+            np.array(
+                [
+                    shape_type_to_id.setdefault(
+                        shape_type, len(shape_type_to_id)
+                    )
+                    for shape_type in record["shape_types"]
+                ],
+                dtype=np.int32,
+            )
+        )
+        file_ids.append(np.full(len(record["labels"]), file_id, np.int32))
+        num_points.append(record["num_points"])
+        bboxes.append(record["bboxes"])
+        areas.append(record["areas"])
+
+    def concatenate(arrays, dtype, shape=(0,)):
+        if not arrays:
+            return np.zeros(shape, dtype=dtype)
+        return np.concatenate(arrays)
+
+    label_ids = concatenate(label_ids, np.int32)
+    shape_type_ids = concatenate(shape_type_ids, np.int32)
+    file_ids = concatenate(file_ids, np.int32)
+    num_points = concatenate(num_points, np.int32)
+    bboxes = concatenate(bboxes, np.float32, shape=(0, 4)).astype(np.float64)
+    areas = concatenate(areas, np.float32).astype(np.float64)
+    shapes_per_file = np.array(shapes_per_file, dtype=np.int64)
+
+    labels = list(label_to_id)
+    shape_types = list(shape_type_to_id)
+    polygon_id = shape_type_to_id.get("polygon", -1)
+
+    stats = dict(
+        num_files=len(shapes_per_file),
+        num_shapes=len(label_ids),
+        num_errors=len(errors),
+        shape_types=dict(
+            zip(
+                shape_types,
+                np.bincount(
+                    shape_type_ids, minlength=len(shape_types)
+                ).tolist(),
+            )
+        ),
+        shapes_per_file=dict(
+            _summary(shapes_per_file.astype(np.float64)) or {},
+            histogram=_histogram(shapes_per_file, DENSITY_BINS),
+        ),
+    )
+    stats.update(
+        _geometry_stats(num_points, shape_type_ids, polygon_id, bboxes, areas)
+    )
+
+    # files with the label, counting each (label, file) pair once
+    label_files = np.unique(
+        label_ids.astype(np.int64) * max(len(shapes_per_file), 1) + file_ids
+    ) // max(len(shapes_per_file), 1)
+    num_files_per_label = np.bincount(label_files, minlength=len(labels))
+    type_counts = np.zeros((len(labels), len(shape_types)), dtype=np.int64)
+    np.add.at(type_counts, (label_ids, shape_type_ids), 1)
+
+    order = np.argsort(label_ids, kind="stable")
+    splits = np.cumsum(np.bincount(label_ids, minlength=len(labels)))[:-1]
+    classes = {}
+    for label_id, indices in zip(range(len(labels)), np.split(order, splits)):
+        classes[labels[label_id]] = dict(
+            num_shapes=len(indices),
+            num_files=int(num_files_per_label[label_id]),
+            shape_types={
+                shape_type: count
+                for shape_type, count in zip(
+                    shape_types, type_counts[label_id].tolist()
+                )
+                if count
+            },
+            **_geometry_stats(
+                num_points[indices],
+                shape_type_ids[indices],
+                polygon_id,
+                bboxes[indices],
+                areas[indices],
+            )
+        )
+    stats["classes"] = dict(sorted(classes.items()))
+    stats["errors"] = errors
+    return stats
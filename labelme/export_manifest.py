@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import os.path as osp
+
+from labelme.label_file import LabelFile
+from labelme.label_file import LabelFileError
+from labelme.logger import logger
+
+
+def file_digest(filename, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ExportManifest(object):
+    """Record of the label files a dataset export was built from.
+
+    For every exported label file it keeps size, mtime and content hash of
+    the input (and of the image file it refers to, if the image is not
+    embedded) and the paths of the outputs generated from it, so that a
+    re-export only needs to process added and changed files and to remove
+    the outputs of deleted ones. ``options`` fingerprints everything else the
+    outputs depend on (e.g., the labels file), and any change of it
+    invalidates the whole manifest: all files are reported as changed, and
+    :meth:`reset_if_options_changed` removes the recorded outputs.
+    """
+
+    basename = ".labelme_manifest.json"
+
+    def __init__(self, output_dir, options=None):
+        self.output_dir = output_dir
+        self.filename = osp.join(output_dir, self.basename)
+        self.options = options or {}
+        self.entries = {}
+        self.options_changed = False
+
+        if osp.exists(self.filename):
+            with open(self.filename) as f:
+                data = json.load(f)
+            self.entries = data["entries"]
+            self.options_changed = data.get("options") != self.options
+
+    def reset_if_options_changed(self):
+        """Remove the recorded outputs if the export options changed.
+
+        Returns True if the outputs were removed.
+        """
+        if not self.options_changed:
+            return False
+        logger.info(
+            "Export options changed, so rebuilding: {}".format(self.output_dir)
+        )
+        # e.g., VOC outputs of removed classes would be left over
+        for key in list(self.entries):
+            self.remove(key)
+        self.options_changed = False
+        return True
+
+    @staticmethod
+    def _key(filename):
+        return osp.abspath(filename)
+
+    @staticmethod
+    def _stat_file(filename):
+        stat = os.stat(filename)
+        return dict(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            sha1=file_digest(filename),
+        )
+
+    @staticmethod
+    def _is_file_changed(filename, record):
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return True
+        if stat.st_size != record["size"]:
+            return True
+        if stat.st_mtime_ns == record["mtime_ns"]:
+            return False
+        # touched but possibly unchanged, e.g., by git checkout or rsync
+        if file_digest(filename) != record["sha1"]:
+            return True
+        record["mtime_ns"] = stat.st_mtime_ns
+        return False
+
+    @staticmethod
+    def _image_file(filename):
+        """Return the image file a label file refers to, if not embedded."""
+        try:
+            label_file = LabelFile(filename, with_image=False)
+        except LabelFileError:
+            return None
+        if label_file.imageDataEmbedded or not label_file.imagePath:
+            return None
+        image_file = osp.join(osp.dirname(filename), label_file.imagePath)
+        if not osp.exists(image_file):
+            return None
+        return osp.abspath(image_file)
+
+    @classmethod
+    def stat(cls, filename):
+        """Return the input record of a file for :meth:`update`.
+
+        Call this before reading the file for export, so that a concurrent
+        modification is detected on the next run, and call it in worker
+        processes to parallelize hashing.
+        """
+        record = cls._stat_file(filename)
+        image_file = cls._image_file(filename)
+        if image_file is not None:
+            record["image"] = dict(cls._stat_file(image_file), path=image_file)
+        return record
+
+    def is_changed(self, filename):
+        if self.options_changed:
+            return True
+        entry = self.entries.get(self._key(filename))
+        if entry is None:
+            return True
+        if not all(osp.lexists(out) for out in self.outputs(filename)):
+            return True
+        if self._is_file_changed(filename, entry):
+            return True
+        image = entry.get("image")
+        return image is not None and self._is_file_changed(
+            image["path"], image
+        )
+
+    def diff(self, filenames):
+        """Split filenames into changed (including added) and unchanged ones.
+
+        Returns ``(changed, unchanged, deleted)``, where ``deleted`` are the
+        recorded files that are not in ``filenames`` anymore.
+        """
+        changed = []
+        unchanged = []
+        for filename in filenames:
+            if self.is_changed(filename):
+                changed.append(filename)
+            else:
+                unchanged.append(filename)
+        keys = set(self._key(filename) for filename in filenames)
+        deleted = [key for key in self.entries if key not in keys]
+        return changed, unchanged, deleted
+
+    def outputs(self, filename):
+        entry = self.entries.get(self._key(filename))
+        if entry is None:
+            return []
+        return [osp.join(self.output_dir, out) for out in entry["outputs"]]
+
+    def update(self, filename, outputs, stat=None):
+        if stat is None:
+            stat = self.stat(filename)
+        self.entries[self._key(filename)] = dict(
+            stat,
+            outputs=[osp.relpath(out, self.output_dir) for out in outputs],
+        )
+
+    def remove(self, filename):
+        """Remove the outputs of a label file and forget about it."""
+        for out in self.outputs(filename):
+            if osp.lexists(out):
+                os.remove(out)
+        self.entries.pop(self._key(filename), None)
+
+    def save(self):
+        tmp_filename = self.filename + ".tmp"
+        with open(tmp_filename, "w") as f:
+            json.dump(dict(options=self.options, entries=self.entries), f)
+        os.replace(tmp_filename, self.filename)
@@ -0,0 +1,107 @@
+import operator
+import re
+import shlex
+
+
+_OPERATORS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+    "=": operator.eq,
+}
+
+_COUNT_TERM = re.compile(
+    r"^(?:label:(?P<label>.+?)|shapes)(?P<op>>=|<=|>|<|=)(?P<count>\d+)$"
+)
+
+
+class FileSummary(object):
+    """Shapes and flags of a label file as needed to match a FileQuery."""
+
+    __slots__ = ["num_shapes", "label_counts", "flags"]
+
+    def __init__(self, num_shapes=0, label_counts=None, flags=None):
+        self.num_shapes = num_shapes
+        self.label_counts = label_counts or {}  # label -> number of shapes
+        self.flags = flags or frozenset()  # flags that are true
+
+    @classmethod
+    def from_shapes(cls, shapes, flags):
+        label_counts = {}
+        for shape in shapes:
+            label_counts[shape["label"]] = (
+                label_counts.get(shape["label"], 0) + 1
+            )
+        return cls(
+            num_shapes=len(shapes),
+            label_counts=label_counts,
+            flags=frozenset(flag for flag, value in flags.items() if value),
+        )
+
+
+_EMPTY_SUMMARY = FileSummary()
+
+
+class FileQuery(object):
+    """Filter of the file list by path and annotations.
+
+    The query is a whitespace separated list of terms, all of which must
+    match. ``label:NAME`` matches files with a shape of the label, and
+    ``label:NAME>N`` (or ``>=``, ``<``, ``<=``, ``=``) with that many shapes
+    of it, ``shapes>N`` with that many shapes in total, and ``flag:NAME``
+    files with the image flag set. A leading ``-`` negates a term, terms
+    with spaces can be quoted, and any other term matches a substring of
+    the image path.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        try:
+            terms = shlex.split(text)
+        except ValueError:  # e.g., unclosed quote while typing
+            terms = [term.strip("\"'") for term in text.split()]
+        self.terms = [self._parse_term(term) for term in terms]
+
+    @property
+    def needs_summary(self):
+        return any(kind != "path" for _, kind, _ in self.terms)
+
+    @staticmethod
+    def _parse_term(term):
+        negate = term.startswith("-") and len(term) > 1
+        if negate:
+            term = term[1:]
+        match = _COUNT_TERM.match(term)
+        if match:
+            value = (
+                match.group("label"),
+                _OPERATORS[match.group("op")],
+                int(match.group("count")),
+            )
+            return negate, "count", value
+        if term.startswith("label:") and len(term) > len("label:"):
+            return negate, "label", term[len("label:") :]
+        if term.startswith("flag:") and len(term) > len("flag:"):
+            return negate, "flag", term[len("flag:") :]
+        return negate, "path", term
+
+    def match(self, path, summary=None):
+        if summary is None:
+            summary = _EMPTY_SUMMARY
+        for negate, kind, value in self.terms:
+            if kind == "path":
+                matched = value in path
+            elif kind == "label":
+                matched = value in summary.label_counts
+            elif kind == "flag":
+                matched = value in summary.flags
+            else:
+                label, op, count = value
+                if label is None:
+                    matched = op(summary.num_shapes, count)
+                else:
+                    matched = op(summary.label_counts.get(label, 0), count)
+            if matched == negate:
+                return False
+        return True
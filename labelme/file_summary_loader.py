@@ -0,0 +1,47 @@
+import os
+import os.path as osp
+
+from qtpy import QtCore
+
+from labelme.annotation_index import AnnotationIndex
+from labelme.annotation_index import get_cache_file
+from labelme.logger import logger
+
+
+class FileSummaryLoader(QtCore.QThread):
+    """Loads the FileSummary of the label files in a directory.
+
+    The summaries in the cached annotation index are reported first, and
+    again after the index has been updated with the changed label files.
+    """
+
+    loaded = QtCore.Signal(str, object)  # label_dir, {abspath: FileSummary}
+
+    def __init__(self, label_dir, parent=None):
+        super(FileSummaryLoader, self).__init__(parent)
+        self.label_dir = label_dir
+
+    def run(self):
+        filename = get_cache_file(self.label_dir)
+        try:
+            os.makedirs(osp.dirname(filename), exist_ok=True)
+            with AnnotationIndex(filename) as index:
+                summaries = index.summaries()
+                if summaries:
+                    self.loaded.emit(self.label_dir, summaries)
+                # no worker processes, which should not be forked from here
+                changed, removed = index.update(
+                    self.label_dir,
+                    workers=0,
+                    interrupted=self.isInterruptionRequested,
+                )
+                if self.isInterruptionRequested():
+                    return
+                if changed or removed or not summaries:
+                    self.loaded.emit(self.label_dir, index.summaries())
+        except Exception as e:
+            logger.warning("Failed to index {}: {}".format(self.label_dir, e))
+
+    def stop(self):
+        self.requestInterruption()
+        self.wait()
@@ -0,0 +1,124 @@
+import threading
+
+from qtpy import QtCore
+from qtpy import QtGui
+
+from labelme.logger import logger
+
+
+def read_image_preview(filename, size):
+    """Read a JPEG image at a reduced resolution that still fills size.
+
+    libjpeg decodes at 1/2, 1/4 or 1/8 of the resolution several times
+    faster than at full resolution. The image is transformed by its EXIF
+    orientation. Returns the image and the size of the full resolution
+    image, or None if the image is not a JPEG or is not large enough to
+    be reduced.
+    """
+    reader = QtGui.QImageReader(filename)
+    if bytes(reader.format()) not in [b"jpeg", b"jpg"]:
+        return None
+    reader.setAutoTransform(True)
+    stored_size = reader.size()
+    if not stored_size.isValid():
+        return None
+    image_size = stored_size
+    if reader.transformation() & QtGui.QImageIOHandler.TransformationRotate90:
+        image_size = stored_size.transposed()
+    scale = min(
+        size.width() / image_size.width(),
+        size.height() / image_size.height(),
+    )
+    denominator = 1
+    while denominator < 8 and scale * denominator * 2 <= 1:
+        denominator *= 2
+    if denominator == 1:
+        return None
+    # scaled in the orientation in which the image is stored
+    reader.setScaledSize(
+        QtCore.QSize(
+            stored_size.width() // denominator,
+            stored_size.height() // denominator,
+        )
+    )
+    image = reader.read()
+    if image.isNull():
+        return None
+    return image, image_size
+
+
+class ImageLoader(QtCore.QObject):
+    """Loads the full resolution image in a background thread.
+
+    Only the last requested image is loaded, as the earlier ones have
+    already been replaced on the canvas.
+    """
+
+    loaded = QtCore.Signal(str, object, object)  # filename, imageData, image
+    _loaded = QtCore.Signal(str, object, object)
+
+    def __init__(self, parent=None):
+        super(ImageLoader, self).__init__(parent)
+        self._request = None  # (filename, load)
+        self._loading = None
+        self._result = None  # (filename, imageData, image)
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._loaded.connect(self.loaded)
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def request(self, filename, load):
+        """Request an image, whose imageData is returned by load()."""
+        with self._condition:
+            self._request = (filename, load)
+            self._result = None
+            self._condition.notify_all()
+
+    def wait(self, filename):
+        """Wait for a requested image and return its imageData and image.
+
+        None is returned if the image has not been requested.
+        """
+        with self._condition:
+            while self._result is None or self._result[0] != filename:
+                if filename not in [
+                    self._loading,
+                    self._request and self._request[0],
+                ]:
+                    return None
+                self._condition.wait()
+            return self._result[1:]
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._request = None
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._request is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                (filename, load), self._request = self._request, None
+                self._loading = filename
+            try:
+                imageData = load()
+                image = QtGui.QImage.fromData(imageData)
+            except Exception as e:
+                logger.error("Failed to load {}: {}".format(filename, e))
+                imageData, image = None, QtGui.QImage()
+            with self._condition:
+                self._loading = None
+                if self._stopped:
+                    return
+                if self._request is None:
+                    self._result = (filename, imageData, image)
+                self._condition.notify_all()
+                # queued to the thread of the loader
+                self._loaded.emit(filename, imageData, image)
@@ -0,0 +1,52 @@
+import hashlib
+import io
+import mmap
+import os
+import os.path as osp
+
+
+class ImageStore(object):
+    """Directory of image files named after the SHA-256 of their content.
+
+    Label files refer to images in the store instead of embedding them as
+    base64, so identical images (e.g., in versioned copies of a label file)
+    are stored once. The reference written to the label file contains the
+    relative path of the image file, so reading it does not need the store.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, digest):
+        return osp.join(self.root, digest[:2], digest)
+
+    def put(self, data):
+        """Add image data to the store and return its reference."""
+        digest = hashlib.sha256(data).hexdigest()
+        filename = self.path(digest)
+        if not osp.exists(filename):
+            os.makedirs(osp.dirname(filename), exist_ok=True)
+            tmp_filename = "{}.{}.tmp".format(filename, os.getpid())
+            with io.open(tmp_filename, "wb") as f:
+                f.write(data)
+            os.replace(tmp_filename, filename)
+        return dict(path=filename, sha256=digest, size=len(data))
+
+    @staticmethod
+    def read(filename, size=None):
+        """Return the content of an image file as a read-only memory map."""
+        with io.open(filename, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # an empty file cannot be memory-mapped
+                raise ValueError(
+                    "Image in store is empty: {}".format(filename)
+                )
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if size is not None and len(data) != size:
+            data.close()
+            raise ValueError(
+                "Image in store has unexpected size: {} (expected {})".format(
+                    filename, size
+                )
+            )
+        return data
@@ -1,15 +1,22 @@
 import base64
 import contextlib
+import copy
+import functools
 import io
-import json
+import os
 import os.path as osp
+import stat
+import threading
 
 import PIL.Image
 
+import labelme
 from labelme import __version__
+from labelme import _json
+from labelme import compact_label_file
+from labelme.image_store import ImageStore
 from labelme.logger import logger
 from labelme import PY2
-from labelme import QT4
 from labelme import utils
 
 
@@ -28,6 +35,40 @@ def open(name, mode):
     return
 
 
+@contextlib.contextmanager
+def atomic_open(name):
+    """Open a file for binary writing that replaces name only when complete.
+
+    The data is written to a temporary file next to name, which is renamed
+    over name on success, so a crash while writing never leaves a truncated
+    file behind. A symlink at name is followed, and the permissions of an
+    existing file are kept.
+    """
+    name = osp.realpath(name)
+    tmp_name = osp.join(
+        osp.dirname(name),
+        ".{}.{}.{}.tmp".format(
+            osp.basename(name), os.getpid(), threading.get_ident()
+        ),
+    )
+    try:
+        mode = stat.S_IMODE(os.stat(name).st_mode)
+    except OSError:
+        mode = None
+    try:
+        with io.open(tmp_name, "wb") as f:
+            if mode is not None:
+                os.chmod(tmp_name, mode)
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, name)
+    except BaseException:
+        if osp.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+
 class LabelFileError(Exception):
     pass
 
@@ -35,15 +76,43 @@ class LabelFileError(Exception):
 class LabelFile(object):
 
     suffix = ".json"
+    compact_suffix = compact_label_file.suffix
 
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, with_image=True):
+        # [(imageData, base64 of it, actual height, actual width)], which is
+        # shared with copies
+        self._imageDataCache = [None]
         self.shapes = []
         self.imagePath = None
         self.imageData = None
+        self.imageDataEmbedded = False
+        self.imageDataRef = None
+        self.imageHeight = None
+        self.imageWidth = None
         if filename is not None:
-            self.load(filename)
+            self.load(filename, with_image=with_image)
         self.filename = filename
 
+    @property
+    def imageData(self):
+        if self._imageDataLoader is not None:
+            loader, self._imageDataLoader = self._imageDataLoader, None
+            try:
+                (
+                    self._imageData,
+                    self.imageHeight,
+                    self.imageWidth,
+                    self._imageDataCache[0],
+                ) = loader()
+            except Exception as e:
+                raise LabelFileError(e)
+        return self._imageData
+
+    @imageData.setter
+    def imageData(self, value):
+        self._imageData = value
+        self._imageDataLoader = None
+
     @staticmethod
     def load_image_file(filename):
         try:
@@ -57,7 +126,7 @@ class LabelFile(object):
 
         with io.BytesIO() as f:
             ext = osp.splitext(filename)[1].lower()
-            if PY2 and QT4:
+            if PY2 and labelme.QT4:
                 format = "PNG"
             elif ext in [".jpg", ".jpeg"]:
                 format = "JPEG"
@@ -67,10 +136,80 @@ class LabelFile(object):
             f.seek(0)
             return f.read()
 
-    def load(self, filename):
+    @staticmethod
+    def _read_embedded_image_data(filename, imageData, imageDataRef):
+        """Return the bytes of the embedded image, or None if there is none."""
+        if imageData is None and imageDataRef is not None:
+            imageDataFile = osp.join(
+                osp.dirname(filename), imageDataRef["path"]
+            )
+            try:
+                imageData = ImageStore.read(
+                    imageDataFile, size=imageDataRef.get("size")
+                )
+            except (IOError, OSError, ValueError) as e:
+                logger.warning(
+                    "Image in store is missing or invalid, so loading from "
+                    "imagePath: {}".format(e)
+                )
+        if isinstance(imageData, compact_label_file.DeferredImageData):
+            imageData = imageData.read_bytes()
+        elif isinstance(imageData, _json.DeferredString):
+            imageData = imageData.read()
+        if isinstance(imageData, str):
+            imageData = base64.b64decode(imageData)
+        return imageData
+
+    def read_embedded_image_data(self):
+        """Return the bytes of the embedded image without validating them.
+
+        Unlike imageData, the image is neither decoded nor re-encoded, which
+        is enough for consumers that copy the image through. None is
+        returned if the image is not embedded.
+        """
+        if self._imageDataLoader is None:
+            return self._imageData if self.imageDataEmbedded else None
+        return self._read_embedded_image_data(
+            self.filename, self._embeddedImageData, self.imageDataRef
+        )
+
+    @classmethod
+    def _load_image_data(
+        cls,
+        filename,
+        imageData,
+        imagePath,
+        imageHeight,
+        imageWidth,
+        imageDataRef=None,
+    ):
+        imageData = cls._read_embedded_image_data(
+            filename, imageData, imageDataRef
+        )
+        if PY2 and labelme.QT4 and imageData is not None:
+            imageData = utils.img_data_to_png_data(imageData)
+        if imageData is None:
+            # relative path from label file to relative path from cwd
+            imagePath = osp.join(osp.dirname(filename), imagePath)
+            imageData = cls.load_image_file(imagePath)
+        imageDataCache = (imageData,) + cls._encode_image_data(imageData)
+        imageHeight, imageWidth = cls._check_image_height_and_width(
+            imageHeight, imageWidth, *imageDataCache[2:]
+        )
+        return imageData, imageHeight, imageWidth, imageDataCache
+
+    def load(self, filename, with_image=True):
+        """Load a label file.
+
+        If with_image is False, the image is neither read nor validated
+        until imageData is accessed, which is enough for consumers that only
+        need shapes and flags. Embedded imageData is then skipped while
+        parsing and read from the file on access.
+        """
         keys = [
             "version",
             "imageData",
+            "imageDataRef",  # image in an ImageStore
             "imagePath",
             "shapes",  # polygonal annotations
             "flags",  # image level flags
@@ -86,8 +225,13 @@ class LabelFile(object):
             "description",
         ]
         try:
-            with open(filename, "r") as f:
-                data = json.load(f)
+            if compact_label_file.is_compact_file(filename):
+                # the image is read as raw bytes rather than base64
+                data = compact_label_file.load(filename, with_image_data=False)
+            else:
+                data = _json.load(
+                    filename, defer_key=None if with_image else "imageData"
+                )
             version = data.get("version")
             if version is None:
                 logger.warning(
@@ -104,21 +248,27 @@ class LabelFile(object):
                     )
                 )
 
-            if data["imageData"] is not None:
-                imageData = base64.b64decode(data["imageData"])
-                if PY2 and QT4:
-                    imageData = utils.img_data_to_png_data(imageData)
-            else:
-                # relative path from label file to relative path from cwd
-                imagePath = osp.join(osp.dirname(filename), data["imagePath"])
-                imageData = self.load_image_file(imagePath)
-            flags = data.get("flags") or {}
             imagePath = data["imagePath"]
-            self._check_image_height_and_width(
-                base64.b64encode(imageData).decode("utf-8"),
+            imageDataLoader = functools.partial(
+                self._load_image_data,
+                filename,
+                data["imageData"],
+                imagePath,
                 data.get("imageHeight"),
                 data.get("imageWidth"),
+                data.get("imageDataRef"),
             )
+            if with_image:
+                (
+                    imageData,
+                    imageHeight,
+                    imageWidth,
+                    imageDataCache,
+                ) = imageDataLoader()
+            else:
+                imageHeight = data.get("imageHeight")
+                imageWidth = data.get("imageWidth")
+            flags = data.get("flags") or {}
             shapes = [
                 dict(
                     label=s["label"],
@@ -145,25 +295,82 @@ class LabelFile(object):
         self.flags = flags
         self.shapes = shapes
         self.imagePath = imagePath
-        self.imageData = imageData
+        if with_image:
+            self.imageData = imageData
+            self._imageDataCache[0] = imageDataCache
+        else:
+            self.imageData = None
+            self._imageDataLoader = imageDataLoader
+            self._embeddedImageData = data["imageData"]
+        self.imageDataRef = data.get("imageDataRef")
+        self.imageDataEmbedded = (
+            data["imageData"] is not None or self.imageDataRef is not None
+        )
+        self.imageHeight = imageHeight
+        self.imageWidth = imageWidth
         self.filename = filename
         self.otherData = otherData
 
     @staticmethod
-    def _check_image_height_and_width(imageData, imageHeight, imageWidth):
-        img_arr = utils.img_b64_to_arr(imageData)
-        if imageHeight is not None and img_arr.shape[0] != imageHeight:
+    def _encode_image_data(imageData):
+        """Return imageData in base64 and the size of the image it holds."""
+        imageDataB64 = base64.b64encode(imageData).decode("utf-8")
+        img_arr = utils.img_b64_to_arr(imageDataB64)
+        return imageDataB64, img_arr.shape[0], img_arr.shape[1]
+
+    def _encode_image_data_cached(self, imageData):
+        """Same as _encode_image_data, but reuses the last result.
+
+        As the image rarely changes between loading and saving or between
+        successive saves, this makes saving with imageData cost as much as
+        saving without it.
+        """
+        cache = self._imageDataCache[0]
+        if cache is None or not (
+            cache[0] is imageData or cache[0] == imageData
+        ):
+            cache = (imageData,) + self._encode_image_data(imageData)
+            self._imageDataCache[0] = cache
+        return cache[1:]
+
+    def _image_size_cached(self, imageData):
+        """Return the height and width of the image held by imageData.
+
+        Unlike _encode_image_data_cached, the image is neither encoded in
+        base64 nor decoded if it is not cached, as only its header is read.
+        """
+        cache = self._imageDataCache[0]
+        if cache is not None and (
+            cache[0] is imageData or cache[0] == imageData
+        ):
+            return cache[2:]
+        width, height = PIL.Image.open(io.BytesIO(imageData)).size
+        return height, width
+
+    def copy(self):
+        """Return a shallow copy that shares the cache of encoded imageData.
+
+        Saving modifies a LabelFile, so a copy is saved in another thread
+        while the original is in use.
+        """
+        return copy.copy(self)
+
+    @staticmethod
+    def _check_image_height_and_width(
+        imageHeight, imageWidth, actualHeight, actualWidth
+    ):
+        if imageHeight is not None and actualHeight != imageHeight:
             logger.error(
                 "imageHeight does not match with imageData or imagePath, "
                 "so getting imageHeight from actual image."
             )
-            imageHeight = img_arr.shape[0]
-        if imageWidth is not None and img_arr.shape[1] != imageWidth:
+            imageHeight = actualHeight
+        if imageWidth is not None and actualWidth != imageWidth:
             logger.error(
                 "imageWidth does not match with imageData or imagePath, "
                 "so getting imageWidth from actual image."
             )
-            imageWidth = img_arr.shape[1]
+            imageWidth = actualWidth
         return imageHeight, imageWidth
 
     def save(
@@ -176,11 +383,37 @@ class LabelFile(object):
         imageData=None,
         otherData=None,
         flags=None,
+        imageStore=None,
     ):
+        """Save a label file.
+
+        If imageStore (an ImageStore or its root directory) is given,
+        imageData is added to it and referred to by imageDataRef instead of
+        being embedded.
+        """
+        imageDataRef = None
+        if imageData is not None and imageStore is not None:
+            if not isinstance(imageStore, ImageStore):
+                imageStore = ImageStore(imageStore)
+            imageDataRef = imageStore.put(imageData)
+            imageDataRef["path"] = osp.relpath(
+                imageDataRef["path"], osp.dirname(osp.abspath(filename))
+            )
         if imageData is not None:
-            imageData = base64.b64encode(imageData).decode("utf-8")
+            if imageDataRef is not None:
+                actualHeight, actualWidth = self._image_size_cached(imageData)
+                imageData = None
+            elif compact_label_file.is_compact_file(filename):
+                # stored as raw bytes
+                actualHeight, actualWidth = self._image_size_cached(imageData)
+            else:
+                (
+                    imageData,
+                    actualHeight,
+                    actualWidth,
+                ) = self._encode_image_data_cached(imageData)
             imageHeight, imageWidth = self._check_image_height_and_width(
-                imageData, imageHeight, imageWidth
+                imageHeight, imageWidth, actualHeight, actualWidth
             )
         if otherData is None:
             otherData = {}
@@ -195,16 +428,23 @@ class LabelFile(object):
             imageHeight=imageHeight,
             imageWidth=imageWidth,
         )
+        if imageDataRef is not None:
+            data["imageDataRef"] = imageDataRef
         for key, value in otherData.items():
             assert key not in data
             data[key] = value
         try:
-            with open(filename, "w") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with atomic_open(filename) as f:
+                if compact_label_file.is_compact_file(filename):
+                    compact_label_file.save(f, data)
+                else:
+                    f.write(_json.dumps(data))
             self.filename = filename
         except Exception as e:
             raise LabelFileError(e)
 
     @staticmethod
     def is_label_file(filename):
+        if compact_label_file.is_compact_file(filename):
+            return True
         return osp.splitext(filename)[1].lower() == LabelFile.suffix
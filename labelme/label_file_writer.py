@@ -0,0 +1,123 @@
+import collections
+import os.path as osp
+import threading
+
+from qtpy import QtCore
+
+from labelme.logger import logger
+
+
+class LabelFileWriter(QtCore.QThread):
+    """Saves label files one at a time off the UI thread.
+
+    Saves of a file that is still waiting in the queue are coalesced, so
+    only its latest content is written. The result of each write is
+    reported with the saved and failed signals. A failed save is kept until
+    it is retried, superseded by a new save of the file or discarded, so
+    that its annotations are not lost when the application has moved on to
+    another file. The thread only runs while there are queued saves.
+    """
+
+    saved = QtCore.Signal(str)
+    failed = QtCore.Signal(str, str)
+
+    def __init__(self, parent=None):
+        super(LabelFileWriter, self).__init__(parent)
+        self._condition = threading.Condition()
+        # abspath -> (label_file, filename, kwargs)
+        self._pending = collections.OrderedDict()
+        # abspath -> ((label_file, filename, kwargs), message)
+        self._failed = {}
+        self._writing = None
+        self._active = False  # whether run() is consuming the queue
+
+    def save(self, label_file, filename, **kwargs):
+        """Queue label_file.save(filename, **kwargs)."""
+        self._enqueue(osp.abspath(filename), (label_file, filename, kwargs))
+
+    def _enqueue(self, key, save):
+        with self._condition:
+            if key in self._pending:
+                logger.debug("Coalescing saves of {}".format(save[1]))
+                del self._pending[key]
+            self._failed.pop(key, None)
+            self._pending[key] = save
+            if self._active:
+                return
+            self._active = True
+        self.wait()  # for the previous run() to return
+        self.start()
+
+    def isFailed(self, filename):
+        with self._condition:
+            return osp.abspath(filename) in self._failed
+
+    def failures(self):
+        """Return the filenames and error messages of the failed saves."""
+        with self._condition:
+            return [
+                (save[1], message) for save, message in self._failed.values()
+            ]
+
+    def retry(self, filename):
+        """Queue the failed save of filename again."""
+        key = osp.abspath(filename)
+        with self._condition:
+            failure = self._failed.pop(key, None)
+        if failure is not None:
+            self._enqueue(key, failure[0])
+
+    def discard(self, filename):
+        """Forget the failed save of filename."""
+        with self._condition:
+            self._failed.pop(osp.abspath(filename), None)
+
+    def _isPending(self, filename):
+        if filename is None:
+            return bool(self._pending) or self._writing is not None
+        key = osp.abspath(filename)
+        return key in self._pending or self._writing == key
+
+    def isPending(self, filename=None):
+        with self._condition:
+            return self._isPending(filename)
+
+    def flush(self, filename=None):
+        """Block until the queued saves (of filename) have been written."""
+        with self._condition:
+            while self._isPending(filename):
+                self._condition.wait()
+
+    def stop(self):
+        """Write the queued saves and wait for the thread to finish."""
+        self.flush()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self._condition:
+                if not self._pending:
+                    self._active = False
+                    return
+                key, (label_file, filename, kwargs) = self._pending.popitem(
+                    last=False
+                )
+                self._writing = key
+
+            try:
+                label_file.save(filename, **kwargs)
+            except Exception as e:
+                logger.error("Failed saving {}: {}".format(filename, e))
+                with self._condition:
+                    if key not in self._pending:  # unless superseded
+                        self._failed[key] = (
+                            (label_file, filename, kwargs),
+                            str(e),
+                        )
+                self.failed.emit(filename, str(e))
+            else:
+                self.saved.emit(filename)
+            finally:
+                with self._condition:
+                    self._writing = None
+                    self._condition.notify_all()
@@ -0,0 +1,156 @@
+import bisect
+import collections
+
+
+def _trigrams(text, pad=True):
+    if pad:
+        text = "  {} ".format(text)
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class LabelVocabulary(object):
+    """Labels indexed for ranked completion.
+
+    Matches are ranked as exact, prefix, substring (earlier and shorter
+    first) and, with fuzzy=True, trigram similarity to tolerate typos.
+    Prefixes are looked up by bisection and substrings by intersecting the
+    trigram postings, so a match does not scan the whole vocabulary. Both
+    indices are built on the first match that needs them.
+    """
+
+    def __init__(self, labels=None, fuzzy_threshold=0.3):
+        self.fuzzy_threshold = fuzzy_threshold
+        self._labels = []  # id -> label
+        self._keys = []  # id -> lowercase label
+        self._ids = {}  # label -> id
+        self._sorted = None  # (key, id) sorted for prefix search
+        self._num_trigrams = None  # id -> number of trigrams
+        self._postings = None  # trigram -> ids
+        if labels:
+            self.update(labels)
+
+    def __len__(self):
+        return len(self._labels)
+
+    def __iter__(self):
+        return iter(self._labels)
+
+    def __contains__(self, label):
+        return label in self._ids
+
+    def add(self, label):
+        """Add the label and return whether it was new."""
+        if label in self._ids:
+            return False
+        label_id = len(self._labels)
+        key = label.lower()
+        self._labels.append(label)
+        self._keys.append(key)
+        self._ids[label] = label_id
+        if self._sorted is not None:
+            bisect.insort(self._sorted, (key, label_id))
+        if self._postings is not None:
+            self._index_trigrams(label_id)
+        return True
+
+    def update(self, labels):
+        return [label for label in labels if self.add(label)]
+
+    def _index_trigrams(self, label_id):
+        trigrams = _trigrams(self._keys[label_id])
+        self._num_trigrams.append(len(trigrams))
+        for trigram in trigrams:
+            self._postings[trigram].add(label_id)
+
+    def _get_sorted(self):
+        if self._sorted is None:
+            self._sorted = sorted(zip(self._keys, range(len(self._keys))))
+        return self._sorted
+
+    def _get_postings(self):
+        if self._postings is None:
+            self._num_trigrams = []
+            self._postings = collections.defaultdict(set)
+            for label_id in range(len(self._labels)):
+                self._index_trigrams(label_id)
+        return self._postings
+
+    def build(self):
+        """Build the indices now instead of on the first match."""
+        self._get_sorted()
+        self._get_postings()
+
+    def find(self, text):
+        """Return the labels equal to text ignoring case."""
+        key = text.lower()
+        sorted_ = self._get_sorted()
+        i = bisect.bisect_left(sorted_, (key, -1))
+        labels = []
+        while i < len(sorted_) and sorted_[i][0] == key:
+            labels.append(self._labels[sorted_[i][1]])
+            i += 1
+        return labels
+
+    def _prefix_ids(self, key, limit):
+        sorted_ = self._get_sorted()
+        i = bisect.bisect_left(sorted_, (key, -1))
+        ids = []
+        while i < len(sorted_) and len(ids) < limit:
+            prefix_key, label_id = sorted_[i]
+            if not prefix_key.startswith(key):
+                break
+            ids.append(label_id)
+            i += 1
+        return ids
+
+    def _substring_ids(self, key):
+        if len(key) < 3:
+            return [i for i, k in enumerate(self._keys) if key in k]
+        postings = self._get_postings()
+        postings = sorted(
+            (
+                postings.get(trigram, set())
+                for trigram in _trigrams(key, pad=False)
+            ),
+            key=len,
+        )
+        candidates = postings[0].intersection(*postings[1:])
+        return [i for i in candidates if key in self._keys[i]]
+
+    def _fuzzy_ids(self, key):
+        postings = self._get_postings()
+        trigrams = _trigrams(key)
+        counts = collections.Counter()
+        for trigram in trigrams:
+            counts.update(postings.get(trigram, ()))
+        scores = []
+        for label_id, count in counts.items():
+            similarity = count / float(
+                len(trigrams) + self._num_trigrams[label_id] - count
+            )
+            if similarity >= self.fuzzy_threshold:
+                scores.append((-similarity, self._keys[label_id], label_id))
+        return [label_id for _, _, label_id in sorted(scores)]
+
+    def match(self, text, limit=100, fuzzy=False):
+        """Return up to limit labels matching text, best first."""
+        key = text.lower()
+        if not key:
+            return [self._labels[i] for _, i in self._get_sorted()[:limit]]
+
+        ids = self._prefix_ids(key, limit)
+        seen = set(ids)
+        if len(ids) < limit:
+            substring_ids = sorted(
+                (i for i in self._substring_ids(key) if i not in seen),
+                key=lambda i: (
+                    self._keys[i].find(key),
+                    len(self._keys[i]),
+                    self._keys[i],
+                ),
+            )
+            ids.extend(substring_ids[: limit - len(ids)])
+            seen.update(substring_ids)
+        if fuzzy and len(ids) < limit:
+            ids.extend(i for i in self._fuzzy_ids(key) if i not in seen)
+        return [self._labels[i] for i in ids[:limit]]
@@ -1,11 +1,12 @@
 import copy
 import math
 
+import numpy as np
 from qtpy import QtCore
 from qtpy import QtGui
 
+from labelme import annotation
 from labelme.logger import logger
-import labelme.utils
 
 
 # TODO(unknown):
@@ -89,17 +90,46 @@ class Shape(object):
     def shape_type(self, value):
         if value is None:
             value = "polygon"
-        if value not in [
-            "polygon",
-            "rectangle",
-            "point",
-            "line",
-            "circle",
-            "linestrip",
-        ]:
+        if value not in annotation.SHAPE_TYPES:
             raise ValueError("Unexpected shape_type: {}".format(value))
         self._shape_type = value
 
+    @classmethod
+    def fromData(cls, data):
+        """Create a closed shape from an annotation.ShapeData."""
+        shape = cls(
+            label=data.label,
+            shape_type=data.shape_type,
+            group_id=data.group_id,
+            flags=dict(data.flags),
+            description=data.description,
+        )
+        shape.other_data = dict(data.other_data)
+        for x, y in data.points.tolist():
+            shape.addPoint(QtCore.QPointF(x, y))
+        shape.close()
+        return shape
+
+    def toData(self):
+        """Return an annotation.ShapeData that does not share the flags.
+
+        The data may be saved in another thread while the shape is edited.
+        """
+        return annotation.ShapeData(
+            points=self.pointsArray(),
+            label=self.label,
+            shape_type=self.shape_type,
+            group_id=self.group_id,
+            flags=dict(self.flags or {}),
+            description=self.description,
+            other_data=dict(self.other_data),
+        )
+
+    def pointsArray(self):
+        return np.array(
+            [(p.x(), p.y()) for p in self.points], dtype=np.float64
+        ).reshape(-1, 2)
+
     def close(self):
         self._closed = True
 
@@ -232,25 +262,14 @@ class Shape(object):
             assert False, "unsupported vertex shape"
 
     def nearestVertex(self, point, epsilon):
-        min_distance = float("inf")
-        min_i = None
-        for i, p in enumerate(self.points):
-            dist = labelme.utils.distance(p - point)
-            if dist <= epsilon and dist < min_distance:
-                min_distance = dist
-                min_i = i
-        return min_i
+        return annotation.nearest_vertex(
+            self.pointsArray(), (point.x(), point.y()), epsilon
+        )
 
     def nearestEdge(self, point, epsilon):
-        min_distance = float("inf")
-        post_i = None
-        for i in range(len(self.points)):
-            line = [self.points[i - 1], self.points[i]]
-            dist = labelme.utils.distancetoline(point, line)
-            if dist <= epsilon and dist < min_distance:
-                min_distance = dist
-                post_i = i
-        return post_i
+        return annotation.nearest_edge(
+            self.pointsArray(), (point.x(), point.y()), epsilon
+        )
 
     def containsPoint(self, point):
         return self.makePath().contains(point)
@@ -0,0 +1,64 @@
+import contextlib
+import importlib
+import sys
+import time
+
+
+# heavy dependencies imported one by one so that the time of each is shown
+# separately from the modules of labelme that import them
+PROFILED_IMPORTS = [
+    "qtpy.QtWidgets",
+    "numpy",
+    "PIL.Image",
+    "labelme.label_file",
+    "labelme.widgets",
+    "labelme.app",
+]
+
+
+class StartupProfiler(object):
+    """Record the time of the startup steps and print them as a table."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._t_start = time.time()
+        self._records = []  # (name, elapsed)
+
+    def add(self, name, elapsed):
+        if self.enabled:
+            self._records.append((name, elapsed))
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        t_start = time.time()
+        try:
+            yield
+        finally:
+            self.add(name, time.time() - t_start)
+
+    def import_modules(self, modules=None):
+        if not self.enabled:
+            return
+        for module in PROFILED_IMPORTS if modules is None else modules:
+            with self.measure("import {}".format(module)):
+                importlib.import_module(module)
+
+    def report(self, f=sys.stderr):
+        if not self.enabled:
+            return
+        print("{:<40} {:>10} {:>10}".format("step", "ms", "total ms"), file=f)
+        total = 0
+        for name, elapsed in self._records:
+            total += elapsed
+            print(
+                "{:<40} {:>10.1f} {:>10.1f}".format(
+                    name, elapsed * 1000, total * 1000
+                ),
+                file=f,
+            )
+        print(
+            "{:<40} {:>10} {:>10.1f}".format(
+                "wall time", "", (time.time() - self._t_start) * 1000
+            ),
+            file=f,
+        )
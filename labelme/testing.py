@@ -1,10 +1,28 @@
+import base64
+import io
 import json
+import multiprocessing
 import os.path as osp
 
-import imgviz
+import numpy as np
+import PIL.Image
+
+from labelme import _json
+from labelme import compact_label_file
 import labelme.utils
 
 
+# shape_type -> (min, max) number of points, where None is no limit
+SHAPE_NUM_POINTS = {
+    "polygon": (3, None),
+    "rectangle": (2, 2),
+    "point": (1, 1),
+    "line": (2, 2),
+    "circle": (2, 2),
+    "linestrip": (2, None),
+}
+
+
 def assert_labelfile_sanity(filename):
     assert osp.exists(filename)
 
@@ -16,6 +34,8 @@ def assert_labelfile_sanity(filename):
         parent_dir = osp.dirname(filename)
         img_file = osp.join(parent_dir, data["imagePath"])
         assert osp.exists(img_file)
+        import imgviz  # deferred as it is slow to import
+
         img = imgviz.io.imread(img_file)
     else:
         img = labelme.utils.img_b64_to_arr(imageData)
@@ -31,3 +51,189 @@ def assert_labelfile_sanity(filename):
         for x, y in shape["points"]:
             assert 0 <= x <= W
             assert 0 <= y <= H
+
+
+def get_image_size(fileobj):
+    """Return (height, width) of an image as loaded, from its header only.
+
+    The size is after applying the EXIF orientation, as labelme does when
+    loading the image.
+    """
+    with PIL.Image.open(fileobj) as image:
+        width, height = image.size
+        try:
+            orientation = image.getexif().get(0x0112)
+        except Exception:
+            orientation = None
+    if orientation in [5, 6, 7, 8]:  # rotated by 90 or 270 degrees
+        height, width = width, height
+    return height, width
+
+
+def _read_image_size(filename, data):
+    imageData = data.get("imageData")
+    if isinstance(imageData, compact_label_file.DeferredImageData):
+        return get_image_size(io.BytesIO(imageData.read_bytes()))
+    if isinstance(imageData, _json.DeferredString):
+        imageData = imageData.read()
+    if imageData is not None:
+        return get_image_size(io.BytesIO(base64.b64decode(imageData)))
+    if data.get("imageDataRef") is not None:
+        img_file = osp.join(
+            osp.dirname(filename), data["imageDataRef"]["path"]
+        )
+    else:
+        img_file = osp.join(osp.dirname(filename), data["imagePath"])
+    return get_image_size(img_file)
+
+
+def validate_labelfile(filename):
+    """Check a label file as assert_labelfile_sanity, and return the errors.
+
+    Unlike assert_labelfile_sanity, the image size is read from the header
+    of the image without decoding it, the number of points of each shape is
+    checked against its shape_type, and all the problems found are returned
+    as dicts of filename, shape (index, or None for the file), code and
+    message.
+    """
+    errors = []
+
+    def error(code, message, shape=None):
+        errors.append(
+            dict(filename=filename, shape=shape, code=code, message=message)
+        )
+
+    try:
+        if compact_label_file.is_compact_file(filename):
+            data = compact_label_file.load(filename, with_image_data=False)
+        else:
+            data = _json.load(filename, defer_key="imageData")
+    except Exception as e:
+        error("read_error", str(e))
+        return errors
+
+    if not isinstance(data, dict):
+        error("read_error", "not a JSON object")
+        return errors
+    missing = [
+        key
+        for key in ["imagePath", "imageHeight", "imageWidth", "shapes"]
+        if key not in data
+    ]
+    if missing:
+        error("missing_key", "missing keys: {}".format(", ".join(missing)))
+        return errors
+    if not isinstance(data["shapes"], list):
+        error("invalid_shapes", "shapes is not a list")
+        return errors
+
+    try:
+        height, width = _read_image_size(filename, data)
+    except Exception as e:
+        error("image_error", str(e))
+        height, width = data["imageHeight"], data["imageWidth"]
+    else:
+        if (height, width) != (data["imageHeight"], data["imageWidth"]):
+            error(
+                "image_size_mismatch",
+                "imageHeight, imageWidth = {}, {}, but image is {}x{}".format(
+                    data["imageHeight"], data["imageWidth"], height, width
+                ),
+            )
+
+    points = []
+    offsets = [0]
+    for i, shape in enumerate(data["shapes"]):
+        if not isinstance(shape, dict):
+            error("invalid_shape", "shape is not an object", shape=i)
+            offsets.append(offsets[-1])
+            continue
+        missing = [key for key in ["label", "points"] if key not in shape]
+        if missing:
+            error(
+                "missing_key",
+                "missing keys: {}".format(", ".join(missing)),
+                shape=i,
+            )
+            offsets.append(offsets[-1])
+            continue
+
+        shape_points = shape["points"]
+        if not isinstance(shape_points, list) or not all(
+            isinstance(point, (list, tuple)) and len(point) == 2
+            for point in shape_points
+        ):
+            error("invalid_points", "points are not pairs of x, y", shape=i)
+            offsets.append(offsets[-1])
+            continue
+        points.extend(shape_points)
+        offsets.append(len(points))
+
+        shape_type = shape.get("shape_type") or "polygon"
+        if shape_type not in SHAPE_NUM_POINTS:
+            error(
+                "unknown_shape_type",
+                "unknown shape_type: {}".format(shape_type),
+                shape=i,
+            )
+            continue
+        min_points, max_points = SHAPE_NUM_POINTS[shape_type]
+        if len(shape_points) < min_points or (
+            max_points is not None and len(shape_points) > max_points
+        ):
+            error(
+                "num_points",
+                "{} points for shape_type {}".format(
+                    len(shape_points), shape_type
+                ),
+                shape=i,
+            )
+
+    try:
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+    except (TypeError, ValueError) as e:
+        error("invalid_points", str(e))
+        return errors
+    if height is None or width is None:
+        return errors
+    # NaN compares false, so is also out of bounds
+    in_bounds = (
+        (points[:, 0] >= 0)
+        & (points[:, 0] <= width)
+        & (points[:, 1] >= 0)
+        & (points[:, 1] <= height)
+    )
+    out_of_bounds = np.flatnonzero(~in_bounds)
+    if out_of_bounds.size:
+        shape_ids = np.searchsorted(offsets, out_of_bounds, side="right") - 1
+        shape_ids, counts = np.unique(shape_ids, return_counts=True)
+        for i, count in zip(shape_ids.tolist(), counts.tolist()):
+            error(
+                "point_out_of_bounds",
+                "{} points outside the image of {}x{}".format(
+                    count, height, width
+                ),
+                shape=i,
+            )
+    return errors
+
+
+def _validate_labelfile(filename):
+    return filename, validate_labelfile(filename)
+
+
+def validate_labelfiles(filenames, workers=None, chunksize=64):
+    """Validate label files in worker processes.
+
+    Yields (filename, errors) in the order of completion. workers=0 runs in
+    the current process.
+    """
+    if workers == 0 or len(filenames) < 2 * chunksize:
+        for filename in filenames:
+            yield _validate_labelfile(filename)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        for result in pool.imap_unordered(
+            _validate_labelfile, filenames, chunksize=chunksize
+        ):
+            yield result
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import os.path as osp
+
+import PIL.Image
+
+from labelme.label_file import atomic_open
+from labelme.logger import logger
+from labelme import utils
+
+
+THUMBNAIL_SIZE = 256
+
+
+def get_cache_dir():
+    """Return the default directory of the thumbnail cache."""
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or osp.join(
+        osp.expanduser("~"), ".cache"
+    )
+    return osp.join(cache_dir, "labelme", "thumbnails")
+
+
+class ThumbnailCache(object):
+    """Thumbnails of image files stored on disk.
+
+    A thumbnail is found by the path, modification time and size of its
+    image, so it is created again when the image changes. JPEG images are
+    decoded at a reduced size, which is several times faster than decoding
+    them fully, and thumbnails are saved as JPEG, which is much faster to
+    encode than PNG.
+    """
+
+    def __init__(self, cache_dir=None, size=THUMBNAIL_SIZE):
+        if cache_dir is None:
+            cache_dir = get_cache_dir()
+        self.cache_dir = cache_dir
+        self.size = size
+
+    def get_file(self, filename):
+        """Return the path of the thumbnail of an image, which may not exist.
+
+        None is returned if the image does not exist.
+        """
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        key = hashlib.sha1(
+            "{}\0{}\0{}\0{}".format(
+                osp.abspath(filename),
+                stat.st_mtime_ns,
+                stat.st_size,
+                self.size,
+            ).encode("utf-8", "surrogateescape")
+        ).hexdigest()
+        return osp.join(self.cache_dir, key[:2], key + ".jpg")
+
+    def get(self, filename):
+        """Return the thumbnail file of an image if it is in the cache."""
+        thumbnail_file = self.get_file(filename)
+        if thumbnail_file is not None and osp.exists(thumbnail_file):
+            return thumbnail_file
+        return None
+
+    def create(self, filename):
+        """Return the thumbnail file of an image, creating it if needed.
+
+        None is returned if the file is not a readable image.
+        """
+        thumbnail_file = self.get_file(filename)
+        if thumbnail_file is None:
+            return None
+        if osp.exists(thumbnail_file):
+            return thumbnail_file
+        try:
+            with PIL.Image.open(filename) as image:
+                image.draft("RGB", (self.size, self.size))
+                image = utils.apply_exif_orientation(image)
+                image.thumbnail((self.size, self.size))
+                if image.mode not in ["RGB", "L"]:
+                    # flattened onto white as JPEG has no alpha channel
+                    image = image.convert("RGBA")
+                    background = PIL.Image.new("RGB", image.size, "white")
+                    background.paste(image, mask=image.getchannel("A"))
+                    image = background
+                os.makedirs(osp.dirname(thumbnail_file), exist_ok=True)
+                with atomic_open(thumbnail_file) as f:
+                    image.save(f, format="JPEG", quality=90)
+        except Exception as e:
+            logger.debug(
+                "Failed to create thumbnail of {}: {}".format(filename, e)
+            )
+            return None
+        return thumbnail_file
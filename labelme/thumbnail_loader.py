@@ -0,0 +1,87 @@
+import collections
+import os
+import threading
+
+from qtpy import QtCore
+
+from labelme.thumbnail_cache import ThumbnailCache
+
+
+class ThumbnailLoader(QtCore.QObject):
+    """Creates the thumbnails of images in a pool of background threads.
+
+    PIL releases the GIL while decoding and resizing, so the threads run in
+    parallel. Requests are served last in, first out, so that the image the
+    user looks at is not queued behind a whole directory.
+    """
+
+    loaded = QtCore.Signal(str, str)  # filename, thumbnail file or ""
+    _created = QtCore.Signal(str, str)
+
+    def __init__(self, cache=None, workers=None, parent=None):
+        super(ThumbnailLoader, self).__init__(parent)
+        if cache is None:
+            cache = ThumbnailCache()
+        if workers is None:
+            workers = min(4, os.cpu_count() or 1)
+        self.cache = cache
+        self._queue = collections.deque()
+        self._queued = set()
+        self._processing = set()  # also emitted when done, so not queued
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._created.connect(self._onCreated)
+        self._threads = []
+        for _ in range(workers):
+            thread = threading.Thread(target=self._run)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def request(self, filenames):
+        """Request the thumbnails of images, the last one first."""
+        with self._condition:
+            for filename in filenames:
+                if filename in self._processing:
+                    continue
+                if filename in self._queued:
+                    self._queue.remove(filename)
+                self._queue.append(filename)
+                self._queued.add(filename)
+            self._condition.notify_all()
+
+    def clear(self):
+        """Drop the requests that are not being processed yet."""
+        with self._condition:
+            self._queue.clear()
+            self._queued.clear()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._queue.clear()
+            self._queued.clear()
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                filename = self._queue.pop()
+                self._queued.discard(filename)
+                self._processing.add(filename)
+            thumbnail_file = self.cache.create(filename)
+            with self._condition:
+                self._processing.discard(filename)
+                if self._stopped:
+                    return
+                # queued to the thread of the loader
+                self._created.emit(filename, thumbnail_file or "")
+
+    def _onCreated(self, filename, thumbnail_file):
+        self.loaded.emit(filename, thumbnail_file)
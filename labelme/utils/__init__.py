@@ -1,6 +1,8 @@
 # flake8: noqa
 
+from ._io import export_image
 from ._io import lblsave
+from ._io import link_or_copy
 
 from .image import apply_exif_orientation
 from .image import img_arr_to_b64
@@ -14,14 +16,29 @@ from .shape import labelme_shapes_to_label
 from .shape import masks_to_bboxes
 from .shape import polygons_to_mask
 from .shape import shape_to_mask
+from .shape import shapes_to_bboxes_and_areas
 from .shape import shapes_to_label
 
-from .qt import newIcon
-from .qt import newButton
-from .qt import newAction
-from .qt import addActions
-from .qt import labelValidator
-from .qt import struct
-from .qt import distance
-from .qt import distancetoline
-from .qt import fmtShortcut
+# The Qt helpers are imported on first access so that the other utilities
+# can be used without Qt.
+_QT_NAMES = [
+    "newIcon",
+    "newButton",
+    "newAction",
+    "addActions",
+    "labelValidator",
+    "struct",
+    "distance",
+    "distancetoline",
+    "fmtShortcut",
+]
+
+
+def __getattr__(name):
+    if name in _QT_NAMES:
+        from . import qt
+
+        return getattr(qt, name)
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name)
+    )
@@ -1,8 +1,14 @@
+import errno
+import io
+import os
 import os.path as osp
+import shutil
 
 import numpy as np
 import PIL.Image
 
+from .image import apply_exif_orientation
+
 
 def lblsave(filename, lbl):
     import imgviz
@@ -21,3 +27,94 @@ def lblsave(filename, lbl):
             "[%s] Cannot save the pixel-wise class label as PNG. "
             "Please consider using the .npy format." % filename
         )
+
+
+def _reflink(src, dst):
+    import fcntl
+
+    FICLONE = 0x40049409  # _IOW(0x94, 9, int) in linux/fs.h
+    with open(src, "rb") as f_src, open(dst, "wb") as f_dst:
+        fcntl.ioctl(f_dst.fileno(), FICLONE, f_src.fileno())
+
+
+def link_or_copy(src, dst, mode="copy"):
+    """Place src at dst without reading it if possible.
+
+    mode is one of 'hardlink', 'reflink', 'symlink' and 'copy'. Hardlinks
+    and reflinks fall back to a byte copy when the filesystem does not
+    support them (e.g., across devices).
+    """
+    if osp.lexists(dst):
+        os.remove(dst)
+    if mode == "symlink":
+        os.symlink(osp.abspath(src), dst)
+        return
+    if mode == "hardlink":
+        try:
+            # link the file itself, not a symlink pointing to it
+            os.link(osp.realpath(src), dst)
+            return
+        except OSError as e:
+            if e.errno not in [errno.EXDEV, errno.EPERM, errno.EMLINK]:
+                raise
+    elif mode == "reflink":
+        try:
+            _reflink(src, dst)
+            return
+        except (ImportError, OSError):
+            if osp.lexists(dst):
+                os.remove(dst)
+    elif mode != "copy":
+        raise ValueError("Unsupported mode: {}".format(mode))
+    shutil.copyfile(src, dst)
+
+
+def _is_jpeg_without_orientation(f):
+    try:
+        image_pil = PIL.Image.open(f)
+    except IOError:
+        return False
+    with image_pil:
+        if image_pil.format != "JPEG":
+            return False
+        # annotations are in the coordinates of the exif-oriented image
+        return apply_exif_orientation(image_pil) is image_pil
+
+
+def export_image(out_file, image_file=None, image_data=None, mode="encode"):
+    """Save the image of a label file as JPEG to out_file.
+
+    Unless mode is 'encode', JPEG input is passed through without decoding:
+    image_file is placed with :func:`link_or_copy` and image_data (e.g.,
+    embedded in the label file) is written as is. Other input is decoded and
+    re-encoded. image_data takes precedence over image_file as in LabelFile.
+    Returns the mode that was actually used.
+    """
+    if mode != "encode":
+        if image_data is not None:
+            if _is_jpeg_without_orientation(io.BytesIO(image_data)):
+                with open(out_file, "wb") as f:
+                    f.write(image_data)
+                return "copy"
+        elif _is_jpeg_without_orientation(image_file):
+            link_or_copy(image_file, out_file, mode=mode)
+            return mode
+
+    if image_data is not None:
+        image_pil = PIL.Image.open(io.BytesIO(image_data))
+    else:
+        image_pil = PIL.Image.open(image_file)
+    with image_pil:
+        if image_data is None:
+            image_pil = apply_exif_orientation(image_pil)
+        if osp.splitext(out_file)[1].lower() in [".jpg", ".jpeg"]:
+            # JPEG has neither alpha nor palette
+            if image_pil.mode in ["1", "L", "LA"]:
+                image_pil = image_pil.convert("L")
+            elif image_pil.mode != "RGB":
+                image_pil = image_pil.convert("RGB")
+        image_arr = np.asarray(image_pil)
+    if osp.lexists(out_file):
+        os.remove(out_file)
+    PIL.Image.fromarray(image_arr).save(out_file)
+    return "encode"
@@ -5,6 +5,7 @@ import numpy as np
 import PIL.Image
 import PIL.ImageDraw
 
+from labelme import annotation
 from labelme.logger import logger
 
 
@@ -48,6 +49,18 @@ def shape_to_mask(
     return mask
 
 
+def shapes_to_bboxes_and_areas(shapes):
+    """Return (xmin, ymin, xmax, ymax) and area of shapes at once.
+
+    Areas of lines and points are 0, and shapes without points get NaN.
+    """
+    return annotation.bboxes_and_areas(
+        [point for shape in shapes for point in shape["points"]],
+        [len(shape["points"]) for shape in shapes],
+        [shape.get("shape_type") for shape in shapes],
+    )
+
+
 def shapes_to_label(img_shape, shapes, label_name_to_value):
     cls = np.zeros(img_shape[:2], dtype=np.int32)
     ins = np.zeros_like(cls)
@@ -77,6 +77,9 @@ class Canvas(QtWidgets.QWidget):
         self.offsets = QtCore.QPoint(), QtCore.QPoint()
         self.scale = 1.0
         self.pixmap = QtGui.QPixmap()
+        # size of the image in the coordinates of shapes, which is larger
+        # than the pixmap when it is a reduced-resolution preview
+        self.imageSize = QtCore.QSize()
         self.visible = {}
         self._hideBackround = False
         self.hideBackround = False
@@ -523,9 +526,9 @@ class Canvas(QtWidgets.QWidget):
         self.deSelectShape()
 
     def calculateOffsets(self, point):
-        left = self.pixmap.width() - 1
+        left = self.imageSize.width() - 1
         right = 0
-        top = self.pixmap.height() - 1
+        top = self.imageSize.height() - 1
         bottom = 0
         for s in self.selectedShapes:
             rect = s.boundingRect()
@@ -560,8 +563,8 @@ class Canvas(QtWidgets.QWidget):
         o2 = pos + self.offsets[1]
         if self.outOfPixmap(o2):
             pos += QtCore.QPointF(
-                min(0, self.pixmap.width() - o2.x()),
-                min(0, self.pixmap.height() - o2.y()),
+                min(0, self.imageSize.width() - o2.x()),
+                min(0, self.imageSize.height() - o2.y()),
             )
         # XXX: The next line tracks the new position of the cursor
         # relative to the shape, but also results in making it
@@ -632,7 +635,12 @@ class Canvas(QtWidgets.QWidget):
         p.scale(self.scale, self.scale)
         p.translate(self.offsetToCenter())
 
-        p.drawPixmap(0, 0, self.pixmap)
+        if self.pixmap.size() == self.imageSize:
+            p.drawPixmap(0, 0, self.pixmap)
+        else:
+            p.drawPixmap(
+                QtCore.QRect(QtCore.QPoint(), self.imageSize), self.pixmap
+            )
 
         # draw crosshair
         if (
@@ -689,14 +697,14 @@ class Canvas(QtWidgets.QWidget):
     def offsetToCenter(self):
         s = self.scale
         area = super(Canvas, self).size()
-        w, h = self.pixmap.width() * s, self.pixmap.height() * s
+        w, h = self.imageSize.width() * s, self.imageSize.height() * s
         aw, ah = area.width(), area.height()
         x = (aw - w) / (2 * s) if aw > w else 0
         y = (ah - h) / (2 * s) if ah > h else 0
         return QtCore.QPointF(x, y)
 
     def outOfPixmap(self, p):
-        w, h = self.pixmap.width(), self.pixmap.height()
+        w, h = self.imageSize.width(), self.imageSize.height()
         return not (0 <= p.x() <= w - 1 and 0 <= p.y() <= h - 1)
 
     def finalise(self):
@@ -720,7 +728,7 @@ class Canvas(QtWidgets.QWidget):
         # Cycle through each image edge in clockwise fashion,
         # and find the one intersecting the current line segment.
         # http://paulbourke.net/geometry/lineline2d/
-        size = self.pixmap.size()
+        size = self.imageSize
         points = [
             (0, 0),
             (size.width() - 1, 0),
@@ -778,7 +786,7 @@ class Canvas(QtWidgets.QWidget):
 
     def minimumSizeHint(self):
         if self.pixmap:
-            return self.scale * self.pixmap.size()
+            return self.scale * self.imageSize
         return super(Canvas, self).minimumSizeHint()
 
     def wheelEvent(self, ev):
@@ -888,8 +896,10 @@ class Canvas(QtWidgets.QWidget):
             self.drawingPolygon.emit(False)
         self.update()
 
-    def loadPixmap(self, pixmap, clear_shapes=True):
+    def loadPixmap(self, pixmap, clear_shapes=True, size=None):
+        """Show pixmap, which is drawn scaled to size if it is given."""
         self.pixmap = pixmap
+        self.imageSize = pixmap.size() if size is None else size
         if clear_shapes:
             self.shapes = []
         self.update()
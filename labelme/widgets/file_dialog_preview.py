@@ -1,8 +1,16 @@
+import json
+import os.path as osp
+
 from qtpy import QtCore
 from qtpy import QtGui
 from qtpy import QtWidgets
 
-import json
+from labelme import _json
+from labelme.thumbnail_loader import ThumbnailLoader
+
+
+# characters of a label file shown in the preview
+MAX_PREVIEW_TEXT = 20000
 
 
 class ScrollAreaPreview(QtWidgets.QScrollArea):
@@ -33,6 +41,7 @@ class ScrollAreaPreview(QtWidgets.QScrollArea):
 
 class FileDialogPreview(QtWidgets.QFileDialog):
     def __init__(self, *args, **kwargs):
+        thumbnailLoader = kwargs.pop("thumbnailLoader", None)
         super(FileDialogPreview, self).__init__(*args, **kwargs)
         self.setOption(self.DontUseNativeDialog, True)
 
@@ -46,32 +55,61 @@ class FileDialogPreview(QtWidgets.QFileDialog):
 
         self.setFixedSize(self.width() + 300, self.height())
         self.layout().addLayout(box, 1, 3, 1, 1)
+
+        if thumbnailLoader is None:
+            thumbnailLoader = ThumbnailLoader(parent=self)
+            self.finished.connect(thumbnailLoader.stop)
+        self.thumbnailLoader = thumbnailLoader
+        self.thumbnailLoader.loaded.connect(self.thumbnailLoaded)
+        self._path = None
         self.currentChanged.connect(self.onChange)
 
     def onChange(self, path):
+        self._path = path
         if path.lower().endswith(".json"):
-            with open(path, "r") as f:
-                data = json.load(f)
-                self.labelPreview.setText(
-                    json.dumps(data, indent=4, sort_keys=False)
-                )
+            try:
+                # the image data is not read, and is shown as its size
+                data = _json.load(path, defer_key="imageData")
+                if isinstance(data.get("imageData"), _json.DeferredString):
+                    data["imageData"] = "<{} characters>".format(
+                        data["imageData"].length - 2
+                    )
+                text = json.dumps(data, indent=4, sort_keys=False)
+            except Exception as e:
+                text = str(e)
+            if len(text) > MAX_PREVIEW_TEXT:
+                text = text[:MAX_PREVIEW_TEXT] + "\n..."
+            self.labelPreview.setText(text)
             self.labelPreview.label.setAlignment(
                 QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop
             )
             self.labelPreview.setHidden(False)
-        else:
-            pixmap = QtGui.QPixmap(path)
-            if pixmap.isNull():
-                self.labelPreview.clear()
-                self.labelPreview.setHidden(True)
+        elif osp.isfile(path):
+            thumbnail_file = self.thumbnailLoader.cache.get(path)
+            if thumbnail_file:
+                self.thumbnailLoaded(path, thumbnail_file)
             else:
-                self.labelPreview.setPixmap(
-                    pixmap.scaled(
-                        self.labelPreview.width() - 30,
-                        self.labelPreview.height() - 30,
-                        QtCore.Qt.KeepAspectRatio,
-                        QtCore.Qt.SmoothTransformation,
-                    )
-                )
-                self.labelPreview.label.setAlignment(QtCore.Qt.AlignCenter)
-                self.labelPreview.setHidden(False)
+                self.labelPreview.clear()
+                self.thumbnailLoader.request([path])
+        else:
+            self.labelPreview.clear()
+            self.labelPreview.setHidden(True)
+
+    def thumbnailLoaded(self, path, thumbnail_file):
+        if path != self._path:
+            return
+        pixmap = QtGui.QPixmap(thumbnail_file)
+        if pixmap.isNull():
+            self.labelPreview.clear()
+            self.labelPreview.setHidden(True)
+            return
+        size = QtCore.QSize(
+            self.labelPreview.width() - 30, self.labelPreview.height() - 30
+        )
+        if pixmap.width() > size.width() or pixmap.height() > size.height():
+            pixmap = pixmap.scaled(
+                size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation
+            )
+        self.labelPreview.setPixmap(pixmap)
+        self.labelPreview.label.setAlignment(QtCore.Qt.AlignCenter)
+        self.labelPreview.setHidden(False)
@@ -1,3 +1,4 @@
+import bisect
 import re
 
 from qtpy import QT_VERSION
@@ -5,6 +6,7 @@ from qtpy import QtCore
 from qtpy import QtGui
 from qtpy import QtWidgets
 
+from labelme.label_vocabulary import LabelVocabulary
 from labelme.logger import logger
 import labelme.utils
 
@@ -27,6 +29,19 @@ class LabelQLineEdit(QtWidgets.QLineEdit):
             super(LabelQLineEdit, self).keyPressEvent(e)
 
 
+class _ListWidgetTexts(object):
+    """Sequence view of the item texts of a QListWidget for bisect."""
+
+    def __init__(self, list_widget):
+        self._list_widget = list_widget
+
+    def __len__(self):
+        return self._list_widget.count()
+
+    def __getitem__(self, row):
+        return self._list_widget.item(row).text()
+
+
 class LabelDialog(QtWidgets.QDialog):
     def __init__(
         self,
@@ -38,6 +53,7 @@ class LabelDialog(QtWidgets.QDialog):
         completion="startswith",
         fit_to_content=None,
         flags=None,
+        completion_limit=100,
     ):
         if fit_to_content is None:
             fit_to_content = {"row": False, "column": True}
@@ -82,11 +98,13 @@ class LabelDialog(QtWidgets.QDialog):
             self.labelList.setVerticalScrollBarPolicy(
                 QtCore.Qt.ScrollBarAlwaysOff
             )
+        self.labelList.setUniformItemSizes(True)
         self._sort_labels = sort_labels
+        self._vocabulary = LabelVocabulary()
         if labels:
-            self.labelList.addItems(labels)
+            self.labelList.addItems(self._vocabulary.update(labels))
         if self._sort_labels:
-            self.labelList.sortItems()
+            self._sortItems()
         else:
             self.labelList.setDragDropMode(
                 QtWidgets.QAbstractItemView.InternalMove
@@ -122,20 +140,78 @@ class LabelDialog(QtWidgets.QDialog):
             completer.setCompletionMode(QtWidgets.QCompleter.InlineCompletion)
             # Default settings.
             # completer.setFilterMode(QtCore.Qt.MatchStartsWith)
-        elif completion == "contains":
-            completer.setCompletionMode(QtWidgets.QCompleter.PopupCompletion)
-            completer.setFilterMode(QtCore.Qt.MatchContains)
+            if self._sort_labels:
+                # binary search instead of a linear scan of the labels
+                completer.setModelSorting(
+                    QtWidgets.QCompleter.CaseSensitivelySortedModel
+                )
+            completer.setModel(self.labelList.model())
+        elif completion in ["contains", "fuzzy"]:
+            # the vocabulary ranks the matches and the completer only shows
+            # them, so it never filters all the labels itself
+            completer.setCompletionMode(
+                QtWidgets.QCompleter.UnfilteredPopupCompletion
+            )
+            completer.setModel(QtCore.QStringListModel(completer))
+            self.edit.textEdited.connect(self.updateCompletions)
+            # index the labels once the event loop is idle, not on the first
+            # keystroke
+            QtCore.QTimer.singleShot(0, self._vocabulary.build)
         else:
             raise ValueError("Unsupported completion: {}".format(completion))
-        completer.setModel(self.labelList.model())
+        self._completion = completion
+        self._completion_limit = completion_limit
         self.edit.setCompleter(completer)
 
+    def updateCompletions(self, text):
+        self.edit.completer().model().setStringList(
+            self._vocabulary.match(
+                text,
+                limit=self._completion_limit,
+                fuzzy=self._completion == "fuzzy",
+            )
+        )
+
     def addLabelHistory(self, label):
-        if self.labelList.findItems(label, QtCore.Qt.MatchExactly):
-            return
-        self.labelList.addItem(label)
+        self.addLabelHistories([label])
+
+    def addLabelHistories(self, labels):
+        """Add labels to the history, sorting the list once for all."""
+        labels = self._vocabulary.update(labels)
+        if len(labels) == 1 and self._sort_labels:
+            self.labelList.insertItem(self._sortedRow(labels[0]), labels[0])
+        elif labels:
+            self.labelList.addItems(labels)
+            if self._sort_labels:
+                self._sortItems()
+
+    def _sortItems(self):
+        """Sort the labels by code point as _sortedRow and the completer do.
+
+        QListWidget.sortItems compares by locale, which is not the order
+        the completer binary-searches with CaseSensitivelySortedModel.
+        """
+        labels = sorted(
+            self.labelList.item(row).text()
+            for row in range(self.labelList.count())
+        )
+        self.labelList.clear()
+        self.labelList.addItems(labels)
+
+    def _sortedRow(self, label):
+        texts = _ListWidgetTexts(self.labelList)
+        return bisect.bisect(texts, label)
+
+    def _findItem(self, label):
         if self._sort_labels:
-            self.labelList.sortItems()
+            texts = _ListWidgetTexts(self.labelList)
+            row = bisect.bisect_left(texts, label)
+            if row < len(texts) and texts[row] == label:
+                return self.labelList.item(row)
+            return None
+        # the labels may have been reordered by drag and drop
+        items = self.labelList.findItems(label, QtCore.Qt.MatchExactly)
+        return items[0] if items else None
 
     def labelSelected(self, item):
         self.edit.setText(item.text())
@@ -234,13 +310,15 @@ class LabelDialog(QtWidgets.QDialog):
             self.edit_group_id.clear()
         else:
             self.edit_group_id.setText(str(group_id))
-        items = self.labelList.findItems(text, QtCore.Qt.MatchFixedString)
-        if items:
-            if len(items) != 1:
+        labels = self._vocabulary.find(text)
+        if labels:
+            if len(labels) != 1:
                 logger.warning("Label list has duplicate '{}'".format(text))
-            self.labelList.setCurrentItem(items[0])
-            row = self.labelList.row(items[0])
-            self.edit.completer().setCurrentRow(row)
+            item = self._findItem(labels[0])
+            self.labelList.setCurrentItem(item)
+            if self._completion == "startswith":
+                row = self.labelList.row(item)
+                self.edit.completer().setCurrentRow(row)
         self.edit.setFocus(QtCore.Qt.PopupFocusReason)
         if move:
             self.move(QtGui.QCursor.pos())
@@ -1,3 +1,5 @@
+import html
+
 from qtpy import QtCore
 from qtpy.QtCore import Qt
 from qtpy import QtGui
@@ -6,8 +8,20 @@ from qtpy import QtWidgets
 from qtpy.QtWidgets import QStyle
 
 
+# (r, g, b) drawn as a bullet after the text
+_COLOR_ROLE = Qt.UserRole + 1
+
+
+def _text_width(metrics, text):
+    if hasattr(metrics, "horizontalAdvance"):  # Qt>=5.11
+        return metrics.horizontalAdvance(text)
+    return metrics.width(text)
+
+
 # https://stackoverflow.com/a/2039745/4158863
 class HTMLDelegate(QtWidgets.QStyledItemDelegate):
+    """Renders the text of items as HTML, with a bullet of their color."""
+
     def __init__(self, parent=None):
         super(HTMLDelegate, self).__init__()
         self.doc = QtGui.QTextDocument(self)
@@ -18,7 +32,15 @@ class HTMLDelegate(QtWidgets.QStyledItemDelegate):
         options = QtWidgets.QStyleOptionViewItem(option)
 
         self.initStyleOption(options, index)
-        self.doc.setHtml(options.text)
+        color = index.data(_COLOR_ROLE)
+        if color is None:
+            self.doc.setHtml(options.text)
+        else:
+            self.doc.setHtml(
+                '{} <font color="#{:02x}{:02x}{:02x}">●</font>'.format(
+                    html.escape(options.text), *color
+                )
+            )
         options.text = ""
 
         style = (
@@ -67,6 +89,107 @@ class HTMLDelegate(QtWidgets.QStyledItemDelegate):
         )
 
 
+class LabelListDelegate(QtWidgets.QStyledItemDelegate):
+    """Draws the text of items and a bullet of their color with the painter.
+
+    This is much faster than laying out rich text as HTMLDelegate does, and
+    all items have the same size: the height is computed once, and the
+    width fits the widest text passed to fitTexts.
+    """
+
+    def __init__(self, parent=None):
+        super(LabelListDelegate, self).__init__(parent)
+        self._height = None
+        self._textWidth = 0
+
+    def _fontMetrics(self, option=None):
+        if option is not None:
+            return option.fontMetrics
+        if self.parent() is not None:
+            return self.parent().fontMetrics()
+        return QtGui.QFontMetrics(QtWidgets.QApplication.font())
+
+    def fitTexts(self, texts):
+        """Widen the items to fit texts, returning True if they got wider."""
+        metrics = self._fontMetrics()
+        textWidth = max(
+            [_text_width(metrics, text + " ●") for text in texts]
+            + [self._textWidth]
+        )
+        if textWidth == self._textWidth:
+            return False
+        self._textWidth = textWidth
+        return True
+
+    def resetTextWidth(self):
+        self._textWidth = 0
+
+    def paint(self, painter, option, index):
+        options = QtWidgets.QStyleOptionViewItem(option)
+        self.initStyleOption(options, index)
+        text = options.text
+        options.text = ""
+
+        widget = options.widget
+        style = (
+            QtWidgets.QApplication.style()
+            if widget is None
+            else widget.style()
+        )
+        style.drawControl(QStyle.CE_ItemViewItem, options, painter, widget)
+
+        painter.save()
+        if option.state & QStyle.State_Selected:
+            painter.setPen(
+                option.palette.color(QPalette.Active, QPalette.HighlightedText)
+            )
+        else:
+            painter.setPen(
+                option.palette.color(QPalette.Active, QPalette.Text)
+            )
+        textRect = style.subElementRect(
+            QStyle.SE_ItemViewItemText, options, widget
+        )
+        metrics = options.fontMetrics
+        color = index.data(_COLOR_ROLE)
+        bullet = " ●" if color is not None else ""
+        text = metrics.elidedText(
+            text,
+            Qt.ElideRight,
+            textRect.width() - _text_width(metrics, bullet),
+        )
+        flags = Qt.AlignLeft | Qt.AlignVCenter | Qt.TextSingleLine
+        painter.drawText(textRect, flags, text)
+        if color is not None:
+            painter.setPen(QtGui.QColor(*color))
+            painter.drawText(
+                textRect.adjusted(_text_width(metrics, text), 0, 0, 0),
+                flags,
+                bullet,
+            )
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        style = QtWidgets.QApplication.style()
+        if self._height is None:
+            metrics = self._fontMetrics(option)
+            self._height = (
+                max(
+                    metrics.height(),
+                    style.pixelMetric(QStyle.PM_IndicatorHeight),
+                )
+                + 4
+            )
+        # check indicator and margins around it and the text
+        margin = style.pixelMetric(QStyle.PM_FocusFrameHMargin) + 1
+        width = (
+            self._textWidth
+            + style.pixelMetric(QStyle.PM_IndicatorWidth)
+            + 4 * margin
+        )
+        return QtCore.QSize(width, self._height)
+
+
 class LabelListWidgetItem(QtGui.QStandardItem):
     def __init__(self, text=None, shape=None):
         super(LabelListWidgetItem, self).__init__()
@@ -79,7 +202,9 @@ class LabelListWidgetItem(QtGui.QStandardItem):
         self.setTextAlignment(Qt.AlignBottom)
 
     def clone(self):
-        return LabelListWidgetItem(self.text(), self.shape())
+        item = LabelListWidgetItem(self.text(), self.shape())
+        item.setColor(self.color())
+        return item
 
     def setShape(self, shape):
         self.setData(shape, Qt.UserRole)
@@ -87,6 +212,12 @@ class LabelListWidgetItem(QtGui.QStandardItem):
     def shape(self):
         return self.data(Qt.UserRole)
 
+    def setColor(self, color):
+        self.setData(None if color is None else tuple(color), _COLOR_ROLE)
+
+    def color(self):
+        return self.data(_COLOR_ROLE)
+
     def __hash__(self):
         return id(self)
 
@@ -109,14 +240,20 @@ class LabelListWidget(QtWidgets.QListView):
     itemDoubleClicked = QtCore.Signal(LabelListWidgetItem)
     itemSelectionChanged = QtCore.Signal(list, list)
 
-    def __init__(self):
+    def __init__(self, html=False):
         super(LabelListWidget, self).__init__()
         self._selectedItems = []
+        # shape -> item, for findItemByShape without scanning the rows
+        self._itemsByShape = {}
 
         self.setWindowFlags(Qt.Window)
         self.setModel(StandardItemModel())
         self.model().setItemPrototype(LabelListWidgetItem())
-        self.setItemDelegate(HTMLDelegate())
+        if html:
+            self.setItemDelegate(HTMLDelegate())
+        else:
+            self.setItemDelegate(LabelListDelegate(self))
+            self.setUniformItemSizes(True)
         self.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
         self.setDragDropMode(QtWidgets.QAbstractItemView.InternalMove)
         self.setDefaultDropAction(Qt.MoveAction)
@@ -125,6 +262,12 @@ class LabelListWidget(QtWidgets.QListView):
         self.selectionModel().selectionChanged.connect(
             self.itemSelectionChangedEvent
         )
+        # drag-reorder inserts empty rows, sets clones of the items (with
+        # copies of the shapes) to them, and removes the original rows
+        self.model().rowsInserted.connect(self._rowsInserted)
+        self.model().dataChanged.connect(self._dataChanged)
+        self.model().rowsAboutToBeRemoved.connect(self._rowsAboutToBeRemoved)
+        self.model().modelReset.connect(self._modelReset)
 
     def __len__(self):
         return self.model().rowCount()
@@ -160,12 +303,63 @@ class LabelListWidget(QtWidgets.QListView):
     def scrollToItem(self, item):
         self.scrollTo(self.model().indexFromItem(item))
 
+    def _rowsInserted(self, parent, first, last):
+        texts = []
+        for row in range(first, last + 1):
+            item = self.model().item(row, 0)
+            if item is None:
+                continue
+            texts.append(item.text())
+            if item.shape() is not None:
+                self._itemsByShape[item.shape()] = item
+        self._fitTexts(first, texts)
+
+    def _fitTexts(self, row, texts):
+        # the view uses the same size for all items, so they are as wide as
+        # the widest text (which is kept when it is removed)
+        delegate = self.itemDelegate()
+        if isinstance(delegate, LabelListDelegate) and delegate.fitTexts(
+            texts
+        ):
+            delegate.sizeHintChanged.emit(self.model().index(row, 0))
+
+    def _modelReset(self):
+        self._itemsByShape.clear()
+        delegate = self.itemDelegate()
+        if isinstance(delegate, LabelListDelegate):
+            delegate.resetTextWidth()
+
+    def _dataChanged(self, topLeft, bottomRight, roles=None):
+        self._rowsInserted(None, topLeft.row(), bottomRight.row())
+
+    def _rowsAboutToBeRemoved(self, parent, first, last):
+        for row in range(first, last + 1):
+            item = self.model().item(row, 0)
+            if item is None:
+                continue
+            # unless a clone of the item has replaced it
+            if self._itemsByShape.get(item.shape()) is item:
+                del self._itemsByShape[item.shape()]
+
     def addItem(self, item):
         if not isinstance(item, LabelListWidgetItem):
             raise TypeError("item must be LabelListWidgetItem")
         self.model().setItem(self.model().rowCount(), 0, item)
+        if item.shape() is not None:
+            self._itemsByShape[item.shape()] = item
         item.setSizeHint(self.itemDelegate().sizeHint(None, None))
 
+    def addItems(self, items):
+        """Add items with a single insertion into the model."""
+        for item in items:
+            if not isinstance(item, LabelListWidgetItem):
+                raise TypeError("item must be LabelListWidgetItem")
+        sizeHint = self.itemDelegate().sizeHint(None, None)
+        for item in items:
+            item.setSizeHint(sizeHint)
+        # the items are mapped to their shapes in _rowsInserted
+        self.model().invisibleRootItem().appendRows(items)
+
     def removeItem(self, item):
         index = self.model().indexFromItem(item)
         self.model().removeRows(index.row(), 1)
@@ -174,12 +368,21 @@ class LabelListWidget(QtWidgets.QListView):
         index = self.model().indexFromItem(item)
         self.selectionModel().select(index, QtCore.QItemSelectionModel.Select)
 
+    def selectItems(self, items):
+        """Select items at once, which is faster than selectItem for each."""
+        selection = QtCore.QItemSelection()
+        for item in items:
+            index = self.model().indexFromItem(item)
+            selection.select(index, index)
+        self.selectionModel().select(
+            selection, QtCore.QItemSelectionModel.Select
+        )
+
     def findItemByShape(self, shape):
-        for row in range(self.model().rowCount()):
-            item = self.model().item(row, 0)
-            if item.shape() == shape:
-                return item
-        raise ValueError("cannot find shape: {}".format(shape))
+        try:
+            return self._itemsByShape[shape]
+        except KeyError:
+            raise ValueError("cannot find shape: {}".format(shape))
 
     def clear(self):
         self.model().clear()
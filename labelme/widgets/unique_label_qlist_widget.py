@@ -2,6 +2,7 @@
 
 import html
 
+from qtpy import QtCore
 from qtpy.QtCore import Qt
 from qtpy import QtWidgets
 
@@ -9,16 +10,58 @@ from .escapable_qlist_widget import EscapableQListWidget
 
 
 class UniqueLabelQListWidget(EscapableQListWidget):
+
+    # emitted when rows of existing labels may have changed, but not when
+    # labels are appended
+    labelRowsChanged = QtCore.Signal()
+
+    def __init__(self, *args, **kwargs):
+        super(UniqueLabelQListWidget, self).__init__(*args, **kwargs)
+        self._itemsByLabel = {}
+        model = self.model()
+        model.rowsInserted.connect(self._rowsInserted)
+        model.dataChanged.connect(self._dataChanged)
+        model.rowsAboutToBeRemoved.connect(self._rowsAboutToBeRemoved)
+        model.rowsRemoved.connect(self.labelRowsChanged)
+        model.rowsMoved.connect(self.labelRowsChanged)
+        model.layoutChanged.connect(self._reindex)
+        model.modelReset.connect(self._reindex)
+
+    def _reindex(self):
+        self._itemsByLabel = {}
+        self._rowsInserted(None, 0, self.count() - 1)
+        self.labelRowsChanged.emit()
+
+    def _rowsInserted(self, parent, first, last):
+        for row in range(first, last + 1):
+            item = self.item(row)
+            self._itemsByLabel[item.data(Qt.UserRole)] = item
+        if last + 1 < self.count():
+            self.labelRowsChanged.emit()
+
+    def _dataChanged(self, topLeft, bottomRight, roles=None):
+        if roles and Qt.UserRole not in roles:
+            return
+        for row in range(topLeft.row(), bottomRight.row() + 1):
+            item = self.item(row)
+            label = item.data(Qt.UserRole)
+            if self._itemsByLabel.get(label) is not item:
+                self._reindex()  # label of an item changed
+                return
+
+    def _rowsAboutToBeRemoved(self, parent, first, last):
+        for row in range(first, last + 1):
+            label = self.item(row).data(Qt.UserRole)
+            if self._itemsByLabel.get(label) is self.item(row):
+                del self._itemsByLabel[label]
+
     def mousePressEvent(self, event):
         super(UniqueLabelQListWidget, self).mousePressEvent(event)
         if not self.indexAt(event.pos()).isValid():
             self.clearSelection()
 
     def findItemByLabel(self, label):
-        for row in range(self.count()):
-            item = self.item(row)
-            if item.data(Qt.UserRole) == label:
-                return item
+        return self._itemsByLabel.get(label)
 
     def createItemFromLabel(self, label):
         if self.findItemByLabel(label):
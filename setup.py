@@ -145,10 +145,16 @@ def main():
         entry_points={
             "console_scripts": [
                 "labelme=labelme.__main__:main",
+                "labelme_convert_format=labelme.cli.convert_format:main",
                 "labelme_draw_json=labelme.cli.draw_json:main",
                 "labelme_draw_label_png=labelme.cli.draw_label_png:main",
+                "labelme_edit_labels=labelme.cli.edit_labels:main",
+                "labelme_export_coco=labelme.cli.export_coco:main",
+                "labelme_index=labelme.cli.index:main",
                 "labelme_json_to_dataset=labelme.cli.json_to_dataset:main",
                 "labelme_on_docker=labelme.cli.on_docker:main",
+                "labelme_stats=labelme.cli.stats:main",
+                "labelme_validate=labelme.cli.validate:main",
             ],
         },
     )
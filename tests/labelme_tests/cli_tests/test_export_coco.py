@@ -0,0 +1,91 @@
+import glob
+import json
+import os
+import os.path as osp
+
+import numpy as np
+
+from labelme.cli import export_coco
+
+
+here = osp.dirname(osp.abspath(__file__))
+data_dir = osp.join(here, "../data")
+
+
+def _write_labels_file(filename):
+    with open(filename, "w") as f:
+        f.write("\n".join(["__ignore__", "_background_", "person", "bottle"]))
+
+
+def test_export_coco(tmp_path):
+    labels_file = str(tmp_path / "labels.txt")
+    _write_labels_file(labels_file)
+    output_dir = str(tmp_path / "coco")
+    os.makedirs(osp.join(output_dir, "JPEGImages"))
+
+    label_files = sorted(glob.glob(osp.join(data_dir, "annotated/*.json")))
+    out_ann_file = export_coco.export_coco(
+        label_files,
+        output_dir=output_dir,
+        labels_file=labels_file,
+        workers=2,
+        image_mode="copy",
+    )
+
+    with open(out_ann_file) as f:
+        data = json.load(f)
+    assert len(data["images"]) == len(label_files)
+    assert [image["id"] for image in data["images"]] == [0, 1, 2]
+    assert data["annotations"]
+    ids = [annotation["id"] for annotation in data["annotations"]]
+    assert ids == list(range(len(ids)))
+    for image in data["images"]:
+        assert osp.exists(osp.join(output_dir, image["file_name"]))
+
+
+def test_cropped_mask_matches_full_mask():
+    img_shape = (100, 120)
+    shapes = [
+        dict(points=[[10, 20], [50, 25], [30, 70]], shape_type="polygon"),
+        dict(points=[[60, 10], [110, 40]], shape_type="rectangle"),
+        dict(points=[[5, 90], [100, 95]], shape_type="line"),
+    ]
+    full_mask = np.any(
+        [
+            export_coco.utils.shape_to_mask(
+                img_shape, s["points"], s["shape_type"]
+            )
+            for s in shapes
+        ],
+        axis=0,
+    )
+    mask, offset = export_coco.instance_to_cropped_mask(img_shape, shapes)
+    assert export_coco.mask_to_area_and_bbox(
+        mask, offset=offset
+    ) == export_coco.mask_to_area_and_bbox(full_mask)
+
+
+def test_small_circle():
+    for radius in [0, 0.3]:
+        points = [[10.2, 10.2], [10.2 + radius, 10.2]]
+        polygon = export_coco.shape_to_polygon(points, "circle")
+        assert np.isfinite(polygon).all()
+        assert export_coco.polygon_area(polygon) > 0
+        mask, offset = export_coco.instance_to_cropped_mask(
+            (100, 100), [dict(points=points, shape_type="circle")]
+        )
+        assert mask.any()
+
+
+def test_CocoJsonWriter(tmp_path):
+    filename = str(tmp_path / "annotations.json")
+    with export_coco.CocoJsonWriter(
+        filename, info={}, licenses=[], categories=[]
+    ) as writer:
+        writer.add_image(dict(id=0))
+        writer.add_annotation(dict(image_id=0))
+        assert writer.num_images == 1
+        assert writer.num_annotations == 1
+    with open(filename) as f:
+        data = json.load(f)
+    assert data["annotations"] == [dict(image_id=0, id=0)]
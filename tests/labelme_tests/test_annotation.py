@@ -0,0 +1,119 @@
+import glob
+import json
+import os.path as osp
+
+import numpy as np
+import pytest
+
+from labelme import annotation
+
+
+here = osp.dirname(osp.abspath(__file__))
+data_dir = osp.join(here, "data")
+
+
+def test_ShapeData():
+    shape = annotation.ShapeData(
+        points=[[0, 0], [10, 0], [10, 10], [0, 10]], label="square"
+    )
+    assert shape.shape_type == "polygon"
+    np.testing.assert_allclose(shape.bbox(), [0, 0, 10, 10])
+    assert shape.area() == 100
+    assert shape.contains((5, 5))
+    assert not shape.contains((15, 5))
+    assert shape.nearest_vertex((9, 9), epsilon=2) == 2
+    assert shape.nearest_vertex((5, 5), epsilon=2) is None
+    assert shape.nearest_edge((5, 1), epsilon=2) == 1
+    with pytest.raises(ValueError):
+        annotation.ShapeData(points=[[0, 0]], shape_type="ellipse")
+
+    data = shape.to_dict()
+    assert data["points"] == [[0, 0], [10, 0], [10, 10], [0, 10]]
+    assert annotation.ShapeData.from_dict(data).to_dict() == data
+
+
+def test_ShapeData_simplify():
+    x = np.linspace(0, 10, 11)
+    line = annotation.ShapeData(
+        points=np.stack([x, 0.01 * (x % 2)], axis=1), shape_type="linestrip"
+    )
+    np.testing.assert_allclose(line.simplify(0.1).points, [[0, 0], [10, 0]])
+
+    circle = np.linspace(0, 2 * np.pi, 100, endpoint=False)
+    polygon = annotation.ShapeData(
+        points=np.stack([np.cos(circle), np.sin(circle)], axis=1) * 100
+    )
+    simplified = polygon.simplify(1)
+    assert 3 <= len(simplified) < 50
+    assert abs(simplified.area() - polygon.area()) / polygon.area() < 0.02
+    assert len(polygon.simplify(1000)) == 3
+
+
+def test_ShapeData_clip():
+    polygon = annotation.ShapeData(points=[[-10, -10], [50, -10], [50, 50]])
+    clipped = polygon.clip(width=41, height=41)
+    np.testing.assert_allclose(clipped.bbox(), [0, 0, 40, 40])
+    assert clipped.area() == 40 * 40 / 2
+    assert polygon.clip(width=41, height=41).label == polygon.label
+    outside = annotation.ShapeData(points=[[-10, -10], [-5, -10], [-5, -5]])
+    assert outside.clip(width=41, height=41) is None
+
+    rectangle = annotation.ShapeData(
+        points=[[-5, 10], [60, 20]], shape_type="rectangle"
+    )
+    np.testing.assert_allclose(
+        rectangle.clip(41, 41).points, [[0, 10], [40, 20]]
+    )
+    point = annotation.ShapeData(points=[[50, 5]], shape_type="point")
+    assert point.clip(41, 41) is None
+
+
+def test_ShapeBatch():
+    shapes = []
+    for filename in sorted(glob.glob(osp.join(data_dir, "annotated/*.json"))):
+        with open(filename) as f:
+            shapes.extend(json.load(f)["shapes"])
+    shapes.append(
+        dict(label="c", points=[[0, 0], [10, 0]], shape_type="circle")
+    )
+    shapes.append(
+        dict(label="r", points=[[0, 0], [10, 10]], shape_type="rectangle")
+    )
+    batch = annotation.ShapeBatch.from_dicts(shapes)
+    assert len(batch) == len(shapes)
+
+    bboxes, areas = batch.bboxes_and_areas()
+    for shape, bbox, area in zip(batch, bboxes, areas):
+        np.testing.assert_allclose(shape.bbox(), bbox)
+        np.testing.assert_allclose(shape.area(), area)
+
+    for point in [(5, 5), (-5, 0), (150, 200), (250, 100)]:
+        contains = batch.contains(point)
+        assert contains.tolist() == [shape.contains(point) for shape in batch]
+    assert batch.contains((-5, 0))[-2:].tolist() == [True, False]
+
+    assert len(batch.clip(width=100, height=100)) < len(batch)
+    assert len(batch.simplify(2).points) < len(batch.points)
+    assert batch.to_dicts()[-1]["points"] == [[0, 0], [10, 10]]
+
+
+def test_Shape_fromData_toData():
+    from labelme.shape import Shape
+
+    shape = Shape.fromData(
+        annotation.ShapeData.from_dict(
+            dict(
+                label="cat",
+                points=[[0, 0], [10, 10]],
+                shape_type="rectangle",
+                flags=dict(occluded=False),
+            )
+        )
+    )
+    data = shape.toData()
+    assert data.description is None
+    assert data.to_dict()["description"] is None
+
+    # edits while the data is being saved do not change it
+    shape.flags["occluded"] = True
+    assert data.flags == dict(occluded=False)
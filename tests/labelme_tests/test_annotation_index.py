@@ -0,0 +1,66 @@
+import json
+import os
+import os.path as osp
+import shutil
+
+from labelme.annotation_index import AnnotationIndex
+
+
+here = osp.dirname(osp.abspath(__file__))
+data_dir = osp.join(here, "data")
+
+
+def test_AnnotationIndex(tmp_path):
+    root_dir = str(tmp_path / "annotated")
+    shutil.copytree(osp.join(data_dir, "annotated"), root_dir)
+
+    with AnnotationIndex(str(tmp_path / "index.sqlite3")) as index:
+        assert index.update(root_dir, workers=0) == (3, 0)
+        assert index.update(root_dir, workers=0) == (0, 0)
+
+        labels = {label: counts for label, *counts in index.labels()}
+        assert labels["person"] == [7, 2]
+        assert labels["bus"] == [2, 1]
+        files = index.files(label="person")
+        assert [osp.basename(f) for f in files] == [
+            "2011_000003.json",
+            "2011_000006.json",
+        ]
+        assert index.files(label="person", shape_type="circle") == []
+        ((num_shapes,),) = index.query(
+            "SELECT COUNT(*) FROM shapes WHERE label = 'person'"
+        )
+        assert num_shapes == 7
+
+        # changed and removed files
+        shutil.copy(osp.join(root_dir, "2011_000025.json"), files[1])
+        os.remove(files[0])
+        assert index.update(root_dir, workers=0) == (1, 1)
+        labels = {label: counts for label, *counts in index.labels()}
+        assert "person" not in labels
+        assert labels["bus"] == [4, 2]
+        assert len(index.files()) == 2
+
+
+def test_AnnotationIndex_null_shape_fields(tmp_path):
+    root_dir = str(tmp_path / "annotated")
+    shutil.copytree(osp.join(data_dir, "annotated"), root_dir)
+    for basename, key in [
+        ("2011_000003.json", "shape_type"),
+        ("2011_000006.json", "label"),
+    ]:
+        filename = osp.join(root_dir, basename)
+        with open(filename) as f:
+            data = json.load(f)
+        data["shapes"][0][key] = None
+        with open(filename, "w") as f:
+            json.dump(data, f)
+
+    with AnnotationIndex(str(tmp_path / "index.sqlite3")) as index:
+        assert index.update(root_dir, workers=0) == (3, 0)
+        assert len(index.files()) == 3
+        assert len(index.files(shape_type="polygon")) == 2
+        ((error,),) = index.query(
+            "SELECT error FROM files WHERE path LIKE '%2011_000006.json'"
+        )
+        assert "label" in error
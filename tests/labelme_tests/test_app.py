@@ -2,6 +2,7 @@ import os.path as osp
 import shutil
 import tempfile
 
+import PIL.Image
 import pytest
 
 import labelme.app
@@ -111,3 +112,102 @@ def test_MainWindow_annotate_jpg(qtbot):
 
     labelme.testing.assert_labelfile_sanity(out_file)
     shutil.rmtree(tmp_dir)
+
+
+@pytest.mark.gui
+def test_MainWindow_loadShapes(qtbot):
+    win = labelme.app.MainWindow()
+    qtbot.addWidget(win)
+
+    shapes = []
+    for i in range(10):
+        shape = labelme.app.Shape(label="label_{}".format(i % 3))
+        shape.addPoint(labelme.app.QtCore.QPointF(i, i))
+        shapes.append(shape)
+    shapes[0].group_id = 1
+    win.loadShapes(shapes)
+
+    assert len(win.labelList) == 10
+    assert win.labelList[0].text() == "label_0 (1)"
+    assert win.labelList[0].color() is not None
+    for shape in shapes:
+        assert win.labelList.findItemByShape(shape).shape() is shape
+    assert win.uniqLabelList.count() == 3
+    assert win.labelDialog.labelList.count() == 3
+    assert all(action.isEnabled() for action in win.actions.onShapesPresent)
+    win.close()
+
+
+@pytest.mark.gui
+def test_MainWindow_image_preview(qtbot, tmp_path):
+    img_file = str(tmp_path / "large.jpg")
+    with PIL.Image.open(osp.join(data_dir, "raw/2011_000003.jpg")) as img:
+        img.resize((4000, 3000)).save(img_file)
+
+    config = labelme.config.get_default_config()
+    config["image_preview"] = True
+    win = labelme.app.MainWindow(config=config)
+    qtbot.addWidget(win)
+    win.show()
+    assert win.loadFile(img_file)
+
+    # shown at a reduced resolution until the full image is loaded
+    assert win._imagePreview == img_file
+    assert win.imageData is None
+    assert win.canvas.imageSize == labelme.app.QtCore.QSize(4000, 3000)
+    assert win.canvas.pixmap.width() < 4000
+
+    _win_show_and_wait_imageData(qtbot, win)
+    assert win._imagePreview is None
+    assert win.canvas.pixmap.size() == win.canvas.imageSize
+
+    # loaded synchronously if the request has been replaced
+    img_file2 = str(tmp_path / "large2.jpg")
+    shutil.copy(img_file, img_file2)
+    assert win.loadFile(img_file2)
+    assert win._imagePreview == img_file2
+    win.imageLoader.request("other.jpg", bytes)
+    assert win.loadFullImage()
+    assert win._imagePreview is None
+    assert win.canvas.pixmap.size() == win.canvas.imageSize
+    win.close()
+
+
+@pytest.mark.gui
+def test_MainWindow_saveLabelsFailed_retry(qtbot, tmp_path, monkeypatch):
+    save = labelme.app.LabelFile.save
+    num_failures = []
+
+    def save_failing_once(self, filename, **kwargs):
+        if not num_failures:
+            num_failures.append(1)
+            raise labelme.app.LabelFileError("disk full")
+        return save(self, filename, **kwargs)
+
+    monkeypatch.setattr(labelme.app.LabelFile, "save", save_failing_once)
+    QMessageBox = labelme.app.QtWidgets.QMessageBox
+    monkeypatch.setattr(
+        QMessageBox, "critical", lambda *args: QMessageBox.Retry
+    )
+
+    config = labelme.config.get_default_config()
+    config["auto_save"] = True
+    win = labelme.app.MainWindow(
+        config=config,
+        filename=osp.join(data_dir, "raw"),
+        output_dir=str(tmp_path),
+    )
+    qtbot.addWidget(win)
+    _win_show_and_wait_imageData(qtbot, win)
+
+    shape = labelme.app.Shape(label="a", shape_type="point")
+    shape.addPoint(labelme.app.QtCore.QPointF(10, 10))
+    win.loadShapes([shape])
+    win.setDirty()  # auto saved, but fails
+    win.openNextImg()  # moves on before the failure is reported
+
+    label_file = str(tmp_path / "2011_000003.json")
+    qtbot.waitUntil(lambda: osp.exists(label_file))
+    assert num_failures == [1]
+    assert not win.labelFileWriter.failures()
+    win.close()
@@ -0,0 +1,76 @@
+import os.path as osp
+import shutil
+
+from labelme import compact_label_file
+from labelme.bulk_edit import edit_labelfile
+from labelme.bulk_edit import edit_labelfiles
+from labelme.label_file import LabelFile
+
+
+here = osp.dirname(osp.abspath(__file__))
+data_dir = osp.join(here, "data")
+
+
+def test_edit_labelfile(tmp_path):
+    json_file = str(tmp_path / "apc2016_obj3.json")
+    shutil.copy(
+        osp.join(data_dir, "annotated_with_data/apc2016_obj3.json"), json_file
+    )
+    label_file = LabelFile(json_file)
+    labels = [shape["label"] for shape in label_file.shapes]
+    assert labels == [
+        "shelf",
+        "highland_6539_self_stick_notes",
+        "mead_index_cards",
+        "kong_air_dog_squeakair_tennis_ball",
+    ]
+
+    kwargs = dict(
+        rename={"mead_index_cards": "cards", "shelf": "cards"},
+        delete=["kong_air_dog_squeakair_tennis_ball"],
+        set_flags={"reviewed": True},
+    )
+    changes = edit_labelfile(json_file, dry_run=True, **kwargs)
+    assert changes["renamed"] == {"mead_index_cards": 1, "shelf": 1}
+    assert changes["deleted"] == {"kong_air_dog_squeakair_tennis_ball": 1}
+    assert changes["flags"] == {"reviewed": 1}
+    with open(json_file, "rb") as f, open(
+        osp.join(data_dir, "annotated_with_data/apc2016_obj3.json"), "rb"
+    ) as f_orig:
+        assert f.read() == f_orig.read()
+
+    assert edit_labelfile(json_file, **kwargs) == changes
+    edited = LabelFile(json_file)
+    assert [shape["label"] for shape in edited.shapes] == [
+        "cards",
+        "highland_6539_self_stick_notes",
+        "cards",
+    ]
+    assert edited.flags == {"reviewed": True}
+    assert edited.imageData == label_file.imageData
+
+    # no change
+    changes = edit_labelfile(json_file, **kwargs)
+    assert not any(changes.values())
+
+    compact_file = str(tmp_path / ("apc2016_obj3" + compact_label_file.suffix))
+    edited.save(
+        compact_file,
+        shapes=edited.shapes,
+        imagePath=edited.imagePath,
+        imageHeight=edited.imageHeight,
+        imageWidth=edited.imageWidth,
+        imageData=edited.imageData,
+    )
+    results = list(
+        edit_labelfiles(
+            [compact_file, json_file + "_"],
+            remove_flags=["reviewed"],
+            rename={"cards": "card"},
+        )
+    )
+    assert results[0][1]["renamed"] == {"cards": 2}
+    assert results[1][2] is not None  # missing file
+    edited = LabelFile(compact_file)
+    assert [shape["label"] for shape in edited.shapes].count("card") == 2
+    assert edited.imageData == label_file.imageData
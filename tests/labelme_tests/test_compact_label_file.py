@@ -0,0 +1,110 @@
+import json
+import os.path as osp
+import shutil
+
+import numpy as np
+
+from labelme import compact_label_file
+from labelme.cli import convert_format
+import labelme
+
+
+here = osp.dirname(osp.abspath(__file__))
+data_dir = osp.join(here, "data")
+
+
+def test_save_and_load(tmp_path):
+    for json_file in [
+        osp.join(data_dir, "annotated/2011_000003.json"),
+        osp.join(data_dir, "annotated_with_data/apc2016_obj3.json"),
+    ]:
+        with open(json_file) as f:
+            data = json.load(f)
+        filename = str(tmp_path / ("test" + compact_label_file.suffix))
+        compact_label_file.save(filename, data)
+        loaded = compact_label_file.load(filename)
+
+        assert list(loaded) == list(data)
+        assert loaded["imageData"] == data["imageData"]
+        for shape, loaded_shape in zip(data["shapes"], loaded["shapes"]):
+            assert list(loaded_shape) == list(shape)
+            np.testing.assert_allclose(
+                loaded_shape.pop("points"), shape.pop("points"), rtol=1e-6
+            )
+            assert loaded_shape == shape
+
+
+def test_label_file(tmp_path):
+    json_file = osp.join(data_dir, "annotated/2011_000003.json")
+    shutil.copy(osp.join(data_dir, "annotated/2011_000003.jpg"), tmp_path)
+    label_file = labelme.LabelFile(json_file)
+
+    filename = str(tmp_path / ("2011_000003" + compact_label_file.suffix))
+    assert labelme.LabelFile.is_label_file(filename)
+    label_file.save(
+        filename,
+        shapes=label_file.shapes,
+        imagePath=label_file.imagePath,
+        imageHeight=label_file.imageHeight,
+        imageWidth=label_file.imageWidth,
+    )
+    loaded = labelme.LabelFile(filename)
+    assert loaded.imageData == label_file.imageData
+    assert [s["label"] for s in loaded.shapes] == [
+        s["label"] for s in label_file.shapes
+    ]
+
+
+def test_convert_format(tmp_path):
+    json_file = osp.join(data_dir, "annotated_with_data/apc2016_obj3.json")
+    compact_file = convert_format.get_output_file(
+        json_file, output_dir=str(tmp_path)
+    )
+    convert_format.convert(json_file, compact_file)
+    assert osp.getsize(compact_file) < osp.getsize(json_file)
+
+    out_file = convert_format.get_output_file(compact_file)
+    assert out_file == str(tmp_path / "apc2016_obj3.json")
+    convert_format.convert(compact_file, out_file)
+    with open(json_file) as f:
+        expected = json.load(f)
+    with open(out_file) as f:
+        data = json.load(f)
+    assert data["imageData"] == expected["imageData"]
+    assert len(data["shapes"]) == len(expected["shapes"])
+
+
+def test_image_data_not_reencoded(tmp_path, monkeypatch):
+    json_file = osp.join(data_dir, "annotated_with_data/apc2016_obj3.json")
+    label_file = labelme.LabelFile(json_file)
+    imageData = label_file.imageData
+
+    def fail(*args, **kwargs):
+        raise AssertionError("imageData must not be encoded to base64")
+
+    with monkeypatch.context() as m:
+        m.setattr(compact_label_file.base64, "b64encode", fail)
+        m.setattr(labelme.label_file.base64, "b64encode", fail)
+
+        filename = str(tmp_path / ("apc2016_obj3" + compact_label_file.suffix))
+        labelme.LabelFile().save(
+            filename,
+            shapes=label_file.shapes,
+            imagePath=label_file.imagePath,
+            imageHeight=label_file.imageHeight,
+            imageWidth=label_file.imageWidth,
+            imageData=imageData,
+        )
+        loaded = labelme.LabelFile(filename, with_image=False)
+        assert loaded.read_embedded_image_data() == imageData
+
+        # deferred from another compact file
+        data = compact_label_file.load(filename, with_image_data=False)
+        assert isinstance(
+            data["imageData"], compact_label_file.DeferredImageData
+        )
+        copied = str(tmp_path / ("copied" + compact_label_file.suffix))
+        compact_label_file.save(copied, data)
+
+    loaded = labelme.LabelFile(copied)
+    assert loaded.imageData == imageData
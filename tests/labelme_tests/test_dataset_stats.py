@@ -0,0 +1,63 @@
+import glob
+import json
+import os.path as osp
+
+from labelme.dataset_stats import compute_stats
+
+
+here = osp.dirname(osp.abspath(__file__))
+data_dir = osp.join(here, "data")
+
+
+def test_compute_stats():
+    filenames = sorted(glob.glob(osp.join(data_dir, "annotated/*.json")))
+    stats = compute_stats(filenames + [filenames[0] + "_"])
+    json.dumps(stats)
+
+    assert stats["num_files"] == 3
+    assert stats["num_shapes"] == 18
+    assert stats["num_errors"] == 1
+    assert stats["shape_types"] == {"polygon": 18}
+    assert stats["shapes_per_file"]["max"] == 10
+    vertices = stats["polygon_vertices"]
+    assert sum(bin["count"] for bin in vertices) == 18
+
+    person = stats["classes"]["person"]
+    assert person["num_shapes"] == 7
+    assert person["num_files"] == 2
+    assert sum(person["bbox_sizes"].values()) == 7
+    assert person["bbox_width"]["min"] <= person["bbox_width"]["median"]
+    assert stats["classes"]["bus"]["num_files"] == 1
+
+
+def test_compute_stats_malformed_points(tmp_path):
+    with open(osp.join(data_dir, "annotated/2011_000003.json")) as f:
+        data = json.load(f)
+    data["shapes"][0]["points"] = [[0, 0], ["a"]]
+    json_file = str(tmp_path / "malformed.json")
+    with open(json_file, "w") as f:
+        json.dump(data, f)
+
+    filenames = sorted(glob.glob(osp.join(data_dir, "annotated/*.json")))
+    stats = compute_stats(filenames + [json_file])
+    assert stats["num_files"] == 3
+    assert stats["num_errors"] == 1
+    assert stats["errors"][0]["filename"] == json_file
+
+
+def test_compute_stats_empty(tmp_path):
+    stats = compute_stats([])
+    assert stats["num_files"] == 0
+    assert stats["num_shapes"] == 0
+    assert stats["classes"] == {}
+
+    with open(osp.join(data_dir, "annotated/2011_000003.json")) as f:
+        data = json.load(f)
+    data["shapes"] = []
+    json_file = str(tmp_path / "empty.json")
+    with open(json_file, "w") as f:
+        json.dump(data, f)
+    stats = compute_stats([json_file])
+    assert stats["num_files"] == 1
+    assert stats["num_shapes"] == 0
+    assert stats["classes"] == {}
@@ -0,0 +1,90 @@
+import json
+import os
+import os.path as osp
+
+import labelme
+from labelme.export_manifest import ExportManifest
+
+
+def _write(filename, content):
+    with open(filename, "w") as f:
+        f.write(content)
+
+
+def test_ExportManifest(tmp_path):
+    input_dir = str(tmp_path / "input")
+    output_dir = str(tmp_path / "output")
+    os.makedirs(input_dir)
+    os.makedirs(output_dir)
+
+    files = [osp.join(input_dir, "{}.json".format(i)) for i in range(3)]
+    for filename in files:
+        _write(filename, filename)
+
+    manifest = ExportManifest(output_dir, options=dict(labels="a"))
+    changed, unchanged, deleted = manifest.diff(files)
+    assert (changed, unchanged, deleted) == (files, [], [])
+    for filename in files:
+        out_file = osp.join(output_dir, osp.basename(filename))
+        _write(out_file, "")
+        manifest.update(filename, [out_file])
+    manifest.save()
+
+    # modify, touch and delete
+    _write(files[0], "modified")
+    os.utime(files[1], ns=(0, 0))
+    manifest = ExportManifest(output_dir, options=dict(labels="a"))
+    changed, unchanged, deleted = manifest.diff(files[:2])
+    assert changed == [files[0]]
+    assert unchanged == [files[1]]
+    assert deleted == [osp.abspath(files[2])]
+    manifest.remove(deleted[0])
+    assert not osp.exists(osp.join(output_dir, "2.json"))
+
+    manifest.update(files[0], [osp.join(output_dir, "0.json")])
+    manifest.save()
+
+    # changed options invalidate everything
+    manifest = ExportManifest(output_dir, options=dict(labels="b"))
+    changed, _, _ = manifest.diff(files[:2])
+    assert changed == files[:2]
+    # outputs are only removed on request
+    assert len(os.listdir(output_dir)) == 3
+    assert manifest.reset_if_options_changed()
+    assert sorted(os.listdir(output_dir)) == [ExportManifest.basename]
+    assert not manifest.reset_if_options_changed()
+
+
+def test_ExportManifest_image_file(tmp_path):
+    input_dir = str(tmp_path / "input")
+    output_dir = str(tmp_path / "output")
+    os.makedirs(input_dir)
+    os.makedirs(output_dir)
+
+    image_file = osp.join(input_dir, "0.jpg")
+    _write(image_file, "image")
+    filename = osp.join(input_dir, "0.json")
+    _write(
+        filename,
+        json.dumps(
+            dict(
+                version=labelme.__version__,
+                flags={},
+                shapes=[],
+                imagePath="0.jpg",
+                imageData=None,
+                imageHeight=None,
+                imageWidth=None,
+            )
+        ),
+    )
+
+    manifest = ExportManifest(output_dir)
+    out_file = osp.join(output_dir, "0.jpg")
+    _write(out_file, "")
+    manifest.update(filename, [out_file])
+    assert manifest.diff([filename])[0] == []
+
+    # the image changed behind imagePath
+    _write(image_file, "changed")
+    assert manifest.diff([filename])[0] == [filename]
@@ -0,0 +1,70 @@
+import os.path as osp
+import shutil
+
+import pytest
+
+import labelme.app
+from labelme.annotation_index import AnnotationIndex
+from labelme.file_query import FileQuery
+from labelme.file_query import FileSummary
+
+
+here = osp.dirname(osp.abspath(__file__))
+data_dir = osp.join(here, "data")
+
+
+def test_FileQuery():
+    summary = FileSummary.from_shapes(
+        [dict(label="person"), dict(label="person"), dict(label="car")],
+        flags=dict(occluded=True, truncated=False),
+    )
+
+    def match(text, path="images/0001.jpg"):
+        return FileQuery(text).match(path, summary)
+
+    assert match("")
+    assert match("0001 label:person")
+    assert not match("0002 label:person")
+    assert match("label:person>=2 label:car=1 shapes=3")
+    assert not match("label:person>2")
+    assert match("-label:bus label:bus=0 shapes<4")
+    assert match("flag:occluded -flag:truncated")
+    assert match('"images/0001"')
+    assert match('"label:person')  # unclosed quote while typing
+
+    assert not FileQuery("0001 -0002").needs_summary
+    assert FileQuery("0001 -label:bus").needs_summary
+    # files without label file have no shapes
+    assert FileQuery("shapes=0 -label:person").match("0001.jpg")
+
+
+def test_AnnotationIndex_summaries(tmp_path):
+    with AnnotationIndex(str(tmp_path / "index.sqlite3")) as index:
+        index.update(osp.join(data_dir, "annotated"), workers=0)
+        summaries = index.summaries()
+    summary = summaries[osp.join(data_dir, "annotated", "2011_000006.json")]
+    assert summary.num_shapes == 10
+    assert summary.label_counts["person"] == 4
+    assert summary.label_counts["sofa"] == 4
+    assert summary.flags == frozenset()
+
+
+@pytest.mark.gui
+def test_MainWindow_fileSearch(qtbot, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    root_dir = str(tmp_path / "annotated")
+    shutil.copytree(osp.join(data_dir, "annotated"), root_dir)
+
+    win = labelme.app.MainWindow(filename=root_dir)
+    qtbot.addWidget(win)
+    qtbot.waitUntil(lambda: len(win._fileSummaries) == 3)
+
+    win.fileSearch.setText("label:person -label:bottle")
+    assert [osp.basename(f) for f in win.imageList] == ["2011_000006.jpg"]
+    win.fileSearch.setText("shapes<5")
+    assert [osp.basename(f) for f in win.imageList] == ["2011_000025.jpg"]
+    win.openNextImg(load=False)
+    assert osp.basename(win.filename) == "2011_000025.jpg"
+    win.fileSearch.setText("")
+    assert len(win.imageList) == 3
+    win.close()
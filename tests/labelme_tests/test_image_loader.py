@@ -0,0 +1,40 @@
+import os.path as osp
+
+import PIL.Image
+import pytest
+
+from labelme.image_loader import read_image_preview
+
+
+here = osp.dirname(osp.abspath(__file__))
+data_dir = osp.join(here, "data")
+
+
+@pytest.mark.gui
+def test_read_image_preview(tmp_path):
+    from qtpy import QtCore
+
+    img_file = str(tmp_path / "large.jpg")
+    with PIL.Image.open(osp.join(data_dir, "raw/2011_000003.jpg")) as img:
+        img = img.resize((4000, 3000))
+        img.save(img_file)
+        # rotated by 90 degrees by the EXIF orientation
+        exif = PIL.Image.Exif()
+        exif[0x0112] = 6
+        img.save(str(tmp_path / "rotated.jpg"), exif=exif)
+
+    image, size = read_image_preview(img_file, QtCore.QSize(800, 600))
+    assert size == QtCore.QSize(4000, 3000)
+    assert (image.width(), image.height()) == (1000, 750)
+
+    image, size = read_image_preview(
+        str(tmp_path / "rotated.jpg"), QtCore.QSize(800, 600)
+    )
+    assert size == QtCore.QSize(3000, 4000)
+    assert (image.width(), image.height()) == (750, 1000)
+
+    # too small to be reduced
+    assert read_image_preview(img_file, QtCore.QSize(3000, 3000)) is None
+    png_file = str(tmp_path / "large.png")
+    img.save(png_file)
+    assert read_image_preview(png_file, QtCore.QSize(800, 600)) is None
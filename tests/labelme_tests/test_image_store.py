@@ -0,0 +1,121 @@
+import json
+import os
+import os.path as osp
+import shutil
+
+import labelme
+from labelme.image_store import ImageStore
+
+
+here = osp.dirname(osp.abspath(__file__))
+data_dir = osp.join(here, "data")
+
+
+def test_ImageStore(tmp_path):
+    store = ImageStore(str(tmp_path / "store"))
+    ref = store.put(b"data")
+    assert ref == store.put(b"data")
+    assert osp.relpath(ref["path"], store.root).split(os.sep) == [
+        ref["sha256"][:2],
+        ref["sha256"],
+    ]
+    assert ImageStore.read(ref["path"], size=ref["size"])[:] == b"data"
+
+
+def test_label_file_with_image_store(tmp_path):
+    json_file = osp.join(data_dir, "annotated/2011_000003.json")
+    label_file = labelme.LabelFile(json_file)
+
+    store_dir = str(tmp_path / "store")
+    filenames = []
+    for version in ["v1", "v2"]:
+        os.makedirs(str(tmp_path / version))
+        shutil.copy(
+            osp.join(data_dir, "annotated/2011_000003.jpg"),
+            str(tmp_path / version),
+        )
+        filename = str(tmp_path / version / "2011_000003.json")
+        label_file.save(
+            filename,
+            shapes=label_file.shapes,
+            imagePath=label_file.imagePath,
+            imageHeight=label_file.imageHeight,
+            imageWidth=label_file.imageWidth,
+            imageData=label_file.imageData,
+            imageStore=store_dir,
+        )
+        filenames.append(filename)
+
+        with open(filename) as f:
+            data = json.load(f)
+        assert data["imageData"] is None
+        assert data["imageDataRef"]["path"].startswith("../store/")
+
+    # deduplicated
+    assert len(os.listdir(store_dir)) == 1
+
+    loaded = labelme.LabelFile(filenames[0])
+    assert loaded.imageDataEmbedded
+    assert loaded.imageData[:] == label_file.imageData
+    assert loaded.imageHeight == label_file.imageHeight
+    assert "imageDataRef" not in loaded.otherData
+
+    # falls back to imagePath
+    shutil.rmtree(store_dir)
+    loaded = labelme.LabelFile(filenames[1])
+    assert loaded.imageHeight == label_file.imageHeight
+
+
+def test_label_file_with_image_store_not_encoded(tmp_path, monkeypatch):
+    json_file = osp.join(data_dir, "annotated/2011_000003.json")
+    label_file = labelme.LabelFile(json_file)
+    imageData = label_file.imageData
+
+    def _encode_image_data(imageData):
+        raise AssertionError("imageData must not be encoded")
+
+    monkeypatch.setattr(
+        labelme.LabelFile,
+        "_encode_image_data",
+        staticmethod(_encode_image_data),
+    )
+    filename = str(tmp_path / "2011_000003.json")
+    labelme.LabelFile().save(
+        filename,
+        shapes=label_file.shapes,
+        imagePath=label_file.imagePath,
+        imageHeight=label_file.imageHeight + 1,
+        imageWidth=label_file.imageWidth,
+        imageData=imageData,
+        imageStore=str(tmp_path / "store"),
+    )
+    with open(filename) as f:
+        data = json.load(f)
+    assert data["imageData"] is None
+    assert data["imageHeight"] == label_file.imageHeight
+    assert data["imageWidth"] == label_file.imageWidth
+
+
+def test_label_file_with_empty_image_store_file(tmp_path):
+    json_file = osp.join(data_dir, "annotated/2011_000003.json")
+    label_file = labelme.LabelFile(json_file)
+    shutil.copy(osp.join(data_dir, "annotated/2011_000003.jpg"), str(tmp_path))
+
+    filename = str(tmp_path / "2011_000003.json")
+    label_file.save(
+        filename,
+        shapes=label_file.shapes,
+        imagePath=label_file.imagePath,
+        imageHeight=label_file.imageHeight,
+        imageWidth=label_file.imageWidth,
+        imageData=label_file.imageData,
+        imageStore=str(tmp_path / "store"),
+    )
+    with open(filename) as f:
+        ref = json.load(f)["imageDataRef"]
+    # truncated, e.g. by a full disk
+    open(str(tmp_path / ref["path"]), "wb").close()
+
+    loaded = labelme.LabelFile(filename)
+    assert loaded.imageHeight == label_file.imageHeight
+    assert loaded.imageData is not None
@@ -0,0 +1,87 @@
+import json
+import os.path as osp
+
+import pytest
+
+from labelme import _json
+
+
+here = osp.dirname(osp.abspath(__file__))
+data_dir = osp.join(here, "data")
+
+
+def test_load_deferred():
+    json_file = osp.join(data_dir, "annotated_with_data/apc2016_obj3.json")
+    with open(json_file) as f:
+        expected = json.load(f)
+
+    data = _json.load(json_file, defer_key="imageData")
+    assert isinstance(data["imageData"], _json.DeferredString)
+    assert data["imageData"].read() == expected["imageData"]
+    data["imageData"] = expected["imageData"]
+    assert data == expected
+
+
+def test_load_deferred_fallback(tmp_path):
+    filename = str(tmp_path / "test.json")
+
+    def dump_and_load(data):
+        with open(filename, "w") as f:
+            f.write(data)
+        return _json.load(filename, defer_key="imageData")
+
+    # not a string
+    data = dump_and_load('{"imageData": null, "shapes": []}')
+    assert data == {"imageData": None, "shapes": []}
+
+    # escaped characters
+    data = dump_and_load('{"imageData": "a\\/b\\"c", "shapes": []}')
+    assert data["imageData"].read() == 'a/b"c'
+    assert data["shapes"] == []
+
+    # same key in a nested object
+    data = dump_and_load('{"flags": {"imageData": "a"}, "imageData": "b"}')
+    assert data == {"flags": {"imageData": "a"}, "imageData": "b"}
+    data = dump_and_load('{"flags": {"imageData": "a"}, "imageData": null}')
+    assert data == {"flags": {"imageData": "a"}, "imageData": None}
+    data = dump_and_load(
+        '{"imageData": null, "shapes": [{"label": "a", "imageData": "b"}]}'
+    )
+    assert data == {
+        "imageData": None,
+        "shapes": [{"label": "a", "imageData": "b"}],
+    }
+    data = dump_and_load(
+        '{"imageData": "c", "shapes": [{"label": "a", "imageData": "b"}]}'
+    )
+    assert data == {
+        "imageData": "c",
+        "shapes": [{"label": "a", "imageData": "b"}],
+    }
+
+
+@pytest.mark.parametrize("backend", list(_json.BACKENDS))
+def test_backend(backend):
+    json_file = osp.join(data_dir, "annotated/2011_000003.json")
+    with open(json_file) as f:
+        data = json.load(f)
+    data["description"] = "日本語"
+    expected = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+    try:
+        _json.set_backend(backend)
+        assert _json.dumps(data) == expected
+        assert _json.loads(expected) == data
+        # unsupported by some backends
+        assert _json.loads(b"[NaN]")[0] != 0
+        assert (
+            _json.dumps([[1.0, float("nan")]])
+            == b"[\n  [\n    1.0,\n    NaN\n  ]\n]"
+        )
+        data = _json.loads(_json.dumps({"points": [[float("inf"), 0.5]]}))
+        assert data["points"][0][0] == float("inf")
+        assert (
+            _json.dumps({1: 2**70}) == b'{\n  "1": 1180591620717411303424\n}'
+        )
+    finally:
+        _json.set_backend()
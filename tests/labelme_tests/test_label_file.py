@@ -0,0 +1,120 @@
+import base64
+import json
+import os
+import os.path as osp
+
+import pytest
+
+import labelme
+from labelme.label_file import atomic_open
+
+
+here = osp.dirname(osp.abspath(__file__))
+data_dir = osp.join(here, "data")
+
+
+def test_load_without_image():
+    for json_file in [
+        osp.join(data_dir, "annotated/2011_000003.json"),
+        osp.join(data_dir, "annotated_with_data/apc2016_obj3.json"),
+    ]:
+        label_file = labelme.LabelFile(json_file)
+        label_file_lazy = labelme.LabelFile(json_file, with_image=False)
+        assert label_file_lazy._imageDataLoader is not None
+        assert label_file_lazy.shapes == label_file.shapes
+        assert label_file_lazy.imagePath == label_file.imagePath
+
+        assert label_file_lazy.imageData == label_file.imageData
+        assert label_file_lazy._imageDataLoader is None
+        assert label_file_lazy.imageHeight == label_file.imageHeight
+        assert label_file_lazy.imageWidth == label_file.imageWidth
+
+
+def test_read_embedded_image_data(monkeypatch):
+    json_file = osp.join(data_dir, "annotated_with_data/apc2016_obj3.json")
+    with open(json_file) as f:
+        expected = base64.b64decode(json.load(f)["imageData"])
+
+    def _encode_image_data(imageData):
+        raise AssertionError("image must not be decoded")
+
+    monkeypatch.setattr(
+        labelme.LabelFile,
+        "_encode_image_data",
+        staticmethod(_encode_image_data),
+    )
+    label_file = labelme.LabelFile(json_file, with_image=False)
+    assert label_file.read_embedded_image_data() == expected
+    assert label_file._imageDataLoader is not None
+
+    json_file = osp.join(data_dir, "annotated/2011_000003.json")
+    label_file = labelme.LabelFile(json_file, with_image=False)
+    assert label_file.read_embedded_image_data() is None
+
+
+def test_atomic_open(tmp_path):
+    filename = str(tmp_path / "test.json")
+    with atomic_open(filename) as f:
+        f.write(b"old")
+
+    with pytest.raises(RuntimeError):
+        with atomic_open(filename) as f:
+            f.write(b"new")
+            raise RuntimeError
+    with open(filename) as f:
+        assert f.read() == "old"
+    assert os.listdir(str(tmp_path)) == ["test.json"]
+
+
+def test_save_reuses_encoded_image_data(tmp_path, monkeypatch):
+    encode_image_data = labelme.LabelFile._encode_image_data
+    num_calls = []
+
+    def _encode_image_data(imageData):
+        num_calls.append(1)
+        return encode_image_data(imageData)
+
+    monkeypatch.setattr(
+        labelme.LabelFile,
+        "_encode_image_data",
+        staticmethod(_encode_image_data),
+    )
+
+    json_file = osp.join(data_dir, "annotated_with_data/apc2016_obj3.json")
+    label_file = labelme.LabelFile(json_file)
+    assert len(num_calls) == 1
+
+    filename = str(tmp_path / "test.json")
+    for _ in range(3):
+        label_file.save(
+            filename,
+            shapes=label_file.shapes[:1],
+            imagePath=label_file.imagePath,
+            imageHeight=label_file.imageHeight,
+            imageWidth=label_file.imageWidth,
+            imageData=bytes(bytearray(label_file.imageData)),  # a copy
+        )
+    assert len(num_calls) == 1
+    assert labelme.LabelFile(filename).imageData == label_file.imageData
+
+    # copies share the cache
+    imageData = label_file.imageData
+    label_file = labelme.LabelFile()
+    label_file.copy().save(
+        filename,
+        shapes=[],
+        imagePath="image.jpg",
+        imageHeight=None,
+        imageWidth=None,
+        imageData=bytes(bytearray(imageData)),
+    )
+    assert len(num_calls) == 3
+    label_file.copy().save(
+        filename,
+        shapes=[],
+        imagePath="image.jpg",
+        imageHeight=None,
+        imageWidth=None,
+        imageData=imageData,
+    )
+    assert len(num_calls) == 3
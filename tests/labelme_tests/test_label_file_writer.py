@@ -0,0 +1,110 @@
+import json
+import os
+import os.path as osp
+import stat
+import threading
+
+import pytest
+
+from labelme.label_file import LabelFile
+from labelme.label_file_writer import LabelFileWriter
+
+
+def _save_kwargs(label):
+    return dict(
+        shapes=[
+            dict(
+                label=label,
+                points=[[0, 0], [1, 1]],
+                shape_type="rectangle",
+                group_id=None,
+                description="",
+                flags={},
+            )
+        ],
+        imagePath="image.jpg",
+        imageHeight=10,
+        imageWidth=10,
+    )
+
+
+class _SlowLabelFile(LabelFile):
+    def __init__(self, event):
+        super(_SlowLabelFile, self).__init__()
+        self.event = event
+
+    def save(self, filename, **kwargs):
+        self.event.wait()
+        super(_SlowLabelFile, self).save(filename, **kwargs)
+
+
+@pytest.mark.gui
+def test_LabelFileWriter(qtbot, tmp_path):
+    writer = LabelFileWriter()
+    saved = []
+    writer.saved.connect(saved.append)
+
+    # block the writer, so the following saves are queued
+    event = threading.Event()
+    blocker_file = str(tmp_path / "blocker.json")
+    writer.save(_SlowLabelFile(event), blocker_file, **_save_kwargs("a"))
+
+    filename = str(tmp_path / "test.json")
+    for label in ["a", "b", "c"]:
+        writer.save(LabelFile(), filename, **_save_kwargs(label))
+    assert writer.isPending(filename)
+    event.set()
+    writer.flush(filename)
+    assert not writer.isPending(filename)
+
+    with open(filename) as f:
+        assert json.load(f)["shapes"][0]["label"] == "c"
+    qtbot.waitUntil(lambda: saved == [blocker_file, filename])
+
+    failed = []
+    writer.failed.connect(lambda *args: failed.append(args))
+    filename = str(tmp_path / "not_exist" / "test.json")
+    writer.save(LabelFile(), filename, **_save_kwargs("a"))
+    writer.stop()
+    qtbot.waitUntil(lambda: len(failed) == 1)
+    assert failed[0][0] == filename
+    assert not osp.exists(filename)
+
+
+def test_LabelFileWriter_atomic(tmp_path):
+    writer = LabelFileWriter()
+    filename = str(tmp_path / "test.json")
+    with open(filename, "w") as f:
+        f.write("old")
+    os.chmod(filename, 0o640)
+
+    writer.save(LabelFile(), filename, **_save_kwargs("a"))
+    writer.stop()
+    assert os.listdir(str(tmp_path)) == ["test.json"]
+    assert stat.S_IMODE(os.stat(filename).st_mode) == 0o640
+    assert LabelFile(filename, with_image=False).shapes[0]["label"] == "a"
+
+
+def test_LabelFileWriter_failure(tmp_path):
+    writer = LabelFileWriter()
+    filename = str(tmp_path / "not_exist" / "test.json")
+    writer.save(LabelFile(), filename, **_save_kwargs("a"))
+    writer.stop()
+    assert not osp.exists(filename)
+    assert writer.isFailed(filename)
+    assert [f for f, _ in writer.failures()] == [filename]
+    assert os.listdir(str(tmp_path)) == []
+
+    # the failed save is kept to be retried
+    os.makedirs(osp.dirname(filename))
+    writer.retry(filename)
+    writer.stop()
+    assert not writer.isFailed(filename)
+    assert LabelFile(filename, with_image=False).shapes[0]["label"] == "a"
+
+    os.remove(filename)
+    os.rmdir(osp.dirname(filename))
+    writer.save(LabelFile(), filename, **_save_kwargs("b"))
+    writer.stop()
+    writer.discard(filename)
+    assert writer.failures() == []
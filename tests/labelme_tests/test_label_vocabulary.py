@@ -0,0 +1,18 @@
+from labelme.label_vocabulary import LabelVocabulary
+
+
+def test_LabelVocabulary():
+    vocabulary = LabelVocabulary(["cat", "Dog", "hotdog", "bobcat", "cat"])
+    assert len(vocabulary) == 4
+    assert "Dog" in vocabulary
+    assert "dog" not in vocabulary
+    assert not vocabulary.add("hotdog")
+    assert vocabulary.add("cattle")
+    assert vocabulary.find("DOG") == ["Dog"]
+
+    assert vocabulary.match("") == ["bobcat", "cat", "cattle", "Dog", "hotdog"]
+    assert vocabulary.match("cat") == ["cat", "cattle", "bobcat"]
+    assert vocabulary.match("cat", limit=2) == ["cat", "cattle"]
+    assert vocabulary.match("do") == ["Dog", "hotdog"]
+    assert vocabulary.match("catle") == []
+    assert vocabulary.match("catle", fuzzy=True)[0] == "cattle"
@@ -0,0 +1,18 @@
+import subprocess
+import sys
+
+
+def test_import_without_qt():
+    code = (
+        "import sys\n"
+        "import labelme\n"
+        "from labelme import LabelFile\n"
+        "import labelme.annotation\n"
+        "import labelme.utils\n"
+        "labelme.utils.shapes_to_label\n"
+        "labelme.testing\n"
+        "assert 'qtpy' not in sys.modules, 'qtpy is imported'\n"
+        "labelme.utils.newIcon\n"
+        "assert isinstance(labelme.QT5, bool)\n"
+    )
+    subprocess.check_call([sys.executable, "-c", code])
@@ -0,0 +1,23 @@
+import io
+
+from labelme.startup_profiler import StartupProfiler
+
+
+def test_StartupProfiler():
+    profiler = StartupProfiler()
+    profiler.import_modules(["json"])
+    with profiler.measure("step"):
+        pass
+    f = io.StringIO()
+    profiler.report(f=f)
+    lines = f.getvalue().splitlines()
+    assert len(lines) == 4
+    assert lines[1].startswith("import json ")
+    assert lines[2].startswith("step ")
+
+    profiler = StartupProfiler(enabled=False)
+    with profiler.measure("step"):
+        pass
+    f = io.StringIO()
+    profiler.report(f=f)
+    assert f.getvalue() == ""
@@ -0,0 +1,67 @@
+import json
+import os.path as osp
+import shutil
+
+from labelme.testing import validate_labelfile
+from labelme.testing import validate_labelfiles
+
+
+here = osp.dirname(osp.abspath(__file__))
+data_dir = osp.join(here, "data")
+
+
+def test_validate_labelfile(tmp_path):
+    json_file = osp.join(data_dir, "annotated_with_data/apc2016_obj3.json")
+    assert validate_labelfile(json_file) == []
+
+    shutil.copy(osp.join(data_dir, "annotated/2011_000003.jpg"), tmp_path)
+    with open(osp.join(data_dir, "annotated/2011_000003.json")) as f:
+        data = json.load(f)
+    data["imageWidth"] += 1
+    data["shapes"][0]["points"][0] = [-1, 10]
+    data["shapes"][0]["points"][1] = [10, 1000]
+    data["shapes"][1]["shape_type"] = "rectangle"
+    data["shapes"][2]["shape_type"] = "ellipse"
+    del data["shapes"][3]["label"]
+    json_file = str(tmp_path / "2011_000003.json")
+    with open(json_file, "w") as f:
+        json.dump(data, f)
+
+    errors = validate_labelfile(json_file)
+    assert [(e["shape"], e["code"]) for e in errors] == [
+        (None, "image_size_mismatch"),
+        (1, "num_points"),
+        (2, "unknown_shape_type"),
+        (3, "missing_key"),
+        (0, "point_out_of_bounds"),
+    ]
+    assert errors[-1]["message"].startswith("2 points outside")
+
+    results = dict(validate_labelfiles([json_file, json_file + "_"]))
+    assert results[json_file] == errors
+    assert results[json_file + "_"][0]["code"] == "read_error"
+
+
+def test_validate_labelfile_invalid_types(tmp_path):
+    with open(osp.join(data_dir, "annotated/2011_000003.json")) as f:
+        data = json.load(f)
+    shutil.copy(osp.join(data_dir, "annotated/2011_000003.jpg"), tmp_path)
+    json_file = str(tmp_path / "2011_000003.json")
+
+    data["shapes"][0]["points"] = None
+    data["shapes"][1] = "not a shape"
+    with open(json_file, "w") as f:
+        json.dump(data, f)
+    errors = validate_labelfile(json_file)
+    assert [(e["shape"], e["code"]) for e in errors] == [
+        (0, "invalid_points"),
+        (1, "invalid_shape"),
+    ]
+
+    data["shapes"] = None
+    with open(json_file, "w") as f:
+        json.dump(data, f)
+    errors = validate_labelfile(json_file)
+    assert [(e["shape"], e["code"]) for e in errors] == [
+        (None, "invalid_shapes")
+    ]
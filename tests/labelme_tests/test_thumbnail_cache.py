@@ -0,0 +1,53 @@
+import os
+import os.path as osp
+import shutil
+
+import PIL.Image
+import pytest
+
+from labelme.thumbnail_cache import ThumbnailCache
+
+
+here = osp.dirname(osp.abspath(__file__))
+data_dir = osp.join(here, "data")
+
+
+def test_ThumbnailCache(tmp_path):
+    filename = str(tmp_path / "2011_000003.jpg")
+    shutil.copy(osp.join(data_dir, "raw/2011_000003.jpg"), filename)
+    cache = ThumbnailCache(cache_dir=str(tmp_path / "cache"), size=64)
+
+    assert cache.get(filename) is None
+    thumbnail_file = cache.create(filename)
+    assert thumbnail_file == cache.get(filename)
+    with PIL.Image.open(thumbnail_file) as thumbnail:
+        assert max(thumbnail.size) == 64
+
+    # a modified image gets a new thumbnail
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.get(filename) is None
+    assert cache.create(filename) != thumbnail_file
+
+
+def test_ThumbnailCache_invalid(tmp_path):
+    cache = ThumbnailCache(cache_dir=str(tmp_path / "cache"))
+    assert cache.create(str(tmp_path / "missing.jpg")) is None
+    filename = str(tmp_path / "text.jpg")
+    with open(filename, "w") as f:
+        f.write("not an image")
+    assert cache.create(filename) is None
+    assert cache.get(filename) is None
+
+
+@pytest.mark.gui
+def test_ThumbnailLoader(qtbot, tmp_path):
+    from labelme.thumbnail_loader import ThumbnailLoader
+
+    cache = ThumbnailCache(cache_dir=str(tmp_path / "cache"), size=64)
+    loader = ThumbnailLoader(cache=cache, workers=1)
+    filename = osp.join(data_dir, "raw/2011_000003.jpg")
+    with qtbot.waitSignal(loader.loaded, timeout=5000) as blocker:
+        loader.request([filename])
+    assert blocker.args == [filename, cache.get(filename)]
+    loader.stop()
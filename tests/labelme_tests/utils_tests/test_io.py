@@ -0,0 +1,56 @@
+import os
+import os.path as osp
+
+import PIL.Image
+
+from labelme.utils import _io as io_module
+
+from .util import data_dir
+
+
+def test_link_or_copy(tmp_path):
+    src = osp.join(data_dir, "raw/2011_000003.jpg")
+    with open(src, "rb") as f:
+        content = f.read()
+    for mode in ["copy", "hardlink", "reflink", "symlink"]:
+        dst = str(tmp_path / "{}.jpg".format(mode))
+        io_module.link_or_copy(src, dst, mode=mode)
+        with open(dst, "rb") as f:
+            assert f.read() == content
+        os.remove(dst)
+
+
+def test_export_image(tmp_path):
+    src = osp.join(data_dir, "raw/2011_000003.jpg")
+    with open(src, "rb") as f:
+        content = f.read()
+
+    dst = str(tmp_path / "out.jpg")
+    assert io_module.export_image(dst, image_file=src, mode="copy") == "copy"
+    with open(dst, "rb") as f:
+        assert f.read() == content
+
+    assert io_module.export_image(dst, image_data=content, mode="copy") == (
+        "copy"
+    )
+
+    png_file = str(tmp_path / "image.png")
+    PIL.Image.open(src).save(png_file)
+    assert io_module.export_image(dst, image_file=png_file, mode="copy") == (
+        "encode"
+    )
+    assert PIL.Image.open(dst).format == "JPEG"
+
+
+def test_export_image_mode(tmp_path):
+    src = osp.join(data_dir, "raw/2011_000003.jpg")
+    image_pil = PIL.Image.open(src)
+    dst = str(tmp_path / "out.jpg")
+    for mode, expected in [("RGBA", "RGB"), ("LA", "L"), ("P", "RGB")]:
+        png_file = str(tmp_path / "{}.png".format(mode))
+        image_pil.convert(mode).save(png_file)
+        assert io_module.export_image(dst, image_file=png_file) == "encode"
+        with PIL.Image.open(dst) as out_pil:
+            assert out_pil.format == "JPEG"
+            assert out_pil.mode == expected
+            assert out_pil.size == image_pil.size
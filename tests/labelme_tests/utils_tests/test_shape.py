@@ -1,3 +1,5 @@
+import numpy as np
+
 from .util import get_img_and_data
 
 from labelme.utils import shape as shape_module
@@ -22,3 +24,29 @@ def test_shape_to_mask():
         points = shape["points"]
         mask = shape_module.shape_to_mask(img.shape[:2], points)
         assert mask.shape == img.shape[:2]
+
+
+def test_shapes_to_bboxes_and_areas():
+    shapes = [
+        dict(points=[[0, 0], [4, 0], [4, 3]], shape_type="polygon"),
+        dict(points=[[4, 3], [0, 0]], shape_type="rectangle"),
+        dict(points=[[1, 1], [1, 3]], shape_type="circle"),
+        dict(points=[[0, 0], [2, 2]], shape_type="line"),
+        dict(points=[], shape_type="polygon"),
+        dict(points=[[1, 2]], shape_type="point"),
+    ]
+    bboxes, areas = shape_module.shapes_to_bboxes_and_areas(shapes)
+    np.testing.assert_allclose(
+        bboxes[[0, 1, 2, 3, 5]],
+        [
+            [0, 0, 4, 3],
+            [0, 0, 4, 3],
+            [-1, -1, 3, 3],
+            [0, 0, 2, 2],
+            [1, 2, 1, 2],
+        ],
+    )
+    np.testing.assert_allclose(
+        areas[[0, 1, 2, 3, 5]], [6, 12, 4 * np.pi, 0, 0]
+    )
+    assert np.isnan(bboxes[4]).all() and np.isnan(areas[4])
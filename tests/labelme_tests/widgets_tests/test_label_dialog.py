@@ -45,6 +45,27 @@ def test_LabelDialog_addLabelHistory(qtbot):
     assert item.text() == "bicycle"
 
 
+@pytest.mark.gui
+def test_LabelDialog_addLabelHistory_sorted(qtbot):
+    widget = LabelDialog(labels=["cat", "Dog", "apple"], sort_labels=True)
+    qtbot.addWidget(widget)
+
+    widget.addLabelHistory("Zebra")
+    widget.addLabelHistory("bee")
+    widget.addLabelHistories(["Ant", "cow"])
+    texts = [
+        widget.labelList.item(i).text()
+        for i in range(widget.labelList.count())
+    ]
+    assert texts == sorted(texts)
+
+    # the completer binary-searches the sorted labels
+    completer = widget.edit.completer()
+    for prefix, label in [("Ze", "Zebra"), ("be", "bee"), ("co", "cow")]:
+        completer.setCompletionPrefix(prefix)
+        assert completer.currentCompletion() == label
+
+
 @pytest.mark.gui
 def test_LabelDialog_popUp(qtbot):
     labels = ["cat", "dog", "person"]
@@ -95,3 +116,23 @@ def test_LabelDialog_popUp(qtbot):
     assert flags == {}
     assert group_id is None
     assert description == ""
+
+
+@pytest.mark.gui
+def test_LabelDialog_fuzzyCompletion(qtbot):
+    labels = ["cat", "dog", "person", "bobcat"]
+    widget = LabelDialog(labels=labels, completion="fuzzy")
+    qtbot.addWidget(widget)
+
+    widget.addLabelHistory("cattle")
+    assert [
+        widget.labelList.item(i).text()
+        for i in range(widget.labelList.count())
+    ] == ["bobcat", "cat", "cattle", "dog", "person"]
+
+    qtbot.keyClicks(widget.edit, "cat")
+    model = widget.edit.completer().model()
+    assert model.stringList() == ["cat", "cattle", "bobcat"]
+    widget.edit.clear()
+    qtbot.keyClicks(widget.edit, "prson")
+    assert model.stringList() == ["person"]
@@ -1,20 +1,79 @@
 # -*- encoding: utf-8 -*-
 
 import pytest
+from qtpy import QtCore
+from qtpy.QtCore import Qt
 
+from labelme.shape import Shape
 from labelme.widgets import LabelListWidget
 from labelme.widgets import LabelListWidgetItem
 
 
 @pytest.mark.gui
-def test_LabelListWidget(qtbot):
-    widget = LabelListWidget()
+@pytest.mark.parametrize("html", [False, True])
+def test_LabelListWidget(qtbot, html):
+    widget = LabelListWidget(html=html)
 
-    item = LabelListWidgetItem(text="person <font color='red'>●</fon>")
+    item = LabelListWidgetItem(text="person")
+    item.setColor((255, 0, 0))
     widget.addItem(item)
-    item = LabelListWidgetItem(text="dog <font color='blue'>●</fon>")
+    item = LabelListWidgetItem(text="dog & <cat>")
+    item.setColor((0, 0, 255))
     widget.addItem(item)
+    assert widget[1].color() == (0, 0, 255)
+    assert widget[1].clone().color() == (0, 0, 255)
 
     widget.show()
     qtbot.addWidget(widget)
     qtbot.waitExposed(widget)
+    widget.grab()  # paint the items
+
+
+@pytest.mark.gui
+def test_LabelListWidget_findItemByShape(qtbot):
+    widget = LabelListWidget()
+    qtbot.addWidget(widget)
+
+    shapes = [Shape(label=str(i)) for i in range(3)]
+    for shape in shapes:
+        widget.addItem(LabelListWidgetItem(shape.label, shape))
+    assert widget.findItemByShape(shapes[1]).text() == "1"
+
+    # drag the first row to the end
+    model = widget.model()
+    mime_data = model.mimeData([model.index(0, 0)])
+    model.dropMimeData(mime_data, Qt.MoveAction, 3, 0, QtCore.QModelIndex())
+    model.removeRows(0, 1)
+    assert [item.text() for item in widget] == ["1", "2", "0"]
+    for item in widget:
+        assert widget.findItemByShape(item.shape()) is item
+    with pytest.raises(ValueError):  # the dropped item has a copy of it
+        widget.findItemByShape(shapes[0])
+
+    widget.removeItem(widget.findItemByShape(shapes[2]))
+    with pytest.raises(ValueError):
+        widget.findItemByShape(shapes[2])
+    assert widget.findItemByShape(shapes[1]).text() == "1"
+    widget.clear()
+    with pytest.raises(ValueError):
+        widget.findItemByShape(shapes[1])
+
+
+@pytest.mark.gui
+def test_LabelListWidget_longLabel(qtbot):
+    widget = LabelListWidget()
+    qtbot.addWidget(widget)
+    widget.resize(100, 200)
+    widget.show()
+    qtbot.waitExposed(widget)
+
+    widget.addItem(LabelListWidgetItem("person"))
+    text = "a label much longer than the width of the list " * 2
+    widget.addItems([LabelListWidgetItem(text)])
+    QtCore.QCoreApplication.processEvents()
+
+    width = widget.fontMetrics().boundingRect(text).width()
+    for row in range(len(widget)):
+        rect = widget.visualRect(widget.model().index(row, 0))
+        assert rect.width() > width
+    assert widget.horizontalScrollBar().maximum() > 0
@@ -0,0 +1,31 @@
+import pytest
+
+from labelme.widgets import UniqueLabelQListWidget
+
+
+@pytest.mark.gui
+def test_UniqueLabelQListWidget_findItemByLabel(qtbot):
+    widget = UniqueLabelQListWidget()
+    qtbot.addWidget(widget)
+    rowsChanged = []
+    widget.labelRowsChanged.connect(lambda: rowsChanged.append(True))
+
+    for label in ["cat", "dog", "bird"]:
+        item = widget.createItemFromLabel(label)
+        widget.addItem(item)
+        widget.setItemLabel(item, label, (255, 0, 0))
+    assert widget.findItemByLabel("dog") is widget.item(1)
+    assert widget.findItemByLabel("fish") is None
+    with pytest.raises(ValueError):
+        widget.createItemFromLabel("dog")
+    assert not rowsChanged  # only appended
+
+    widget.takeItem(0)
+    assert widget.findItemByLabel("cat") is None
+    assert widget.findItemByLabel("bird") is widget.item(1)
+    assert rowsChanged
+
+    widget.insertItem(0, widget.createItemFromLabel("fish"))
+    assert widget.findItemByLabel("fish") is widget.item(0)
+    widget.clear()
+    assert widget.findItemByLabel("fish") is None